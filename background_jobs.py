@@ -0,0 +1,191 @@
+"""Streamlit screen: run batches on the background job queue and follow them by job id (see job_queue)."""
+import importlib
+import sqlite3
+from typing import Dict
+
+import streamlit as st
+
+from candidate_index import index_option
+from job_queue import JOB_MODES, UNFINISHED, JobQueue, QueueFull, ensure_service, queue_path
+from page_stream import default_page_budget
+from resume_sections import SECTIONS, default_match_sections
+
+POLL_SECONDS = 2
+STATE_LABELS = {
+    "queued": "⏳ queued",
+    "running": "⚙️ running",
+    "export_pending": "📝 building Excel",
+    "exporting": "📝 building Excel",
+    "done": "✅ done",
+    "failed": "❌ failed",
+    "cancelled": "🚫 cancelled",
+}
+
+
+@st.cache_resource(show_spinner=False)
+def open_queue(path: str) -> JobQueue:
+    """One shared handle per database, instead of reopening it on every rerun."""
+    return JobQueue(path)
+
+
+def session_owner(queue: JobQueue) -> str:
+    """Owner id of this browser session. It lives in session_state; the URL (?owner=...) only
+    carries it signed by the queue, so a refresh still finds its jobs but no one can pick an id."""
+    owner = st.session_state.get("job_owner")
+    if owner is None:
+        owner = queue.owner_from_token(st.query_params.get("owner", "")) or queue.new_owner()
+        st.session_state["job_owner"] = owner
+    token = queue.owner_token(owner)
+    if st.query_params.get("owner") != token:
+        st.query_params["owner"] = token
+    return owner
+
+
+def default_skills(mode: str):
+    module = importlib.import_module(JOB_MODES[mode][0])
+    return module.default_skills_by_mode() if mode == "combined" else module.SKILLS_TO_CHECK
+
+
+# --------------------------
+# Submitting
+# --------------------------
+def submit_form(queue: JobQueue, owner: str) -> None:
+    modes = {label: mode for mode, (_, _, label) in JOB_MODES.items()}
+    with st.form("job_submit", clear_on_submit=True):
+        label = st.selectbox("Tool", list(modes))
+        uploads = st.file_uploader("Upload Resumes (PDF or DOCX)", type=["pdf", "docx"], accept_multiple_files=True)
+        page_budget = st.number_input("Page budget per resume (0 = all pages)", min_value=0, max_value=500,
+                                      value=default_page_budget() or 0)
+        match_sections = st.multiselect("Match industries only in sections", SECTIONS,
+                                        default=list(default_match_sections()),
+                                        help="Leave empty to match across the whole resume.")
+        save_index = index_option(key="job_index")
+        submitted = st.form_submit_button("📬 Submit job", type="primary")
+    if not submitted:
+        return
+    if not uploads:
+        st.error("⚠️ Please upload at least one resume first.")
+        return
+    mode = modes[label]
+    settings = {"skills": default_skills(mode), "page_budget": int(page_budget), "match_sections": list(match_sections),
+                "index": save_index}
+    try:
+        job_id = queue.submit(owner, mode, uploads, settings)
+    except QueueFull as e:
+        st.warning(f"⏸️ {e}")
+        return
+    if not ensure_service(queue):
+        st.warning("⚠️ No job service is running and autostart is off; start one with `python -m job_queue serve`.")
+    st.session_state["job_id"] = job_id
+    st.success(f"✅ Job `{job_id}` queued with {len(uploads)} file(s). You can close this tab and come back later.")
+
+
+# --------------------------
+# Polling
+# --------------------------
+def _progress(job: Dict) -> str:
+    return f"{job['finished_files']}/{job['total']}" + (f" ({job['failed']} without a record)" if job["failed"] else "")
+
+
+def show_jobs(queue: JobQueue, owner: str, polling: bool) -> None:
+    jobs = queue.jobs_for(owner)
+    if polling and not any(job["state"] in UNFINISHED for job in jobs):
+        st.rerun()  # everything finished: one full rerun stops the polling
+    if not jobs:
+        st.caption("No jobs submitted from this browser yet.")
+        return
+    st.dataframe([{
+        "Job id": job["id"],
+        "Tool": JOB_MODES[job["mode"]][2],
+        "State": STATE_LABELS.get(job["state"], job["state"]),
+        "Progress": job["finished_files"] / job["total"] if job["total"] else 1.0,
+        "Files": _progress(job),
+    } for job in jobs], hide_index=True, use_container_width=True,
+        column_config={"Progress": st.column_config.ProgressColumn("Progress", min_value=0.0, max_value=1.0)})
+    stats = queue.stats()
+    st.caption(f"Job service {'running' if stats['service'] else 'stopped'} · {stats['workers']} worker(s) · "
+               f"{stats['files'].get('queued', 0)} file(s) waiting")
+
+
+def show_job(queue: JobQueue, owner: str, job_id: str, polling: bool) -> None:
+    job = queue.job(job_id, owner)
+    if job is None:
+        st.warning(f"⚠️ No job `{job_id}` submitted from this browser (finished jobs are kept for a limited time).")
+        return
+    if polling and job["state"] not in UNFINISHED:
+        st.rerun()
+    st.write(f"**Job `{job['id']}`** · {JOB_MODES[job['mode']][2]} · {STATE_LABELS.get(job['state'], job['state'])}")
+    if job["state"] in UNFINISHED:
+        st.progress(job["finished_files"] / job["total"] if job["total"] else 1.0, text=f"Processed {_progress(job)}")
+        if job["state"] == "queued" and job["waiting_ahead"]:
+            st.caption(f"{job['waiting_ahead']} file(s) from earlier jobs are waiting too; files are shared fairly "
+                       "between users.")
+        if st.button("🚫 Cancel job", key=f"cancel_{job_id}"):
+            queue.cancel(job_id, owner)
+            st.rerun()
+        return
+    if job["error"]:
+        st.error(f"❌ {job['error']}")
+    show_job_results(queue, owner, job)
+
+
+def show_job_results(queue: JobQueue, owner: str, job: Dict) -> None:
+    import pandas as pd
+
+    rows = []
+    for filename, data, error, _ in queue.results(job["id"], owner):
+        if error:
+            st.error(f"❌ Error processing {filename}: {error}")
+        elif data:
+            rows.append(data)
+        else:
+            st.warning(f"⚠️ Could not extract text from: {filename} (unsupported/empty/corrupt)")
+    if not rows:
+        return
+    st.success(f"✅ Processed {len(rows)} out of {job['total']} file(s)")
+    if job["mode"] == "combined":
+        tabs = st.tabs([JOB_MODES[mode][2] for mode in rows[0]])
+        for tab, mode in zip(tabs, rows[0]):
+            with tab:
+                st.dataframe(pd.DataFrame([records[mode] for records in rows]), use_container_width=True)
+    else:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+    excel_bytes = queue.excel_bytes(job["id"], owner)
+    if excel_bytes:
+        st.download_button(
+            label="📥 Download Excel File",
+            data=excel_bytes,
+            file_name=f"resume_job_{job['id']}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            type="primary",
+            key=f"download_{job['id']}"
+        )
+
+
+def main():
+    st.header("📬 Background Jobs")
+    st.markdown(
+        "Submitted batches run in a separate job service, so they keep going if this tab is refreshed "
+        "or closed. Follow them below, or open any job by its id."
+    )
+    try:
+        queue = open_queue(queue_path())
+    except (OSError, sqlite3.Error) as e:
+        st.error(f"❌ Could not open the job queue: {e}")
+        return
+    owner = session_owner(queue)
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        submit_form(queue, owner)
+    with col2:
+        st.subheader("My jobs")
+        polling = any(job["state"] in UNFINISHED for job in queue.jobs_for(owner))
+        st.fragment(run_every=POLL_SECONDS if polling else None)(show_jobs)(queue, owner, polling)
+
+    st.markdown("---")
+    job_id = st.text_input("Open job by id", key="job_id").strip()
+    if job_id:
+        job = queue.job(job_id, owner)
+        polling = job is not None and job["state"] in UNFINISHED
+        st.fragment(run_every=POLL_SECONDS if polling else None)(show_job)(queue, owner, job_id, polling)
@@ -0,0 +1,326 @@
+"""Batch processing: every file runs in a killable worker process with a time and memory budget.
+
+A pathological file (a PDF whose parser spins for minutes or balloons memory) only costs
+its own worker: the worker is killed when the file overruns its time budget, or dies on
+its own, a fresh worker takes its place, and the file is recorded with the reason it
+failed while the rest of the batch carries on.
+
+    RESUME_PARSER_WORKERS=4              # worker processes (default: CPU count)
+    RESUME_PARSER_FILE_TIMEOUT=60        # seconds a file may take before its worker is killed (0 = no limit)
+    RESUME_PARSER_FILE_MEMORY_MB=1024    # memory a worker may take on for one file (0 = no limit)
+"""
+import multiprocessing
+import os
+import signal
+from multiprocessing.connection import wait
+from time import monotonic, perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from page_stream import ParseError
+from stage_timing import StageTimer
+from upload_spool import FileSource
+
+# A job is (source, filename), where source is the file's bytes or a spooled FileRef (so workers
+# open the file themselves); a result is (index, filename, data, error, timings).
+# timings is a {stage: seconds} dict when the batch is instrumented, else None.
+Job = Tuple[FileSource, str]
+Result = Tuple[int, str, Optional[Dict], Optional[str], Optional[Dict[str, float]]]
+
+SERIAL = 0  # workers=SERIAL runs every file in the calling process, without budgets (debugging)
+
+DEFAULT_FILE_TIMEOUT = 60
+DEFAULT_FILE_MEMORY_MB = 1024
+
+# Why a file has no record; its error reads "<reason>: <detail>"
+TIMEOUT = "timeout"
+OUT_OF_MEMORY = "out of memory"
+CRASHED = "worker crashed"
+PARSE_ERROR = "parse error"        # the file could not be opened or its pages extracted
+INTERNAL_ERROR = "internal error"  # any other exception: a bug, not a bad file
+FAILURE_REASONS = (TIMEOUT, OUT_OF_MEMORY, CRASHED, PARSE_ERROR, INTERNAL_ERROR)
+
+
+# --------------------------
+# Configuration
+# --------------------------
+def default_worker_count() -> int:
+    """Worker processes to use by default (RESUME_PARSER_WORKERS overrides the CPU count)."""
+    env = os.environ.get("RESUME_PARSER_WORKERS")
+    if env and env.isdigit() and int(env) > 0:
+        return int(env)
+    return os.cpu_count() or 1
+
+
+def _env_limit(name: str, default: float) -> Optional[float]:
+    try:
+        value = float(os.environ.get(name, default))
+    except ValueError:
+        value = default
+    return value if value > 0 else None
+
+
+def file_timeout() -> Optional[float]:
+    """Seconds a file may take before its worker is killed (RESUME_PARSER_FILE_TIMEOUT; None = no limit)."""
+    return _env_limit("RESUME_PARSER_FILE_TIMEOUT", DEFAULT_FILE_TIMEOUT)
+
+
+def file_memory_mb() -> Optional[int]:
+    """Memory a worker may allocate beyond its starting footprint (RESUME_PARSER_FILE_MEMORY_MB; None = no limit)."""
+    limit = _env_limit("RESUME_PARSER_FILE_MEMORY_MB", DEFAULT_FILE_MEMORY_MB)
+    return None if limit is None else int(limit)
+
+
+def describe_budget(timeout: Optional[float] = None, memory_mb: Optional[int] = None) -> str:
+    """e.g. "60 s and 1024 MB per file" (None = the configured budget)."""
+    timeout = file_timeout() if timeout is None else timeout or None
+    memory_mb = file_memory_mb() if memory_mb is None else memory_mb or None
+    return (f"{f'{timeout:g} s' if timeout else 'no time limit'} and "
+            f"{f'{memory_mb} MB' if memory_mb else 'no memory limit'} per file")
+
+
+def _address_space() -> int:
+    """Bytes of address space this process has mapped now (0 where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def limit_memory(megabytes: Optional[int]) -> None:
+    """Let this process map at most ``megabytes`` more than it has now; an allocation past
+    that raises MemoryError (POSIX only). Relative, because a forked worker starts out with
+    its parent's (e.g. the app's) mappings."""
+    if not megabytes:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = _address_space() + megabytes * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+# --------------------------
+# Failure reasons
+# --------------------------
+def failure(reason: str, detail: str) -> str:
+    return f"{reason}: {detail}"
+
+
+def failure_reason(error: Optional[str]) -> Optional[str]:
+    """The reason an error was recorded with (one of FAILURE_REASONS), else None."""
+    if error:
+        reason = error.split(":", 1)[0]
+        if reason in FAILURE_REASONS:
+            return reason
+    return None
+
+
+def describe_exit(exitcode: Optional[int]) -> str:
+    """How a worker process ended, e.g. "killed by SIGKILL" (what the kernel's OOM killer sends)."""
+    if exitcode is not None and exitcode < 0:
+        try:
+            return f"killed by {signal.Signals(-exitcode).name}"
+        except ValueError:
+            return f"killed by signal {-exitcode}"
+    return f"exit code {exitcode}"
+
+
+def _error(e: BaseException) -> str:
+    if isinstance(e, MemoryError):
+        return failure(OUT_OF_MEMORY, "the file needed more memory than a worker may use")
+    if isinstance(e, ParseError):
+        return failure(PARSE_ERROR, str(e))
+    return failure(INTERNAL_ERROR, f"{type(e).__name__}: {e}" if str(e) else type(e).__name__)
+
+
+# --------------------------
+# Running one file
+# --------------------------
+def run_job(process_fn: Callable, file_bytes: FileSource, filename: str, skills: List[str],
+            instrument: bool = False) -> Tuple[Optional[Dict], Optional[str], Optional[Dict[str, float]]]:
+    """Run one resume through ``process_fn``; errors are returned instead of raised.
+
+    With ``instrument`` the function is passed a ``timer`` (StageTimer) and the
+    per-stage timings, plus the ``total``, are returned alongside the result.
+    """
+    if not instrument:
+        try:
+            return process_fn(file_bytes, filename, skills), None, None
+        except Exception as e:
+            return None, _error(e), None
+    timer = StageTimer()
+    start = perf_counter()
+    try:
+        data, error = process_fn(file_bytes, filename, skills, timer=timer), None
+    except Exception as e:
+        data, error = None, _error(e)
+    timings = dict(timer.stages)
+    timings["total"] = perf_counter() - start
+    return data, error, timings
+
+
+def _worker_main(conn, process_fn: Callable, skills: List[str], instrument: bool, memory_mb: Optional[int]) -> None:
+    """Run the (index, source, filename) jobs sent over ``conn`` until told to stop (None)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C reaches the parent, which stops its workers
+    limit_memory(memory_mb)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        idx, file_bytes, filename = job
+        data, error, timings = run_job(process_fn, file_bytes, filename, skills, instrument)
+        conn.send((idx, data, error, timings))
+        if failure_reason(error) == OUT_OF_MEMORY:
+            return  # leave the rest of the batch to a fresh process, not this fragmented heap
+
+
+# --------------------------
+# Worker pool
+# --------------------------
+class _Worker:
+    __slots__ = ("process", "conn", "job", "deadline")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.job: Optional[Tuple[int, str]] = None
+        self.deadline: Optional[float] = None
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(None if kill else 5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def crashed(self) -> str:
+        """Clean up after a worker that died on its own; the error for the file it was on."""
+        self.stop(kill=True)
+        return failure(CRASHED, f"the worker process ended ({describe_exit(self.process.exitcode)})")
+
+
+def _iter_isolated(process_fn: Callable, jobs: Iterable[Job], skills: List[str], workers: int, instrument: bool,
+                   timeout: Optional[float], memory_mb: Optional[int]) -> Iterator[Result]:
+    # the platform's default start method, as ProcessPoolExecutor used: under "spawn" every
+    # worker would re-run the app's page script, which Streamlit installs as __main__
+    context = multiprocessing.get_context()
+
+    def start_worker() -> _Worker:
+        conn, child_conn = context.Pipe()
+        process = context.Process(target=_worker_main, args=(child_conn, process_fn, skills, instrument, memory_mb),
+                                  daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(process, conn)
+
+    def assign(idx: int, file_bytes: FileSource, filename: str) -> _Worker:
+        worker = idle.pop() if idle else start_worker()
+        try:
+            worker.conn.send((idx, file_bytes, filename))
+        except OSError:  # died while idle
+            worker.stop(kill=True)
+            worker = start_worker()
+            worker.conn.send((idx, file_bytes, filename))
+        worker.job = (idx, filename)
+        worker.deadline = monotonic() + timeout if timeout else None
+        return worker
+
+    job_iter = enumerate(jobs)
+    idle: List[_Worker] = []
+    busy: List[_Worker] = []
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(busy) < workers:
+                try:
+                    idx, (file_bytes, filename) = next(job_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                busy.append(assign(idx, file_bytes, filename))
+            if not busy:
+                break
+            deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+            ready = wait([worker.conn for worker in busy] + [worker.process.sentinel for worker in busy],
+                         max(0.0, min(deadlines) - monotonic()) if deadlines else None)
+            now = monotonic()
+            for worker in list(busy):
+                idx, filename = worker.job
+                if worker.conn in ready:
+                    try:
+                        _, data, error, timings = worker.conn.recv()
+                    except (EOFError, OSError):  # died before it could answer
+                        data, error, timings = None, worker.crashed(), None
+                    else:
+                        worker.job = worker.deadline = None
+                        if failure_reason(error) == OUT_OF_MEMORY:
+                            worker.stop()
+                        else:
+                            idle.append(worker)
+                elif worker.process.sentinel in ready:
+                    data, error, timings = None, worker.crashed(), None
+                elif worker.deadline is not None and now >= worker.deadline:
+                    worker.stop(kill=True)
+                    data, timings = None, None
+                    error = failure(TIMEOUT, f"no result after {timeout:g} s; the worker was killed")
+                else:
+                    continue
+                busy.remove(worker)
+                yield idx, filename, data, error, timings
+    finally:
+        for worker in busy:
+            worker.stop(kill=True)
+        for worker in idle:
+            worker.stop()
+
+
+def iter_batch(process_fn: Callable, jobs: Iterable[Job], skills: List[str], workers: Optional[int] = None,
+               instrument: bool = False, timeout: Optional[float] = None,
+               memory_mb: Optional[int] = None) -> Iterator[Result]:
+    """Yield (index, filename, data, error, timings) for every job, in completion order.
+
+    Jobs go to ``workers`` processes, one file per worker at a time, so ``jobs`` can be a
+    lazy iterator over an arbitrarily large batch. A file still running after ``timeout``
+    seconds has its worker killed, and a worker is capped at ``memory_mb`` of address
+    space (None = the configured budget, 0 = no limit); such files, and files whose
+    worker died, get a TIMEOUT / OUT_OF_MEMORY / CRASHED error and a fresh worker takes
+    over. ``workers=SERIAL`` runs serially in the calling process, without budgets.
+    """
+    workers = default_worker_count() if workers is None else workers
+    if workers <= SERIAL:
+        for idx, (file_bytes, filename) in enumerate(jobs):
+            data, error, timings = run_job(process_fn, file_bytes, filename, skills, instrument)
+            yield idx, filename, data, error, timings
+        return
+    timeout = file_timeout() if timeout is None else timeout or None
+    memory_mb = file_memory_mb() if memory_mb is None else memory_mb or None
+    yield from _iter_isolated(process_fn, jobs, skills, workers, instrument, timeout, memory_mb)
+
+
+def run_batch(process_fn: Callable, jobs: List[Job], skills: List[str], workers: Optional[int] = None,
+              on_progress: Optional[Callable[[int, int, str], None]] = None, instrument: bool = False) -> List[Result]:
+    """Process all jobs and return their results in upload order.
+
+    ``on_progress(done, total, filename)`` is called as each job completes.
+    """
+    results: List[Optional[Result]] = [None] * len(jobs)
+    for done, result in enumerate(iter_batch(process_fn, jobs, skills, workers, instrument=instrument), start=1):
+        results[result[0]] = result
+        if on_progress:
+            on_progress(done, len(jobs), result[1])
+    return results
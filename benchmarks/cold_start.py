@@ -0,0 +1,108 @@
+"""Measure the Streamlit app's time to first render, in fresh interpreters.
+
+    python -m benchmarks.cold_start                  # 3 samples
+    python -m benchmarks.cold_start -r 5 -o benchmarks/results/cold_start.json
+
+Each sample starts a new Python process, imports streamlit (timed on its own: the server
+has it loaded before the script first runs), renders the app once with streamlit's
+AppTest (the default tool) and then switches to every other tool; each render is timed
+by the app itself. It also lists which heavy libraries the first render pulled in.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+HEAVY_MODULES = ("pandas", "numpy", "PyPDF2", "docx", "openpyxl", "pyarrow")
+
+
+# --------------------------
+# One cold sample (child process)
+# --------------------------
+def sample() -> Dict:
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import_ms = (time.perf_counter() - start) * 1000
+
+    app = AppTest.from_file(APP, default_timeout=120)
+    app.run()
+    # the app times its own script run (see streamlit_app.show_render_time); AppTest's
+    # wall time would add its component discovery on top
+    renders = {app.sidebar.radio[0].value: app.session_state["render_ms"]}
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    for option in app.sidebar.radio[0].options:
+        if option not in renders:
+            app.sidebar.radio[0].set_value(option).run()
+            renders[option] = app.session_state["render_ms"]
+    return {"streamlit_import_ms": import_ms, "renders_ms": renders, "first_render_loaded": loaded,
+            "errors": [e.value for e in app.exception]}
+
+
+# --------------------------
+# Driver
+# --------------------------
+def run(repeat: int) -> Dict:
+    # imported here, not at the top: the child processes must start with nothing preloaded
+    from benchmarks.run_benchmarks import git_commit, percentile
+
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-m", "benchmarks.cold_start", "--child"], capture_output=True,
+                             text=True, check=True, cwd=os.path.dirname(APP),
+                             env={**os.environ, "RESUME_PARSER_INDEX": "0"})
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    def p50(values: List[float]) -> float:
+        return round(percentile(sorted(values), 50), 1)
+
+    first_tool = next(iter(samples[0]["renders_ms"]))
+    return {
+        "commit": git_commit(),
+        "samples": repeat,
+        "streamlit_import_ms": p50([s["streamlit_import_ms"] for s in samples]),
+        "first_render_ms": p50([s["renders_ms"][first_tool] for s in samples]),
+        "first_tool": first_tool,
+        "switch_render_ms": {tool: p50([s["renders_ms"][tool] for s in samples])
+                             for tool in samples[0]["renders_ms"] if tool != first_tool},
+        "first_render_loaded": samples[0]["first_render_loaded"],
+        "errors": samples[0]["errors"],
+    }
+
+
+def print_report(result: Dict) -> None:
+    print(f"commit {result['commit']}  median of {result['samples']} cold start(s)")
+    print(f"  import streamlit                     {result['streamlit_import_ms']:>8.1f} ms")
+    print(f"  first render ({result['first_tool'][:20]:20})  {result['first_render_ms']:>8.1f} ms")
+    for tool, ms in result["switch_render_ms"].items():
+        print(f"  switch to {tool[:26]:26} {ms:>8.1f} ms")
+    print(f"  loaded by the first render: {', '.join(result['first_render_loaded']) or '-'}")
+    for error in result["errors"]:
+        print(f"  error: {error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="cold starts to sample (default: %(default)s)")
+    parser.add_argument("-o", "--output", help="also save the results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(sample()))
+        return 0
+    result = run(args.repeat)
+    print_report(result)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"saved {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Compare text-extraction backends (speed and yield) on a sample of resumes.
+
+    python -m benchmarks.compare_backends ./resumes                 # folder, searched recursively
+    python -m benchmarks.compare_backends resumes.zip --format pdf -o backends.json
+    python -m benchmarks.compare_backends -n 50                     # synthetic corpus
+
+Every registered backend (see extraction_backends) reads every file of its format in
+full, and so does the configured fallback chain. Per backend it reports files/sec,
+latency percentiles and yield: files it could open, files it got any text from and
+characters extracted per file.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.run_benchmarks import git_commit, summarize
+from extraction_backends import BACKENDS, OpenPages, backend_chain, file_format, open_with_fallback
+from resume_cli import iter_source_files
+
+
+# --------------------------
+# Sample files
+# --------------------------
+def load_files(source: str) -> List[Tuple[str, bytes]]:
+    """(name, bytes) for every resume in a folder or zip archive."""
+    files = []
+    zf = zipfile.ZipFile(source) if zipfile.is_zipfile(source) and not os.path.isdir(source) else None
+    try:
+        for name, info in iter_source_files(source):
+            if zf is not None:
+                files.append((name, zf.read(info)))
+            else:
+                with open(os.path.join(source, name), "rb") as f:
+                    files.append((name, f.read()))
+    finally:
+        if zf is not None:
+            zf.close()
+    return files
+
+
+# --------------------------
+# Comparison
+# --------------------------
+def measure(open_pages: OpenPages, files: List[Tuple[str, bytes]]) -> Dict:
+    samples, opened, with_text, chars = [], 0, 0, 0
+    for _, data in files:
+        start = time.perf_counter()
+        try:
+            page_count, pages = open_pages(data)
+            text = "\n".join(pages)
+        except Exception:
+            page_count, text = 0, ""
+        samples.append(time.perf_counter() - start)
+        opened += bool(page_count)
+        with_text += bool(text.strip())
+        chars += len(text)
+    result = summarize(samples)
+    result.update({
+        "opened": opened,
+        "with_text": with_text,
+        "yield_pct": round(with_text * 100.0 / len(files), 1) if files else 0.0,
+        "chars_per_file": round(chars / len(files), 1) if files else 0.0,
+    })
+    return result
+
+
+def compare(files: List[Tuple[str, bytes]], formats: Optional[List[str]] = None) -> Dict:
+    by_format: Dict[str, List[Tuple[str, bytes]]] = {}
+    for name, data in files:
+        fmt = file_format(name)
+        if fmt is not None and (not formats or fmt in formats):
+            by_format.setdefault(fmt, []).append((name, data))
+
+    results = {}
+    for fmt, fmt_files in sorted(by_format.items()):
+        rows = {name: measure(open_pages, fmt_files) for name, open_pages in BACKENDS[fmt].items()}
+        chain = backend_chain(fmt)
+        rows[f"chain[{','.join(name for name, _ in chain)}]"] = measure(
+            lambda source: open_with_fallback(chain, source), fmt_files)
+        results[fmt] = {"files": len(fmt_files), "backends": rows}
+    return results
+
+
+def print_report(results: Dict) -> None:
+    for fmt, entry in results.items():
+        print(f"{fmt}: {entry['files']} file(s)")
+        print(f"  {'backend':28} {'files/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'opened':>7} "
+              f"{'w/ text':>7} {'yield %':>8} {'chars/file':>11}")
+        for name, s in entry["backends"].items():
+            print(f"  {name:28} {s['per_sec']:>9.1f} {s['p50_ms']:>9.2f} {s['p90_ms']:>9.2f} {s['opened']:>7} "
+                  f"{s['with_text']:>7} {s['yield_pct']:>8.1f} {s['chars_per_file']:>11.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", nargs="?", help="folder or .zip of resumes (default: synthetic corpus)")
+    parser.add_argument("--format", action="append", choices=sorted(BACKENDS), help="only this format (repeatable)")
+    parser.add_argument("-n", "--files", type=int, default=50, help="synthetic corpus size (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", help="also save the results as JSON")
+    args = parser.parse_args(argv)
+
+    files = load_files(args.source) if args.source else generate_corpus(args.files, seed=args.seed)
+    if not files:
+        print(f"no .pdf/.docx files found in {args.source}", file=sys.stderr)
+        return 1
+    results = compare(files, args.format)
+    print_report(results)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"commit": git_commit(), "source": args.source or "synthetic", "formats": results}, f, indent=2)
+        print(f"saved {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Reproducible synthetic resume corpus (PDF + DOCX) for benchmarking.
+
+Everything is generated locally from a seed: PDFs are written directly as minimal
+PDF 1.4 files (Helvetica text, one content stream per page) and DOCX files via
+python-docx, so no extra dependencies or network access are needed.
+"""
+import random
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+from docx import Document
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rahul", "Meera"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Gupta", "Nair", "Mehta", "Kapoor", "Das", "Singh", "Joshi"]
+COMPANIES = ["Axis Bank", "Infosys", "Zomato", "Byju's", "HDFC Life", "Airtel", "Delhivery", "Marriott", "Cipla",
+             "Freshworks", "Godrej Properties", "Flipkart", "Razorpay", "ITC"]
+INDUSTRY_PHRASES = ["pharmaceutical sales", "hotel operations", "enterprise software", "real estate", "agritech",
+                    "sales executive", "business development", "HoReCa channel", "banking", "FMCG distribution",
+                    "telecom", "insurance", "fintech", "information technology", "SaaS", "B2B", "edtech", "BFSI",
+                    "logistics and supply chain", "e-commerce"]
+FILLER = ("managed cross functional teams to deliver quarterly targets while improving customer retention "
+          "through structured account planning and weekly pipeline reviews with regional stakeholders").split()
+DEGREES = ["B.Tech in Computer Science", "MBA in Marketing", "BSc Economics", "MCA", "Bachelor of Commerce"]
+SKILLS = ["Negotiation", "CRM", "Salesforce", "Excel", "Key Accounts", "Channel Sales", "Team Leadership"]
+
+
+# --------------------------
+# Resume content
+# --------------------------
+def make_resume(rng: random.Random, pages: int, keyword_density: float) -> Dict:
+    """Structured resume content: header lines, body lines per page and a skills table."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    header = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}",
+        "Professional Summary",
+        f"Sales professional with {rng.randint(2, 15)} years of experience.",
+    ]
+    body_pages = []
+    for page in range(pages):
+        lines = ["Experience" if page == 0 else "Experience (contd.)"]
+        for _ in range(40):
+            words = [rng.choice(FILLER) for _ in range(rng.randint(8, 14))]
+            if rng.random() < keyword_density:
+                words.insert(rng.randrange(len(words)), rng.choice(INDUSTRY_PHRASES))
+            lines.append(" ".join(words))
+        if page == 0:
+            start = rng.randint(2008, 2020)
+            lines.insert(1, f"{rng.choice(COMPANIES)}  Jan {start} - Present")
+        body_pages.append(lines)
+    education = ["Education", rng.choice(DEGREES) + ", Some University, " + str(rng.randint(2000, 2018))]
+    table = [["Skill", "Level", "Years"]] + [
+        [s, rng.choice(["Expert", "Advanced", "Intermediate"]), str(rng.randint(1, 10))]
+        for s in rng.sample(SKILLS, rng.randint(2, len(SKILLS)))
+    ]
+    return {"header": header, "pages": body_pages, "education": education, "table": table}
+
+
+# --------------------------
+# Writers
+# --------------------------
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(resume: Dict) -> bytes:
+    page_lines: List[List[str]] = []
+    for i, lines in enumerate(resume["pages"]):
+        content = (resume["header"] if i == 0 else []) + lines
+        if i == len(resume["pages"]) - 1:
+            content += resume["education"] + ["Skills"]
+        page_lines.append(content)
+
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>",
+               3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    num = 4
+    for i, lines in enumerate(page_lines):
+        ops = ["BT /F1 9 Tf 11 TL 40 800 Td"] + [f"({_pdf_escape(l)}) Tj T*" for l in lines] + ["ET"]
+        if i == len(page_lines) - 1:  # skills table: one text object per cell
+            y = 780 - 11 * len(lines)
+            for row in resume["table"]:
+                for col, cell in enumerate(row):
+                    ops.append(f"BT /F1 9 Tf {40 + col * 150} {y} Td ({_pdf_escape(cell)}) Tj ET")
+                y -= 12
+        stream = "\n".join(ops)
+        objects[num] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {num + 1} 0 R >>")
+        objects[num + 1] = f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream"
+        kids.append(f"{num} 0 R")
+        num += 2
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for key in sorted(objects):
+        offsets[key] = out.tell()
+        out.write(f"{key} 0 obj\n{objects[key]}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {num}\n0000000000 65535 f \n".encode())
+    for key in range(1, num):
+        out.write(f"{offsets[key]:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {num} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def write_docx(resume: Dict) -> bytes:
+    doc = Document()
+    for line in resume["header"]:
+        doc.add_paragraph(line)
+    for lines in resume["pages"]:
+        for line in lines:
+            doc.add_paragraph(line)
+    for line in resume["education"]:
+        doc.add_paragraph(line)
+    table = doc.add_table(rows=len(resume["table"]), cols=len(resume["table"][0]))
+    for r, row in enumerate(resume["table"]):
+        for c, cell in enumerate(row):
+            table.cell(r, c).text = cell
+    out = BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+# --------------------------
+# Corpus
+# --------------------------
+def generate_corpus(n_files: int = 100, seed: int = 42, max_pages: int = 6,
+                    docx_share: float = 0.4) -> List[Tuple[str, bytes]]:
+    """Return [(filename, bytes)]; the same arguments always give the same corpus."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n_files):
+        pages = 1 if rng.random() < 0.5 else rng.randint(2, max_pages)
+        density = rng.choice([0.0, 0.05, 0.2, 0.5])
+        resume = make_resume(rng, pages, density)
+        if rng.random() < docx_share:
+            corpus.append((f"resume_{i:05d}.docx", write_docx(resume)))
+        else:
+            corpus.append((f"resume_{i:05d}.pdf", write_pdf(resume)))
+    return corpus
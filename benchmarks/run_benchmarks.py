@@ -0,0 +1,221 @@
+"""Benchmark the resume pipeline stage by stage on a synthetic corpus.
+
+    python -m benchmarks.run_benchmarks                      # 100 files, tech mode
+    python -m benchmarks.run_benchmarks -n 500 --workers 4 -o benchmarks/results/run.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json
+
+Reports files/sec, per-stage latency percentiles and how much each stage raised the
+process's peak RSS (ru_maxrss only ever grows, so a stage that stays under an earlier
+stage's peak shows 0), and saves everything
+as JSON (tagged with the current git commit) so runs can be compared across commits.
+The extraction cache and near-duplicate reuse are disabled so every run measures real
+parsing work, and the candidate index is disabled so synthetic resumes never end up in it.
+"""
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+os.environ["RESUME_PARSER_CACHE"] = "0"
+os.environ["RESUME_PARSER_INDEX"] = "0"  # keep synthetic resumes out of the candidate index
+os.environ["RESUME_PARSER_DEDUP"] = "0"  # repeated measurements must not reuse earlier records
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from resume_sections import SectionIndex  # noqa: E402
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+# --------------------------
+# Measurement helpers
+# --------------------------
+def peak_rss_mb(children: bool = False) -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KiB elsewhere
+    return round(usage.ru_maxrss / scale, 1)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "total_s": round(total, 6),
+        "per_sec": round(len(ordered) / total, 2) if total else 0.0,
+        "mean_ms": round(total / len(ordered) * 1000, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 4),
+        "p90_ms": round(percentile(ordered, 90) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4) if ordered else 0.0,
+    }
+
+
+def time_each(fn: Callable, inputs: List, repeat: int = 1) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        for args in inputs:
+            start = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure(fn: Callable, inputs: List, repeat: int = 1) -> Dict[str, float]:
+    """``summarize`` of ``time_each``, plus the stage's peak RSS growth and the process peak after it."""
+    before = peak_rss_mb()
+    stats = summarize(time_each(fn, inputs, repeat))
+    stats["process_peak_rss_mb"] = peak_rss_mb()
+    stats["rss_growth_mb"] = round(stats["process_peak_rss_mb"] - before, 1)
+    return stats
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --------------------------
+# Benchmark
+# --------------------------
+def run(mode: str, n_files: int, seed: int, max_pages: int, workers: int, repeat: int) -> Dict:
+    tool = importlib.import_module({"tech": "xcelgrad_tech", "sales": "xcelgrad_sales"}[mode])
+    from batch_runner import run_batch
+    from record_table import RecordTable
+
+    t0 = time.perf_counter()
+    corpus = generate_corpus(n_files, seed=seed, max_pages=max_pages)
+    generation_s = time.perf_counter() - t0
+    pdfs = [(data,) for name, data in corpus if name.endswith(".pdf")]
+    docxs = [(data,) for name, data in corpus if name.endswith(".docx")]
+
+    stages = {}
+    stages["extract_text_from_pdf_bytes"] = measure(tool.extract_text_from_pdf_bytes, pdfs, repeat)
+    stages["extract_text_from_docx_bytes"] = measure(tool.extract_text_from_docx_bytes, docxs, repeat)
+
+    texts = [(tool.extract_text_from_upload(name, data),) for name, data in corpus]
+    stages["section_index"] = measure(SectionIndex.build, texts, repeat)
+    for fn_name in ("extract_name", "extract_email", "extract_phone", "extract_education",
+                    "extract_location", "extract_total_experience", "scan_contact_fields"):
+        fn = getattr(tool, fn_name, None)
+        if fn is not None:
+            stages[fn_name] = measure(fn, texts, repeat)
+
+    skills = tool.SKILLS_TO_CHECK
+    stages["check_skill_present"] = measure(
+        lambda text: [tool.check_skill_present(text, skill) for skill in skills], texts, repeat)
+    if hasattr(tool, "match_industries"):
+        stages["match_industries"] = measure(lambda text: tool.match_industries(text, skills), texts, repeat)
+
+    stages["process_single_resume"] = measure(
+        lambda name, data: tool.process_single_resume(data, name, skills),
+        [(name, data) for name, data in corpus], repeat)
+
+    records = [r for r in (tool.process_single_resume(data, name, skills) for name, data in corpus) if r]
+    stages["generate_excel_from_data"] = measure(tool.generate_excel_from_data, [(records,)], repeat)
+    stages["generate_excel_from_data"]["rows"] = len(records)
+    stages["record_table"] = measure(lambda rows: RecordTable.from_records(rows, skills), [(records,)], repeat)
+    stages["record_table"]["nbytes"] = RecordTable.from_records(records, skills).nbytes()
+
+    jobs = [(data, name) for name, data in corpus]
+    start = time.perf_counter()
+    run_batch(tool.process_single_resume, jobs, skills, workers=workers)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "mode": mode,
+            "files": n_files,
+            "pdf_files": len(pdfs),
+            "docx_files": len(docxs),
+            "seed": seed,
+            "max_pages": max_pages,
+            "repeat": repeat,
+            "corpus_generation_s": round(generation_s, 3),
+        },
+        "stages": stages,
+        "batch": {
+            "workers": workers,
+            "total_s": round(batch_s, 4),
+            "files_per_sec": round(len(jobs) / batch_s, 2) if batch_s else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_children_mb": peak_rss_mb(children=True),
+        },
+    }
+
+
+def print_report(result: Dict, baseline: Optional[Dict] = None) -> None:
+    meta = result["meta"]
+    print(f"commit {meta['commit']}  mode={meta['mode']}  files={meta['files']} "
+          f"({meta['pdf_files']} pdf / {meta['docx_files']} docx)")
+    header = f"{'stage':32} {'files/s':>10} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'+RSS MB':>8}"
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+    for name, s in result["stages"].items():
+        line = (f"{name:32} {s['per_sec']:>10.1f} {s['p50_ms']:>10.3f} {s['p90_ms']:>10.3f} "
+                f"{s['p99_ms']:>10.3f} {s['rss_growth_mb']:>8.1f}")
+        base = (baseline or {}).get("stages", {}).get(name)
+        if base and base.get("p50_ms"):
+            line += f" {s['p50_ms'] / base['p50_ms']:>11.2f}x"
+        print(line)
+    batch = result["batch"]
+    line = (f"batch ({batch['workers']} workers): {batch['files_per_sec']:.1f} files/s, "
+            f"process peak RSS {batch['peak_rss_mb']} MB")
+    if baseline and baseline.get("batch", {}).get("files_per_sec"):
+        line += f" ({batch['files_per_sec'] / baseline['batch']['files_per_sec']:.2f}x baseline)"
+    print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("tech", "sales"), default="tech")
+    parser.add_argument("-n", "--files", type=int, default=100, help="corpus size (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-pages", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="workers for the batch stage")
+    parser.add_argument("--repeat", type=int, default=1, help="repeat each per-stage measurement")
+    parser.add_argument("-o", "--output", help="JSON output path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args(argv)
+
+    result = run(args.mode, args.files, args.seed, args.max_pages, args.workers, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"{result['meta']['commit'] or 'run'}-{args.mode}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"saved {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""Persistent, searchable index of processed resumes (SQLite + FTS5).
+
+When indexing is on, each record built by a tool is stored with its extracted text, so past
+batches can be searched by keyword and industry flags without re-uploading or re-parsing
+anything, and re-matched when the industry taxonomy changes (see rematch). It is off by
+default, since the index keeps every resume's full text (personal data) on disk; turn it on
+with RESUME_PARSER_INDEX=1, the "Save to candidate index" option of a page or the CLI's --index:
+
+    python candidate_index.py fintech bangalore --industry Fintech --industry BFSI
+    python candidate_index.py '"key accounts"' --mode sales --limit 20 --json
+    python candidate_index.py --stats
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from extraction_cache import cache_dir
+from stage_timing import StageTimer, timer_or_null
+from upload_spool import FileSource, source_digest
+
+
+# --------------------------
+# Configuration
+# --------------------------
+def index_path() -> str:
+    return os.environ.get("RESUME_PARSER_INDEX_DB", os.path.join(cache_dir(), "candidates.sqlite3"))
+
+
+def index_enabled() -> bool:
+    """Whether processed resumes are indexed (RESUME_PARSER_INDEX=1; off by default)."""
+    return os.environ.get("RESUME_PARSER_INDEX", "0").lower() in ("1", "true", "yes", "on")
+
+
+def index_option(key: Optional[str] = None) -> bool:
+    """Streamlit "Save to candidate index" checkbox, defaulting to RESUME_PARSER_INDEX."""
+    import streamlit as st
+
+    return st.checkbox("Save to candidate index", value=index_enabled(), key=key,
+                       help=f"Keep each resume's full text and fields in a local search index (`{index_path()}`) "
+                            "for 🔎 Candidate Search. Off by default: the text is personal data.")
+
+
+# Record columns copied into their own table columns (the full record is kept as JSON too).
+FIELD_COLUMNS = {
+    "Filename": "filename",
+    "Name": "name",
+    "Email": "email",
+    "Phone Number": "phone",
+    "Education": "education",
+    "Location": "location",
+    "Total Years of Work Experience": "experience",
+}
+
+
+def fts_query(keywords: str) -> str:
+    """Turn free text into an FTS5 query: every word or "quoted phrase" must appear."""
+    terms = [phrase or word for phrase, word in re.findall(r'"([^"]+)"|(\S+)', keywords)]
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms if term.strip())
+
+
+# --------------------------
+# SQLite index
+# --------------------------
+class CandidateIndex:
+    """Candidates keyed by (content digest, mode); text in FTS5, industry flags in an indexed table.
+
+    Industry flags are stored one row per (industry, candidate) that is present, so
+    "all of these industries" is an index range scan per industry rather than a scan of
+    every record. Re-indexing the same file under the same mode replaces its entry.
+
+    One handle can be shared by threads (Streamlit runs every rerun on a new one); its
+    calls are serialized with a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or index_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY,
+                digest TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                filename TEXT,
+                name TEXT,
+                email TEXT,
+                phone TEXT,
+                education TEXT,
+                location TEXT,
+                experience REAL,
+                record TEXT NOT NULL,
+                indexed_at REAL NOT NULL,
+                match_sections TEXT,
+                fingerprints TEXT,
+                taxonomy TEXT,
+                UNIQUE (digest, mode)
+            );
+            CREATE INDEX IF NOT EXISTS candidates_indexed_at ON candidates (indexed_at);
+            CREATE TABLE IF NOT EXISTS candidate_industries (
+                industry TEXT NOT NULL COLLATE NOCASE,
+                candidate_id INTEGER NOT NULL,
+                PRIMARY KEY (industry, candidate_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS candidate_industries_by_candidate
+                ON candidate_industries (candidate_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidate_text USING fts5(text, tokenize='unicode61');
+            """
+        )
+        # indexes created before candidates kept how their industries were matched
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(candidates)")}
+        for column in ("match_sections", "fingerprints", "taxonomy"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE candidates ADD COLUMN {column} TEXT")
+
+    def add(self, mode: str, digest: str, record: Dict, text: str, industries: Sequence[str],
+            fingerprints: Optional[Dict[str, str]] = None, match_sections: Sequence[str] = (),
+            taxonomy: Optional[Sequence[str]] = None) -> int:
+        """Insert or replace one candidate; ``industries`` are the ones checked.
+
+        ``fingerprints`` ({industry: pattern fingerprint} of the industries checked),
+        ``match_sections`` and ``taxonomy`` (every industry the tool knew, checked or not)
+        record how the flags were matched, so a re-match knows which ones a taxonomy edit
+        made stale and which industries are new.
+        """
+        fields = [record.get(key) for key in FIELD_COLUMNS]
+        matched = (json.dumps(list(match_sections)), None if fingerprints is None else json.dumps(fingerprints),
+                   None if taxonomy is None else json.dumps(list(taxonomy)))
+        flagged = [industry for industry in industries if record.get(industry) == 1]
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT id FROM candidates WHERE digest = ? AND mode = ?",
+                                   (digest, mode)).fetchone()
+                if row is not None:
+                    candidate_id = row[0]
+                    conn.execute("DELETE FROM candidate_industries WHERE candidate_id = ?", (candidate_id,))
+                    conn.execute("DELETE FROM candidate_text WHERE rowid = ?", (candidate_id,))
+                    conn.execute(
+                        f"UPDATE candidates SET {', '.join(f'{col} = ?' for col in FIELD_COLUMNS.values())}, "
+                        "record = ?, indexed_at = ?, match_sections = ?, fingerprints = ?, taxonomy = ? WHERE id = ?",
+                        (*fields, json.dumps(record), time.time(), *matched, candidate_id),
+                    )
+                else:
+                    candidate_id = conn.execute(
+                        f"INSERT INTO candidates (digest, mode, {', '.join(FIELD_COLUMNS.values())}, "
+                        "record, indexed_at, match_sections, fingerprints, taxonomy) "
+                        f"VALUES (?, ?, {', '.join('?' * len(FIELD_COLUMNS))}, ?, ?, ?, ?, ?)",
+                        (digest, mode, *fields, json.dumps(record), time.time(), *matched),
+                    ).lastrowid
+                conn.executemany("INSERT INTO candidate_industries VALUES (?, ?)",
+                                 [(industry, candidate_id) for industry in flagged])
+                conn.execute("INSERT INTO candidate_text (rowid, text) VALUES (?, ?)", (candidate_id, text))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return candidate_id
+
+    def search(self, keywords: str = "", industries: Sequence[str] = (), mode: Optional[str] = None,
+               limit: int = 100) -> List[Dict]:
+        """Candidates matching every keyword and every industry flag, best matches first."""
+        where, params = [], []
+        query = fts_query(keywords)
+        if query:
+            where.append("candidate_text MATCH ?")
+            params.append(query)
+        industries = list(dict.fromkeys(industry.strip() for industry in industries if industry.strip()))
+        if industries:
+            where.append(
+                "c.id IN (SELECT candidate_id FROM candidate_industries WHERE industry IN "
+                f"({', '.join('?' * len(industries))}) GROUP BY candidate_id HAVING COUNT(*) = ?)"
+            )
+            params += industries + [len(industries)]
+        if mode:
+            where.append("c.mode = ?")
+            params.append(mode)
+
+        industry_list = ("(SELECT group_concat(industry, '|') FROM candidate_industries "
+                         "WHERE candidate_id = c.id) AS industry_list")
+        if query:
+            sql = (f"SELECT c.*, {industry_list} FROM candidate_text "
+                   "JOIN candidates c ON c.id = candidate_text.rowid")
+            order = "ORDER BY bm25(candidate_text)"
+        else:
+            sql = f"SELECT c.*, {industry_list} FROM candidates c"
+            order = "ORDER BY c.indexed_at DESC"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" {order} LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [d[0] for d in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor]
+            for row in rows:
+                row["industries"] = sorted(filter(None, (row.pop("industry_list") or "").split("|")))
+                row["record"] = json.loads(row["record"])
+                # snippets only for the rows returned (computing them in the ranked query would
+                # build one for every match before the LIMIT applies)
+                row["snippet"] = self._conn.execute(
+                    "SELECT snippet(candidate_text, 0, '[', ']', '…', 12) FROM candidate_text "
+                    "WHERE candidate_text MATCH ? AND rowid = ?", (query, row["id"])
+                ).fetchone()[0] if query else None
+        return rows
+
+    def iter_matches(self, mode: str, batch_size: int = 500) -> Iterator[Dict]:
+        """Every candidate of ``mode`` in indexing order: id, record, and the fingerprints, match
+        sections and taxonomy its flags were matched with (None for candidates indexed before they were kept)."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, record, match_sections, fingerprints, taxonomy FROM candidates "
+                    "WHERE mode = ? AND id > ? ORDER BY id LIMIT ?", (mode, last_id, batch_size)).fetchall()
+            for candidate_id, record, match_sections, fingerprints, taxonomy in rows:
+                yield {
+                    "id": candidate_id,
+                    "record": json.loads(record),
+                    "match_sections": None if match_sections is None else json.loads(match_sections),
+                    "fingerprints": None if fingerprints is None else json.loads(fingerprints),
+                    "taxonomy": None if taxonomy is None else json.loads(taxonomy),
+                }
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    def texts(self, candidate_ids: Sequence[int]) -> Dict[int, str]:
+        """Stored text per candidate id."""
+        with self._lock:
+            return dict(self._conn.execute(
+                f"SELECT rowid, text FROM candidate_text WHERE rowid IN ({', '.join('?' * len(candidate_ids))})",
+                list(candidate_ids)).fetchall())
+
+    def update_matches(self, updates: Iterable[Tuple[int, Dict, Dict[str, str], Sequence[str]]],
+                       taxonomy: Sequence[str]) -> None:
+        """Store re-matched flags: (id, record, fingerprints, industries flagged present) per candidate,
+        all matched under ``taxonomy``."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for candidate_id, record, fingerprints, flagged in updates:
+                    conn.execute("UPDATE candidates SET record = ?, fingerprints = ?, taxonomy = ? WHERE id = ?",
+                                 (json.dumps(record), json.dumps(fingerprints), json.dumps(list(taxonomy)),
+                                  candidate_id))
+                    conn.execute("DELETE FROM candidate_industries WHERE candidate_id = ?", (candidate_id,))
+                    conn.executemany("INSERT INTO candidate_industries VALUES (?, ?)",
+                                     [(industry, candidate_id) for industry in flagged])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def industries(self) -> List[str]:
+        """Every industry flagged on at least one candidate."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT industry FROM candidate_industries ORDER BY industry")]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            candidates = self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+        return {"candidates": candidates, "size_bytes": os.path.getsize(self.path)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM candidates")
+            self._conn.execute("DELETE FROM candidate_industries")
+            self._conn.execute("DELETE FROM candidate_text")
+
+
+_index: Optional[CandidateIndex] = None
+_index_pid: Optional[int] = None
+
+
+def get_index(enabled: Optional[bool] = None) -> Optional[CandidateIndex]:
+    """Per-process index handle (None when indexing is disabled or unavailable).
+    ``enabled``: None = RESUME_PARSER_INDEX."""
+    global _index, _index_pid
+    if not (index_enabled() if enabled is None else enabled):
+        return None
+    if _index is None or _index_pid != os.getpid():
+        try:
+            _index = CandidateIndex()
+        except (OSError, sqlite3.Error):
+            return None
+        _index_pid = os.getpid()
+    return _index
+
+
+def index_candidate(mode: str, source: FileSource, record: Dict, text: str, industries: Sequence[str],
+                    timer: Optional[StageTimer] = None, fingerprints: Optional[Dict[str, str]] = None,
+                    match_sections: Sequence[str] = (), taxonomy: Optional[Sequence[str]] = None,
+                    enabled: Optional[bool] = None) -> None:
+    """Persist a freshly built record when indexing is ``enabled`` (None = RESUME_PARSER_INDEX);
+    indexing problems never fail the resume itself.
+    ``fingerprints``, ``match_sections`` and ``taxonomy`` describe how its industries were matched."""
+    index = get_index(enabled)
+    if index is None:
+        return
+    with timer_or_null(timer).stage("candidate_index"):
+        try:
+            index.add(mode, source_digest(source), record, text, industries, fingerprints, match_sections, taxonomy)
+        except sqlite3.Error:
+            pass
+
+
+# --------------------------
+# CLI
+# --------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Search every resume processed so far.")
+    parser.add_argument("keywords", nargs="*", help='words or "quoted phrases" that must all appear')
+    parser.add_argument("-i", "--industry", action="append", default=[],
+                        help="required industry flag (repeatable)")
+    parser.add_argument("--mode", choices=("tech", "sales"), help="only candidates indexed by this tool")
+    parser.add_argument("-n", "--limit", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print full records as JSON lines")
+    parser.add_argument("--stats", action="store_true", help="print index size and industries, then exit")
+    parser.add_argument("--db", help="index database (default: RESUME_PARSER_INDEX_DB or the cache dir)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    index = CandidateIndex(args.db)
+    if args.stats:
+        stats = index.stats()
+        print(f"{stats['candidates']} candidate(s), {stats['size_bytes'] / 1024 / 1024:.1f} MB in {index.path}")
+        print("industries:", ", ".join(index.industries()) or "-")
+        return 0
+
+    start = time.perf_counter()
+    try:
+        rows = index.search(" ".join(args.keywords), args.industry, args.mode, args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for row in rows:
+        if args.json:
+            print(json.dumps({**row["record"], "industries": row["industries"], "mode": row["mode"]}))
+        else:
+            print(f"{row['filename']}\t{row['name'] or ''}\t{row['email'] or ''}\t{row['phone'] or ''}\t"
+                  f"{', '.join(row['industries'])}")
+            if row["snippet"]:
+                print(f"    {row['snippet'].replace(chr(10), ' ')}")
+    print(f"{len(rows)} match(es) in {elapsed_ms:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
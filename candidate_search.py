@@ -0,0 +1,98 @@
+"""Streamlit screen: search every resume processed so far (see candidate_index)."""
+import sqlite3
+import time
+
+import streamlit as st
+
+from candidate_index import CandidateIndex, index_enabled, index_path
+
+
+@st.cache_resource(show_spinner=False)
+def open_index(path: str) -> CandidateIndex:
+    """One shared handle per database, instead of reopening it on every rerun."""
+    return CandidateIndex(path)
+
+
+def show_rematch(index: CandidateIndex) -> None:
+    """Re-match the stored resumes against the current industry taxonomy (see rematch)."""
+    with st.expander("🔁 Re-match after an industry taxonomy change"):
+        st.caption("Rescans the stored text for industries whose patterns changed or that were added, "
+                   "without re-parsing any PDF/DOCX, and lists every candidate that gained or lost a flag.")
+        col1, col2 = st.columns(2)
+        with col1:
+            mode = st.selectbox("Tool", ["tech", "sales"], key="rematch_mode")
+        with col2:
+            dry_run = st.checkbox("Preview only (leave the index unchanged)", value=True, key="rematch_dry_run")
+        if st.button("🔁 Re-match stored resumes", key="rematch_button"):
+            from rematch import rematch
+
+            with st.spinner("Re-matching..."):
+                result = rematch(mode, index, dry_run)
+                st.session_state["rematch_result"] = (result, result.excel_bytes(), dry_run)
+        if "rematch_result" not in st.session_state:
+            return
+        result, excel_bytes, previewed = st.session_state["rematch_result"]
+        st.success(f"✅ {result.mode}: {len(result.records)} candidate(s), {result.rescanned} re-matched, "
+                   f"{len(result.changes)} flag change(s){' (preview, index unchanged)' if previewed else ''}")
+        if result.industries:
+            st.dataframe(result.summary_rows(), hide_index=True, use_container_width=True)
+        if result.changes:
+            st.dataframe(result.changes, hide_index=True, use_container_width=True)
+        st.download_button("📥 Download updated Excel File", excel_bytes, file_name=f"rematched_{result.mode}.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                           key="rematch_download")
+
+
+def main():
+    st.header("🔎 Candidate Search (all past batches)")
+    st.markdown(
+        "Resumes processed with **Save to candidate index** on are indexed locally with their full text and "
+        "industry flags. Search by keywords (all must appear; use \"quotes\" for phrases) and required industries."
+    )
+    if not index_enabled():
+        st.info("ℹ️ Candidate indexing is off by default; new batches are only added when **Save to candidate "
+                "index** is ticked on a tool page (or RESUME_PARSER_INDEX=1).")
+
+    try:
+        index = open_index(index_path())
+    except (OSError, sqlite3.Error) as e:
+        st.error(f"❌ Could not open the candidate index: {e}")
+        return
+    stats = index.stats()
+    show_rematch(index)
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        keywords = st.text_input("Keywords", placeholder='e.g. bangalore "key accounts"', key="search_keywords")
+    with col2:
+        industries = st.multiselect("Must have industries", index.industries(), key="search_industries")
+    with col3:
+        mode = st.selectbox("Tool", ["Any", "tech", "sales"], key="search_mode")
+    limit = st.slider("Max results", min_value=10, max_value=1000, value=100, step=10, key="search_limit")
+
+    start = time.perf_counter()
+    try:
+        rows = index.search(keywords, industries, None if mode == "Any" else mode, limit)
+    except sqlite3.OperationalError as e:
+        st.error(f"❌ Invalid search: {e}")
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    st.caption(f"{len(rows)} match(es) in {elapsed_ms:.1f} ms · {stats['candidates']} candidate(s) indexed "
+               f"({stats['size_bytes'] / 1024 / 1024:.1f} MB, `{index.path}`)")
+    if not rows:
+        return
+
+    import pandas as pd
+
+    df = pd.DataFrame([{
+        "Filename": row["filename"],
+        "Name": row["name"],
+        "Email": row["email"],
+        "Phone Number": row["phone"],
+        "Tool": row["mode"],
+        "Industries": ", ".join(row["industries"]),
+        "Match": row["snippet"],
+    } for row in rows])
+    st.dataframe(df, use_container_width=True)
+    st.download_button("📥 Download results (CSV)", df.to_csv(index=False).encode("utf-8"),
+                       file_name="candidate_search.csv", mime="text/csv")
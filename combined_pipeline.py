@@ -0,0 +1,193 @@
+"""Extract every upload once and build both tools' records from the same text."""
+from functools import partial
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+import xcelgrad_sales
+import xcelgrad_tech
+from batch_runner import SERIAL, default_worker_count, describe_budget
+from candidate_index import index_candidate, index_option
+from excel_export import StreamingExcelWriter
+from near_duplicates import (duplicate_groups, fingerprint_file, remember_record, reuse_record, settings_key,
+                             show_duplicate_groups)
+from page_stream import default_page_budget, resolve_page_budget
+from record_table import RecordTable, show_columnar_downloads
+from result_store import ResultStore, get_result_store
+from resume_sections import SECTIONS, default_match_sections, resolve_match_sections
+from stage_timing import (NULL_TIMER, StageTimer, TimingReport, show_timing_report, timer_or_null,
+                          timing_enabled_by_default)
+from text_extraction import extract_page_stream
+from upload_spool import FileSource
+
+# mode -> (tool module, sidebar label); each mode gets its tool's own sheet in the workbook
+MODES = {
+    "tech": (xcelgrad_tech, "Industry / Vertical Mapping"),
+    "sales": (xcelgrad_sales, "Skills from Experience (Tech Stack)"),
+}
+
+
+def default_skills_by_mode() -> Dict[str, List[str]]:
+    return {mode: tool.SKILLS_TO_CHECK for mode, (tool, _) in MODES.items()}
+
+
+def process_all_modes(file_bytes: FileSource, filename: str, skills_by_mode: Dict[str, List[str]],
+                      page_budget: Optional[int] = None, timer: Optional[StageTimer] = None,
+                      match_sections: Optional[List[str]] = None,
+                      index: Optional[bool] = None) -> Optional[Dict[str, Dict]]:
+    """Parse one upload once and return {mode: record} for every mode (None if it has no text).
+    With ``index`` (None = RESUME_PARSER_INDEX) every mode's record is saved to the candidate index.
+    Both modes share the stream's section index, so the text is segmented once.
+    Modes whose record an exact copy seen before already has reuse it (see near_duplicates)."""
+    page_budget = resolve_page_budget(page_budget)
+    match_sections = resolve_match_sections(match_sections)
+    with timer_or_null(timer).stage("text_extraction"):
+        stream = extract_page_stream(filename, file_bytes, page_budget, timer)
+    fingerprint = fingerprint_file(file_bytes, filename, stream.read_all(), timer)
+    records = {}
+    fingerprints = {mode: tool.get_industry_matcher(tuple(skills_by_mode[mode])).fingerprints
+                    for mode, (tool, _) in MODES.items()}
+    for mode, (tool, _) in MODES.items():
+        settings = settings_key(skills_by_mode[mode], page_budget, match_sections, fingerprints[mode])
+        record = reuse_record(fingerprint, mode, settings, timer)
+        if record is not None:
+            records[mode] = tool.rename_record(record, filename)
+            continue
+        record = tool.build_record(stream, filename, skills_by_mode[mode], timer, match_sections)
+        if record is None:
+            return None
+        remember_record(fingerprint, mode, settings, record)
+        records[mode] = record
+    for mode, record in records.items():
+        index_candidate(mode, file_bytes, record, stream.text, skills_by_mode[mode], timer, fingerprints[mode],
+                        match_sections, MODES[mode][0].SKILLS_TO_CHECK, index)
+    return records
+
+
+def new_excel_writer() -> StreamingExcelWriter:
+    """One workbook with a sheet per mode, named like each tool's own export."""
+    modes = list(MODES.values())
+    writer = StreamingExcelWriter(modes[0][0].EXCEL_SHEET_NAME)
+    for tool, _ in modes[1:]:
+        writer.add_sheet(tool.EXCEL_SHEET_NAME)
+    return writer
+
+
+def generate_excel_from_data(all_records: List[Dict[str, Dict]], timer: Optional[StageTimer] = None) -> bytes:
+    """Workbook with a sheet per mode from ``process_all_modes`` results."""
+    excel_writer = new_excel_writer()
+    with timer_or_null(timer).stage("excel_export"):
+        for records in all_records:
+            for mode, record in records.items():
+                excel_writer.append(record, MODES[mode][0].EXCEL_SHEET_NAME)
+        return excel_writer.to_bytes()
+
+
+# --------------------------
+# Streamlit UI
+# --------------------------
+def main():
+    st.header("📑 Batch Resume → Both Views (single pass)")
+    st.markdown(
+        "Each resume is parsed **once**; the extracted text feeds both the "
+        "**Industry / Vertical Mapping** and the **Skills from Experience** records. "
+        "The Excel file has one sheet per view."
+    )
+
+    uploaded_files = st.file_uploader(
+        "Upload Resumes (PDF or DOCX)", type=["pdf", "docx"], accept_multiple_files=True, key="combined_uploader"
+    )
+    with st.expander("⚙️ Processing options"):
+        serial_mode = st.checkbox("Serial mode (debug)", value=False, key="combined_serial",
+                                  help="Process files one by one on the app thread, without time or memory limits.")
+        workers = st.number_input("Worker processes", min_value=1, max_value=64, value=default_worker_count(),
+                                  disabled=serial_mode, key="combined_workers",
+                                  help=f"Each worker gets {describe_budget()}; a file over it is stopped.")
+        page_budget = st.number_input("Page budget per resume (0 = all pages)", min_value=0, max_value=500,
+                                      value=default_page_budget() or 0, key="combined_page_budget")
+        match_sections = st.multiselect("Match industries only in sections", SECTIONS,
+                                        default=list(default_match_sections()), key="combined_match_sections",
+                                        help="Leave empty to match across the whole resume.")
+        record_timings = st.checkbox("Record stage timings", value=timing_enabled_by_default(),
+                                     key="combined_timings")
+        save_index = index_option(key="combined_index")
+
+    settings = (tuple(tuple(skills) for skills in default_skills_by_mode().values()), int(page_budget),
+                tuple(match_sections), save_index)
+    store = get_result_store("combined")
+    keys = store.keys_for(uploaded_files or [], settings)
+    if store.batch and keys and not store.is_current(keys):
+        st.info(f"🔁 {store.new_files(keys)} new/changed file(s) since the last run; "
+                "already processed files will be reused.")
+
+    if st.button("🚀 Process All Resumes", type="primary", key="combined_process"):
+        if not uploaded_files:
+            st.error("⚠️ Please upload at least one resume first.")
+            return
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+
+        def on_progress(done, total, filename):
+            status_text.text(f"Processed {done}/{total}: {filename}")
+            progress_bar.progress(done / total)
+
+        process_fn = partial(process_all_modes, page_budget=int(page_budget), match_sections=tuple(match_sections),
+                             index=save_index)
+        store.run(process_fn, uploaded_files, default_skills_by_mode(), settings,
+                  workers=SERIAL if serial_mode else int(workers),
+                  on_progress=on_progress, instrument=record_timings)
+        status_text.empty()
+        progress_bar.empty()
+
+        timing_report = TimingReport()
+        export_timer = timing_report.batch if record_timings else NULL_TIMER
+        excel_writer = new_excel_writer()
+        tables = {mode: RecordTable(skills) for mode, skills in default_skills_by_mode().items()}
+        for filename, records, _, timings in store.batch_results():
+            timing_report.add(filename, timings)
+            for mode, record in (records or {}).items():
+                tables[mode].append(record)
+                with export_timer.stage("excel_export"):
+                    excel_writer.append(record, MODES[mode][0].EXCEL_SHEET_NAME)
+        if excel_writer.row_count():
+            with st.spinner("📝 Generating Excel file..."), export_timer.stage("excel_export"):
+                store.excel_bytes = excel_writer.to_bytes()
+        store.extras = {"timing_report": timing_report, "tables": tables,
+                        "duplicates": duplicate_groups([(name, digest) for name, digest, _ in store.batch])}
+
+    if store.batch:
+        show_results(store)
+
+
+def show_results(store: ResultStore):
+    for filename, error in store.batch_failures():
+        if error:
+            st.error(f"❌ Error processing {filename}: {error}")
+        else:
+            st.warning(f"⚠️ Could not extract text from: {filename} (unsupported/empty/corrupt)")
+
+    tables = store.extras.get("tables") or {mode: store.batch_table(skills, mode)
+                                            for mode, skills in default_skills_by_mode().items()}
+    processed = len(next(iter(tables.values())))
+    if not processed:
+        st.error("❌ Could not extract data from any of the uploaded files.")
+        return
+    st.success(f"✅ Parsed {processed} out of {len(store.batch)} file(s) once for both views!")
+
+    tabs = st.tabs([label for _, label in MODES.values()])
+    for tab, mode in zip(tabs, MODES):
+        with tab:
+            st.dataframe(tables[mode].to_frame(), use_container_width=True)
+            show_columnar_downloads(tables[mode], f"batch_resume_{mode}", key=f"combined_{mode}")
+
+    if store.excel_bytes:
+        st.download_button(
+            label="📥 Download Excel File (one sheet per view)",
+            data=store.excel_bytes,
+            file_name="batch_resume_all_views.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            type="primary"
+        )
+    show_duplicate_groups(store.extras.get("duplicates"))
+    if store.extras.get("timing_report"):
+        show_timing_report(store.extras["timing_report"])
@@ -0,0 +1,178 @@
+import re
+from typing import Dict, List, Optional
+
+from resume_sections import SectionIndex, section_index
+
+# --------------------------
+# Precompiled field patterns
+# --------------------------
+_NAME_PREFIX = re.compile(r'^(resume|curriculum vitae|cv)[\s:]*', re.I)
+_LINE = re.compile(r'[^\n]+')
+_EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Phone formats in priority order: the first format that matches anywhere wins. Only the
+# first two matter; any 10-12 digit run or ddd-ddd-dddd number is also a "local" match.
+_INTL_PHONE = re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3,5}\)?[-.\s]?\d{3,5}[-.\s]?\d{4}')
+_LOCAL_PHONE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Both formats are 10+ characters drawn only from digits, separators and "+()", so every
+# match lies inside one such run; the formats are only tried within those runs.
+_PHONE_RUN = re.compile(r'[+(\d][-+.()\s\d]{9,}')
+
+EDUCATION_HEADINGS = ('education', 'academic', 'qualification')  # in priority order
+_DEGREE_WORD = re.compile(r'\b(bachelor|master|phd|b\.tech|m\.tech|b\.e|m\.e|bsc|msc|bca|mca|diploma)\b')
+_DEGREE_LINE = re.compile(
+    r'(Bachelor[^,\n]*|Master[^,\n]*|PhD[^,\n]*|B\.Tech[^,\n]*|M\.Tech[^,\n]*|B\.E[^,\n]*|M\.E[^,\n]*|'
+    r'BSc[^,\n]*|MSc[^,\n]*|BCA[^,\n]*|MCA[^,\n]*)', re.I)
+EDUCATION_WINDOW = 500
+
+_LOCATION_LABEL = re.compile(
+    r'^[ \t]*(?:current\s+location|location|address|city|based\s+(?:in|at))[ \t]*[:\-–][ \t]*(?P<value>\S[^\n]*)',
+    re.I | re.M)
+CITIES = (
+    "Bangalore", "Bengaluru", "Mumbai", "New Delhi", "Delhi", "Gurgaon", "Gurugram", "Noida", "Hyderabad", "Chennai",
+    "Pune", "Kolkata", "Ahmedabad", "Jaipur", "Chandigarh", "Kochi", "Indore", "Lucknow", "Coimbatore", "Nagpur",
+)
+
+
+# --------------------------
+# Field scanners
+# --------------------------
+def _first_lines(text: str, n: int) -> List[str]:
+    """First ``n`` non-blank stripped lines, without splitting the whole text."""
+    lines = []
+    for match in _LINE.finditer(text):
+        line = match.group().strip()
+        if line:
+            lines.append(line)
+            if len(lines) == n:
+                break
+    return lines
+
+
+def _looks_like_name(line: str) -> bool:
+    words = line.split()
+    return 2 <= len(words) <= 4 and all(word.replace('.', '').isalpha() for word in words)
+
+
+def scan_name(text: str) -> str:
+    lines = _first_lines(text, 2)
+    if not lines:
+        return ""
+    first_line = _NAME_PREFIX.sub('', lines[0])
+    if _looks_like_name(first_line):
+        return first_line
+    if len(lines) > 1 and _looks_like_name(lines[1]):
+        return lines[1]
+    return first_line[:50]
+
+
+def _spans(sections: Optional[SectionIndex], section: str):
+    return sections.spans.get(section, ()) if sections is not None else ()
+
+
+def scan_email(text: str, sections: Optional[SectionIndex] = None) -> str:
+    """First email in the contact block (when ``sections`` indexes ``text``), else in the whole text."""
+    for start, end in _spans(sections, "contact"):
+        match = _EMAIL.search(text, start, end)
+        if match:
+            return match.group()
+    match = _EMAIL.search(text)
+    return match.group() if match else ""
+
+
+def _scan_phone(text: str, start: int, end: int) -> str:
+    local = ""
+    for run in _PHONE_RUN.finditer(text, start, end):
+        run_start, run_end = run.span()
+        match = _INTL_PHONE.search(text, run_start, run_end)
+        if match:
+            return match.group()
+        if not local:
+            match = _LOCAL_PHONE.search(text, run_start, run_end)
+            local = match.group() if match else ""
+    return local
+
+
+def scan_phone(text: str, sections: Optional[SectionIndex] = None) -> str:
+    """First international-format number, else the first local-format one; the contact block
+    (when ``sections`` indexes ``text``) is searched before the whole text."""
+    for start, end in _spans(sections, "contact"):
+        phone = _scan_phone(text, start, end)
+        if phone:
+            return phone
+    return _scan_phone(text, 0, len(text))
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _find_word(haystack: str, word: str) -> int:
+    """Offset of the first ``\\bword\\b`` in haystack (-1 if absent), using str.find."""
+    start = haystack.find(word)
+    while start != -1:
+        end = start + len(word)
+        if ((start == 0 or not _is_word_char(haystack[start - 1]))
+                and (end == len(haystack) or not _is_word_char(haystack[end]))):
+            return start
+        start = haystack.find(word, start + 1)
+    return -1
+
+
+def _degree_from(education_text: str) -> str:
+    degree_match = _DEGREE_LINE.search(education_text)
+    if degree_match:
+        return degree_match.group(1).strip()
+    lines = _first_lines(education_text, 2)
+    return lines[1] if len(lines) > 1 else (lines[0] if lines else "")
+
+
+def scan_education(text: str, sections: Optional[SectionIndex] = None) -> str:
+    """Degree line of the education section; without a recognised section heading, the text
+    after the first education heading word (or the first degree word anywhere)."""
+    if sections is not None and sections.has("education"):
+        start, end = sections.first_span("education")
+        return _degree_from(text[start:min(start + EDUCATION_WINDOW, end)])
+    text_lower = sections.lower if sections is not None else text.lower()
+    education_start = -1
+    for heading in EDUCATION_HEADINGS:
+        education_start = _find_word(text_lower, heading)
+        if education_start != -1:
+            break
+    if education_start == -1:
+        match = _DEGREE_WORD.search(text_lower)
+        return match.group(1).upper() if match else ""
+    return _degree_from(text[education_start:education_start + EDUCATION_WINDOW])
+
+
+def _scan_location(text: str, text_lower: str) -> str:
+    match = _LOCATION_LABEL.search(text)
+    if match:
+        return match.group('value').strip()[:100]
+    found = [(_find_word(text_lower, city.lower()), city) for city in CITIES]
+    found = [(start, city) for start, city in found if start != -1]
+    return min(found)[1] if found else ""
+
+
+def scan_location(text: str, sections: Optional[SectionIndex] = None) -> str:
+    """A labelled location line ("Location: Pune, MH"), else the first well-known city named;
+    the contact block (when ``sections`` indexes ``text``) is searched before the whole text."""
+    if sections is None:
+        return _scan_location(text, text.lower())
+    for start, end in _spans(sections, "contact"):
+        location = _scan_location(text[start:end], sections.lower[start:end])
+        if location:
+            return location
+    return _scan_location(text, sections.lower)
+
+
+def scan_contact_fields(text: str, sections: Optional[SectionIndex] = None) -> Dict[str, str]:
+    """Name, email, phone and education in one call, each searched in its section of ``text``
+    (the index is built here unless ``sections`` already indexes it)."""
+    sections = section_index(text, sections)
+    return {
+        'Name': scan_name(text),
+        'Email': scan_email(text, sections),
+        'Phone Number': scan_phone(text, sections),
+        'Education': scan_education(text, sections),
+    }
@@ -0,0 +1,73 @@
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+
+# --------------------------
+# Streaming (write-only) Excel export
+# --------------------------
+class StreamingExcelWriter:
+    """Append dict rows to an .xlsx workbook without keeping them in memory.
+
+    Uses openpyxl's write-only mode: every appended row is serialised straight into a
+    temporary file backing its worksheet, so peak memory does not depend on the number
+    of rows. The header row is taken from ``columns`` or from the first row's keys.
+    """
+
+    def __init__(self, sheet_name: str = "Resume_Data", columns: Optional[List[str]] = None):
+        from openpyxl import Workbook  # imported on first export, not at app start-up
+
+        self._wb = Workbook(write_only=True)
+        self._sheets = {}
+        self._default = sheet_name
+        self.add_sheet(sheet_name, columns)
+
+    def add_sheet(self, sheet_name: str, columns: Optional[List[str]] = None) -> None:
+        self._sheets[sheet_name] = {"ws": self._wb.create_sheet(sheet_name), "columns": None, "rows": 0}
+        if columns:
+            self._write_header(sheet_name, list(columns))
+
+    def _write_header(self, sheet_name: str, columns: List[str]) -> None:
+        sheet = self._sheets[sheet_name]
+        sheet["ws"].append(columns)
+        sheet["columns"] = columns
+
+    def append(self, row: Dict, sheet_name: Optional[str] = None) -> None:
+        sheet_name = sheet_name or self._default
+        sheet = self._sheets[sheet_name]
+        if sheet["columns"] is None:
+            self._write_header(sheet_name, list(row))
+        sheet["ws"].append([row.get(col) for col in sheet["columns"]])
+        sheet["rows"] += 1
+
+    def extend(self, rows: Iterable[Dict], sheet_name: Optional[str] = None) -> None:
+        for row in rows:
+            self.append(row, sheet_name)
+
+    def row_count(self, sheet_name: Optional[str] = None) -> int:
+        return self._sheets[sheet_name or self._default]["rows"]
+
+    def save(self, path_or_file) -> None:
+        """Write the workbook to a path or binary file object (the writer is finished afterwards)."""
+        self._wb.save(path_or_file)
+
+    def to_bytes(self) -> bytes:
+        """Finish the workbook via a temporary file and return its bytes."""
+        with tempfile.TemporaryFile() as tmp:
+            self.save(tmp)
+            tmp.seek(0)
+            return tmp.read()
+
+
+def columns_of(rows: List[Dict]) -> List[str]:
+    """Union of row keys in order of first appearance (same as ``pd.DataFrame(rows).columns``)."""
+    seen = {}
+    for row in rows:
+        for key in row:
+            seen.setdefault(key, None)
+    return list(seen)
+
+
+def rows_to_excel_bytes(rows: List[Dict], sheet_name: str) -> bytes:
+    writer = StreamingExcelWriter(sheet_name, columns_of(rows))
+    writer.extend(rows)
+    return writer.to_bytes()
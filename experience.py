@@ -0,0 +1,105 @@
+import datetime
+import re
+from typing import Callable, List, Optional, Tuple
+
+# --------------------------
+# Date-range grammar
+# --------------------------
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?')
+
+
+def _date(prefix: str) -> str:
+    """'Jan 2019', 'January, 2019', '01/2019' or a bare '2019'."""
+    return (rf'(?:(?P<{prefix}_month>{_MONTH})[\s,\']*|(?P<{prefix}_num>0?[1-9]|1[0-2])\s*[/.]\s*)?'
+            rf'(?P<{prefix}_year>(?:19|20)\d{{2}})(?!\d)')
+
+
+_PRESENT_WORDS = r'present|current(?:ly)?|now|ongoing|till\s+date|to\s+date|date'
+_PRESENT = rf'(?P<present>{_PRESENT_WORDS})\b'
+DATE_RANGE = re.compile(
+    r'(?<![\w/.])' + _date('start') + r'\s*(?:-|–|—|to|till|until)\s*(?:' + _date('end') + '|' + _PRESENT + ')',
+    re.I,
+)
+_LETTERS = re.compile(r'[a-z]{3,}', re.I)
+_DATE_WORDS = re.compile(rf'\b(?:{_MONTH}|{_PRESENT_WORDS}|to|till|until)', re.I)
+
+MIN_YEAR = 1950
+
+Interval = Tuple[int, int]  # [start, end) in months since year 0
+
+
+# --------------------------
+# Parsing
+# --------------------------
+def _month_index(match: re.Match, prefix: str) -> Optional[int]:
+    name, number = match.group(f"{prefix}_month"), match.group(f"{prefix}_num")
+    if name:
+        return _MONTHS.index(name[:3].lower())
+    if number:
+        return int(number) - 1
+    return None
+
+
+def _entry_block(text: str, start: int, end: int) -> str:
+    """The line holding a date range, plus the line above when the range has a line to itself
+    (so "Sales Intern, XYZ\\nJun 2018 - Aug 2018" still reads as an internship)."""
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', end)
+    line = text[line_start:line_end if line_end != -1 else len(text)]
+    if _LETTERS.search(_DATE_WORDS.sub(' ', line)) or line_start == 0:
+        return line
+    prev_start = text.rfind('\n', 0, line_start - 1) + 1
+    return text[prev_start:line_start] + line
+
+
+def parse_intervals(text: str, exclude: Optional[Callable[[str], bool]] = None,
+                    today: Optional[datetime.date] = None) -> List[Interval]:
+    """Every date range in ``text`` as a month interval, in one pass.
+
+    A bare start year counts from January and a bare end year up to January of that
+    year ("2017-2020" is three years); an end month is inclusive ("Jan 2019 - Dec 2019"
+    is twelve months). Ranges whose entry block ``exclude`` rejects (e.g. internships)
+    are dropped, as are ranges that end before they start or start in the future.
+    """
+    today = today or datetime.date.today()
+    now = today.year * 12 + today.month  # exclusive end for "present"
+    intervals = []
+    for match in DATE_RANGE.finditer(text):
+        start_year = int(match.group("start_year"))
+        start = start_year * 12 + (_month_index(match, "start") or 0)
+        if match.group("present"):
+            end = now
+        else:
+            end_month = _month_index(match, "end")
+            end = int(match.group("end_year")) * 12 + (0 if end_month is None else end_month + 1)
+        if start_year < MIN_YEAR or start >= end or start >= now:
+            continue
+        end = min(end, now)
+        if exclude is not None and exclude(_entry_block(text, match.start(), match.end())):
+            continue
+        intervals.append((start, end))
+    return intervals
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Union of possibly overlapping intervals (sort + sweep, O(n log n))."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def total_experience_years(text: str, exclude: Optional[Callable[[str], bool]] = None,
+                           today: Optional[datetime.date] = None) -> Optional[float]:
+    """Years covered by the resume's date ranges, overlaps counted once (None if it has none)."""
+    intervals = parse_intervals(text, exclude, today)
+    if not intervals:
+        return None
+    months = sum(end - start for start, end in merge_intervals(intervals))
+    return round(months / 12, 1)
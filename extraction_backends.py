@@ -0,0 +1,376 @@
+"""Pluggable text-extraction backends per document format.
+
+Every backend is an ``open_pages(source) -> (page_count, page_iterator)`` function, the
+shape PageStream consumes. PyPDF2, python-docx and the streaming DOCX reader (docx-xml)
+are always available; pypdf and pdfminer.six are registered when installed. The backends used per format, in order,
+come from the environment:
+
+    RESUME_PARSER_PDF_BACKENDS=pypdf,pypdf2    # try pypdf first, fall back to PyPDF2
+    RESUME_PARSER_DOCX_BACKENDS=python-docx    # skip the streaming reader
+
+A file falls back to the next backend in its chain when a backend cannot open it or
+gets no text from its first page; if none does better, the first backend's output is
+used. ``python -m benchmarks.compare_backends <folder>`` compares speed and yield.
+"""
+import os
+import posixpath
+import zipfile
+from importlib.util import find_spec
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from xml.etree import ElementTree
+
+from upload_spool import FileSource, open_source
+
+OpenPages = Callable[[FileSource], Tuple[Optional[int], Iterator[str]]]
+
+# Parser libraries are imported by the backend on first use, so importing this module (and
+# starting the app) never pays for them. A backend that cannot parse a file raises its
+# parser's exception; open_with_fallback moves on to the next backend and re-raises the last
+# error when none can open the file, so it fails as a parse error (see batch_runner) instead
+# of coming back empty. A single unreadable page yields no text as long as another page has some.
+
+
+# --------------------------
+# PDF backends
+# --------------------------
+def _iter_page_texts(pages, stream: BinaryIO) -> Iterator[str]:
+    # the reader pulls objects from the (file-backed) stream as pages are requested,
+    # so the stream stays open until the iterator is exhausted or discarded
+    error, any_text = None, False
+    try:
+        for page in pages:
+            try:
+                text = page.extract_text() or ""
+            except MemoryError:
+                raise
+            except Exception as e:  # one broken page: keep going
+                error, text = e, ""
+            any_text = any_text or bool(text.strip())
+            yield text
+        if error is not None and not any_text:
+            raise error
+    finally:
+        stream.close()
+
+
+def _reader_pages(reader_class, source: FileSource) -> Tuple[int, Iterator[str]]:
+    stream = open_source(source)
+    try:
+        reader = reader_class(stream)
+        page_count = len(reader.pages)
+    except BaseException:
+        stream.close()
+        raise
+    return page_count, _iter_page_texts(reader.pages, stream)
+
+
+def pypdf2_pages(source: FileSource) -> Tuple[int, Iterator[str]]:
+    """PyPDF2: pure Python, always installed."""
+    import PyPDF2
+
+    return _reader_pages(PyPDF2.PdfReader, source)
+
+
+def pypdf_pages(source: FileSource) -> Tuple[int, Iterator[str]]:
+    """pypdf: PyPDF2's maintained successor (faster, better text layout)."""
+    import pypdf
+
+    return _reader_pages(pypdf.PdfReader, source)
+
+
+def _pdfminer_page_texts(stream: BinaryIO) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    any_text = False
+    try:
+        for layout in extract_pages(stream):
+            text = "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+            any_text = any_text or bool(text.strip())
+            yield text
+    except MemoryError:
+        raise
+    except Exception:
+        if not any_text:  # keep the pages read before a late failure
+            raise
+    finally:
+        stream.close()
+
+
+def pdfminer_pages(source: FileSource) -> Tuple[Optional[int], Iterator[str]]:
+    """pdfminer.six: slower, but reads many PDFs (odd encodings, CID fonts) the others cannot."""
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    stream = open_source(source)
+    try:
+        page_count = resolve1(PDFDocument(PDFParser(stream)).catalog["Pages"])["Count"]
+        stream.seek(0)
+    except BaseException:
+        stream.close()
+        raise
+    return page_count, _pdfminer_page_texts(stream)
+
+
+# --------------------------
+# DOCX backends
+# --------------------------
+def python_docx_text(source: FileSource) -> str:
+    """Extract text from DOCX with python-docx (paragraphs + tables)"""
+    from docx import Document
+
+    with open_source(source) as stream:
+        doc = Document(stream)
+    parts = []
+    # paragraphs
+    for p in doc.paragraphs:
+        if p.text:
+            parts.append(p.text)
+    # tables
+    for table in doc.tables:
+        for row in table.rows:
+            row_text = [cell.text.strip() for cell in row.cells if cell.text and cell.text.strip()]
+            if row_text:
+                parts.append(" | ".join(row_text))
+    return "\n".join(parts)
+
+
+def python_docx_pages(source: FileSource) -> Tuple[int, Iterator[str]]:
+    """DOCX has no reliable page boundaries, so the whole document is a single page"""
+    return 1, iter([python_docx_text(source)])
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY, _P, _R, _HYPERLINK, _TBL, _TR, _TC = (_W + tag for tag in ("body", "p", "r", "hyperlink", "tbl", "tr", "tc"))
+_TC_PR, _TR_PR = _W + "tcPr", _W + "trPr"
+_VAL, _TYPE = _W + "val", _W + "type"
+# run content -> text, as python-docx's Run.text maps it (w:br only for line breaks)
+_RUN_TEXT = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+_BR, _T = _W + "br", _W + "t"
+_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_PACKAGE_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+
+def _run_text(run, parts: List[str]) -> None:
+    for item in run:
+        if item.tag == _T:
+            parts.append(item.text or "")
+        elif item.tag == _BR:
+            if item.get(_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(_RUN_TEXT.get(item.tag, ""))
+
+
+def _paragraph_text(paragraph) -> str:
+    # runs and hyperlinks directly under the paragraph, like python-docx's Paragraph.text
+    parts: List[str] = []
+    for child in paragraph:
+        if child.tag == _R:
+            _run_text(child, parts)
+        elif child.tag == _HYPERLINK:
+            for run in child:
+                if run.tag == _R:
+                    _run_text(run, parts)
+    return "".join(parts)
+
+
+def _property(element, container: str, name: str) -> Optional[str]:
+    """``./container/name/@w:val`` ("" when the element is there without a value)."""
+    properties = element.find(container)
+    found = properties.find(_W + name) if properties is not None else None
+    return None if found is None else found.get(_VAL, "")
+
+
+def _row_cells(row, cells: List[Tuple[int, Optional[str], str]],
+               above: Dict[int, Tuple[str, int]]) -> Tuple[List[str], Dict[int, Tuple[str, int]]]:
+    """Cell texts of one row, one per layout-grid column the way python-docx's ``row.cells``
+    yields them: a horizontally merged cell repeats per spanned column and a vertically
+    merged one repeats the text of the cell it continues."""
+    grid_before = _property(row, _TR_PR, "gridBefore")
+    offset = int(grid_before) if grid_before else 0
+    texts, starts = [], {}
+    for span, v_merge, text in cells:
+        if v_merge is not None and v_merge != "restart":  # w:vMerge without a value means "continue"
+            text, shown_span = above.get(offset, ("", span))
+        else:
+            shown_span = span
+        texts.extend([text] * shown_span)
+        starts[offset] = (text, shown_span)
+        offset += span
+    return texts, starts
+
+
+def _document_part(archive: zipfile.ZipFile) -> str:
+    """Name of the main document part (word/document.xml unless the package says otherwise)."""
+    try:
+        with archive.open("_rels/.rels") as rels:
+            for relation in ElementTree.parse(rels).getroot().iter(_PACKAGE_RELS):
+                if relation.get("Type") == _OFFICE_DOCUMENT:
+                    return posixpath.normpath(relation.get("Target", "").lstrip("/"))
+    except KeyError:
+        pass
+    return "word/document.xml"
+
+
+def _stream_docx_parts(stream: BinaryIO) -> Tuple[List[str], List[str]]:
+    paragraphs: List[str] = []
+    rows: List[str] = []
+    stack = []             # open elements, innermost last
+    cell_paragraphs = []   # paragraph texts of each open w:tc, innermost last
+    row_cells: List[Tuple[int, Optional[str], str]] = []
+    above: Dict[int, Tuple[str, int]] = {}
+    with zipfile.ZipFile(stream) as archive, archive.open(_document_part(archive)) as xml:
+        for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                stack.append(element)
+                if element.tag == _TC:
+                    cell_paragraphs.append([])
+                continue
+            stack.pop()
+            tag, parent = element.tag, stack[-1].tag if stack else None
+            if tag == _P:
+                if parent == _BODY:
+                    text = _paragraph_text(element)
+                    if text:
+                        paragraphs.append(text)
+                elif parent == _TC:
+                    cell_paragraphs[-1].append(_paragraph_text(element))
+                    element.clear()
+            elif tag == _TC:
+                text = "\n".join(cell_paragraphs.pop())
+                # cells of top-level tables only (w:body/w:tbl/w:tr/w:tc), as doc.tables
+                if len(stack) >= 3 and stack[-2].tag == _TBL and stack[-3].tag == _BODY:
+                    span = _property(element, _TC_PR, "gridSpan")
+                    row_cells.append((int(span) if span else 1, _property(element, _TC_PR, "vMerge"), text))
+            elif tag == _TR and parent == _TBL and len(stack) >= 2 and stack[-2].tag == _BODY:
+                texts, above = _row_cells(element, row_cells, above)
+                row_text = [text.strip() for text in texts if text and text.strip()]
+                if row_text:
+                    rows.append(" | ".join(row_text))
+                row_cells = []
+                element.clear()
+            elif tag == _TBL and parent == _BODY:
+                above = {}
+            if parent == _BODY:
+                element.clear()  # done with this block; keep memory flat on long documents
+    return paragraphs, rows
+
+
+def stream_docx_text(source: FileSource) -> str:
+    """Extract text from DOCX by streaming word/document.xml straight out of the zip.
+
+    Same output as ``python_docx_text`` (body paragraphs, then the " | "-joined rows of
+    the top-level tables) without building the python-docx object model, so large and
+    table-heavy documents are several times faster.
+    """
+    with open_source(source) as stream:
+        paragraphs, rows = _stream_docx_parts(stream)
+    return "\n".join(paragraphs + rows)
+
+
+def stream_docx_pages(source: FileSource) -> Tuple[int, Iterator[str]]:
+    return 1, iter([stream_docx_text(source)])
+
+
+# --------------------------
+# Registry
+# --------------------------
+FORMATS = {".pdf": "pdf", ".docx": "docx"}  # .doc not supported reliably without external deps
+
+# format -> backend name -> open_pages, in default fallback order
+BACKENDS: Dict[str, Dict[str, OpenPages]] = {fmt: {} for fmt in FORMATS.values()}
+
+
+def register_backend(fmt: str, name: str, open_pages: OpenPages) -> None:
+    """Add (or replace) a backend; new backends go last in the default order."""
+    BACKENDS.setdefault(fmt, {})[name] = open_pages
+
+
+register_backend("pdf", "pypdf2", pypdf2_pages)
+if find_spec("pypdf") is not None:
+    register_backend("pdf", "pypdf", pypdf_pages)
+if find_spec("pdfminer") is not None:
+    register_backend("pdf", "pdfminer", pdfminer_pages)
+register_backend("docx", "docx-xml", stream_docx_pages)
+register_backend("docx", "python-docx", python_docx_pages)
+
+
+def file_format(file_name: str) -> Optional[str]:
+    """'pdf' / 'docx' from the file extension (None if unsupported)."""
+    return FORMATS.get(os.path.splitext(file_name.lower())[1])
+
+
+def configured_backends(fmt: str) -> List[str]:
+    """Backend names for ``fmt`` from RESUME_PARSER_<FMT>_BACKENDS (default: all registered, in order).
+
+    Names that are not registered (e.g. not installed) are skipped; if none is left the
+    default order is used.
+    """
+    available = BACKENDS.get(fmt, {})
+    env = os.environ.get(f"RESUME_PARSER_{fmt.upper()}_BACKENDS", "")
+    names = [name.strip().lower() for name in env.split(",") if name.strip().lower() in available]
+    return list(dict.fromkeys(names)) or list(available)
+
+
+def backend_chain(fmt: str, names: Optional[Sequence[str]] = None) -> List[Tuple[str, OpenPages]]:
+    """(name, open_pages) for each backend to try on a ``fmt`` file, in order."""
+    available = BACKENDS.get(fmt, {})
+    return [(name, available[name]) for name in (names or configured_backends(fmt)) if name in available]
+
+
+# --------------------------
+# Fallback
+# --------------------------
+def _close(pages: Iterator[str]) -> None:
+    close = getattr(pages, "close", None)
+    if close is not None:
+        close()
+
+
+def _with_head(head: str, pages: Iterator[str]) -> Iterator[str]:
+    try:
+        yield head
+        yield from pages
+    finally:
+        _close(pages)
+
+
+def open_with_fallback(chain: List[Tuple[str, OpenPages]],
+                       source: FileSource) -> Tuple[Optional[int], Iterator[str]]:
+    """Open ``source`` with the first backend of ``chain`` that can, falling back further
+    when its first page has no text. The page count returned is that of the backend whose
+    pages are served. Raises the last backend's error when none of them can open the file."""
+    error, textless = None, None  # textless: the first backend that opened but read no text
+    for position, (_, open_pages) in enumerate(chain):
+        try:
+            page_count, pages = open_pages(source)
+        except MemoryError:
+            raise
+        except Exception as e:
+            error = e
+            continue
+        if not page_count:
+            _close(pages)
+            continue
+        if textless is None and position == len(chain) - 1:
+            return page_count, pages
+        # probe only the first page, so a page budget never makes a backend read further
+        # than the caller asked for
+        head = next(pages, None)
+        if head is not None and head.strip():
+            if textless is not None:
+                _close(textless[2])
+            return page_count, _with_head(head, pages)
+        if textless is None:
+            textless = (page_count, head, pages)
+        else:
+            _close(pages)
+    if textless is not None:
+        page_count, head, pages = textless
+        return page_count, pages if head is None else _with_head(head, pages)
+    if error is not None:
+        raise error
+    return 0, iter(())
+
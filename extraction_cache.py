@@ -0,0 +1,166 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Optional
+
+# --------------------------
+# Configuration
+# --------------------------
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "resume-parser-tool")
+DEFAULT_MAX_MB = 512
+
+
+def cache_dir() -> str:
+    return os.environ.get("RESUME_PARSER_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("RESUME_PARSER_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def cache_max_bytes() -> int:
+    env = os.environ.get("RESUME_PARSER_CACHE_MAX_MB")
+    mb = int(env) if env and env.isdigit() else DEFAULT_MAX_MB
+    return mb * 1024 * 1024
+
+
+def file_digest(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+# --------------------------
+# SQLite-backed LRU cache: (sha256, extractor) -> extracted text
+# --------------------------
+class ExtractionCache:
+    """Persistent content-addressed cache of extracted resume text.
+
+    Entries are keyed by the SHA-256 of the raw upload bytes plus an extractor id
+    (module, function and version), so changing an extractor invalidates its entries.
+    The cache is size-bounded; least recently used entries are evicted first. Hit and
+    miss counters and the running total size are persisted so they can be read from any
+    process (and a put never has to sum the whole table).
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or cache_dir()
+        self.max_bytes = cache_max_bytes() if max_bytes is None else max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, "extraction_cache.sqlite3")
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                digest TEXT NOT NULL,
+                extractor TEXT NOT NULL,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (digest, extractor)
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0);
+            INSERT OR IGNORE INTO counters SELECT 'size', COALESCE(SUM(size), 0) FROM entries;
+            """
+        )
+
+    def _bump(self, counter: str, by: int = 1) -> None:
+        self._conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (by, counter))
+
+    def _total(self) -> int:
+        return self._conn.execute("SELECT value FROM counters WHERE name = 'size'").fetchone()[0]
+
+    def get(self, digest: str, extractor: str, usable: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Cached text, or None. An entry ``usable`` rejects is deleted and counted as a miss."""
+        row = self._conn.execute(
+            "SELECT text, size FROM entries WHERE digest = ? AND extractor = ?", (digest, extractor)
+        ).fetchone()
+        if row is not None and usable is not None and not usable(row[0]):
+            self._conn.execute("DELETE FROM entries WHERE digest = ? AND extractor = ?", (digest, extractor))
+            self._bump("size", -row[1])
+            row = None
+        if row is None:
+            self._bump("misses")
+            return None
+        self._conn.execute(
+            "UPDATE entries SET last_access = ? WHERE digest = ? AND extractor = ?",
+            (time.time(), digest, extractor),
+        )
+        self._bump("hits")
+        return row[0]
+
+    def put(self, digest: str, extractor: str, text: str) -> None:
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = self._conn.execute(
+                "SELECT size FROM entries WHERE digest = ? AND extractor = ?", (digest, extractor)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (digest, extractor, text, size, time.time()),
+            )
+            self._bump("size", size - (old[0] if old else 0))
+            self._evict()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self._total()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT digest, extractor, size FROM entries ORDER BY last_access")
+        victims, freed = [], 0
+        for digest, extractor, size in rows:
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((digest, extractor))
+            freed += size
+        self._conn.executemany("DELETE FROM entries WHERE digest = ? AND extractor = ?", victims)
+        self._bump("size", -freed)
+
+    def stats(self) -> Dict[str, int]:
+        counters = dict(self._conn.execute("SELECT name, value FROM counters"))
+        entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"hits": counters.get("hits", 0), "misses": counters.get("misses", 0),
+                "entries": entries, "size_bytes": counters.get("size", 0)}
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM entries")
+        self._conn.execute("UPDATE counters SET value = 0")
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_pid: Optional[int] = None
+
+
+def get_cache() -> Optional[ExtractionCache]:
+    """Per-process cache handle (None when caching is disabled or unavailable)."""
+    global _cache, _cache_pid
+    if not cache_enabled():
+        return None
+    if _cache is None or _cache_pid != os.getpid():
+        try:
+            _cache = ExtractionCache()
+        except (OSError, sqlite3.Error):
+            return None
+        _cache_pid = os.getpid()
+    return _cache
+
+
+def cache_stats() -> Optional[Dict[str, int]]:
+    cache = get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.stats()
+    except sqlite3.Error:
+        return None
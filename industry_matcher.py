@@ -0,0 +1,366 @@
+import hashlib
+import json
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# --------------------------
+# Skill list normalisation
+# --------------------------
+def normalize_skill_list(skills: List[str]) -> List[str]:
+    """Deduplicate case-insensitive while preserving order and trim whitespace."""
+    seen = set()
+    normalized = []
+    for s in skills:
+        key = s.strip()
+        if not key:
+            continue
+        lower = key.lower()
+        if lower not in seen:
+            seen.add(lower)
+            if key.isupper() and len(key) <= 5:
+                display = key
+            else:
+                display = key.title()
+            normalized.append(display)
+    return normalized
+
+
+# --------------------------
+# Pattern fingerprints
+# --------------------------
+def pattern_fingerprint(patterns: List[str]) -> str:
+    """Short hash of one industry's pattern list; it changes whenever a pattern is edited, added or removed."""
+    return hashlib.sha1(json.dumps(list(patterns)).encode()).hexdigest()[:16]
+
+
+# --------------------------
+# Required literals (prefilter)
+# --------------------------
+# Non-ASCII characters that re.IGNORECASE matches to an ASCII letter; every other character
+# either lowercases to itself or to something no ASCII literal can equal.
+_ASCII_FOLDS = {0x130: "i", 0x131: "i", 0x17F: "s", 0x212A: "k"}
+_WORD = re.compile(r"\w+")
+_QUANTIFIER = re.compile(r"[?*+]\??|\{\d*(?:,\d*)?\}\??")
+_SPECIAL = set(".^$*+?{}[]\\|()")
+# back-references, conditionals and inline flags tie a branch to the rest of its pattern
+_OPAQUE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux-]")
+# kinds of literal, most selective first: a whole word, a word prefix / suffix, any substring
+WORD, PREFIX, SUFFIX, SUBSTRING = range(4)
+
+
+def _class_end(pattern: str, i: int) -> int:
+    """Index just past the character class opening at ``pattern[i]`` (past the end if unclosed)."""
+    i += 1
+    i += pattern[i:i + 1] == "^"
+    i += pattern[i:i + 1] == "]"
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i + 1
+
+
+def _group_end(pattern: str, i: int) -> int:
+    """Index just past the group opening at ``pattern[i]`` (past the end if unclosed)."""
+    depth = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            i = _class_end(pattern, i)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if not depth:
+                return i + 1
+        i += 1
+    return len(pattern) + 1
+
+
+def _split_branches(pattern: str) -> Optional[List[str]]:
+    """Top-level ``|`` branches of a pattern, looking through groups that wrap all of it
+    (None if its brackets don't balance)."""
+    while pattern.startswith("(") and _group_end(pattern, 0) == len(pattern):
+        if pattern.startswith("(?:"):
+            pattern = pattern[3:-1]
+        elif not pattern.startswith("(?"):
+            pattern = pattern[1:-1]
+        else:
+            break
+    branches, start, i = [], 0, 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char in "[(":
+            i = (_class_end if char == "[" else _group_end)(pattern, i)
+            if i > len(pattern):
+                return None
+            continue
+        if char == ")":
+            return None
+        if char == "|":
+            branches.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    return branches + [pattern[start:]]
+
+
+def _tokens(branch: str) -> List[Tuple[str, str, str]]:
+    """(kind, char, quantifier) per atom of a branch: "lit" (a word character), "bound"
+    (\\b, ^, $), "nonword" (a character that can't be part of a word) or "other"."""
+    tokens, i = [], 0
+    while i < len(branch):
+        char = branch[i]
+        if char == "\\":
+            nxt = branch[i + 1:i + 2]
+            i += 2
+            if nxt in ("b", "A", "Z"):
+                kind = "bound"
+            elif nxt in ("s", "W"):
+                kind = "nonword"
+            elif nxt.isascii() and (nxt.isalnum() or nxt == "_"):
+                kind = "other"  # \\d, \\w, \\B, \\n, \\x41, ...
+            else:
+                kind = "nonword" if nxt.isascii() and nxt.isprintable() else "other"
+            tokens.append((kind, nxt, ""))
+        elif char in "[(":
+            i = (_class_end if char == "[" else _group_end)(branch, i)
+            tokens.append(("other", "", ""))
+        elif char in "^$":
+            tokens.append(("bound", char, ""))
+            i += 1
+        elif char in _SPECIAL:
+            tokens.append(("other", char, ""))
+            i += 1
+        else:
+            i += 1
+            if char.isascii() and (char.isalnum() or char == "_"):
+                tokens.append(("lit", char.lower(), ""))
+            else:
+                tokens.append(("nonword" if char.isascii() else "other", char, ""))
+        quantifier = _QUANTIFIER.match(branch, i)
+        if quantifier and tokens:
+            kind, char, _ = tokens[-1]
+            tokens[-1] = (kind, char, quantifier.group())
+            i = quantifier.end()
+    return tokens
+
+
+def _branch_literals(branch: str) -> Tuple[List[Tuple[int, str]], Optional[str]]:
+    """Every run of required ASCII word characters in a branch as (kind, run), and the run
+    the branch opens with (after zero-width anchors only), if it has one."""
+    literals: List[Tuple[int, str]] = []
+    lead = None
+    run, left, run_leads = "", False, False
+    previous_bounds, at_start = False, True
+
+    def close(right: bool) -> None:
+        nonlocal lead, run
+        literals.append((WORD if left and right else PREFIX if left else SUFFIX if right else SUBSTRING, run))
+        if run_leads:
+            lead = run
+        run = ""
+
+    for kind, char, quantifier in _tokens(branch) + [("other", "", "")]:
+        required = not quantifier or quantifier[0] == "+"
+        if kind == "lit" and required:
+            if not run:
+                left, run_leads = previous_bounds, at_start
+            run += char
+            at_start = False
+            if quantifier:  # "ab+c" only guarantees "ab"
+                close(False)
+                previous_bounds = False
+            continue
+        bounds = kind in ("bound", "nonword") and required
+        if run:
+            close(bounds)
+        at_start = at_start and kind == "bound" and not quantifier
+        previous_bounds = bounds
+    return literals, lead
+
+
+def required_literals(pattern: str) -> Optional[List[Tuple[str, List[Tuple[int, str]], Optional[str]]]]:
+    """Split ``pattern`` into its top-level branches as (branch, literals, lead); None if some
+    branch has no required literal or the pattern can't be taken apart safely.
+
+    Every case-insensitive match of a branch contains all of its literals. A literal's kind
+    says whether the branch also pins it to the start and/or end of a word (\\b, whitespace,
+    punctuation), so it can be looked up in the text's set of words instead of searched
+    for; a branch with a ``lead`` literal can only match where that literal occurs.
+    """
+    branches = None if _OPAQUE.search(pattern) else _split_branches(pattern)
+    if not branches:
+        return None
+    analysed = []
+    for branch in branches:
+        literals, lead = _branch_literals(branch)
+        if not literals:
+            return None
+        analysed.append((branch, literals, lead))
+    return analysed
+
+
+def _selectivity(literal: Tuple[int, str]) -> int:
+    """Longer literals rule out more texts; a word boundary on either side is worth about a character."""
+    kind, run = literal
+    return len(run) + {WORD: 2, PREFIX: 1, SUFFIX: 1, SUBSTRING: 0}[kind]
+
+
+class _TextWords:
+    """The lowercased text and its words, with word prefix / suffix sets built on demand."""
+
+    def __init__(self, text: str):
+        folded = text
+        if not text.isascii() and any(chr(code) in text for code in _ASCII_FOLDS):
+            folded = text.translate(_ASCII_FOLDS)
+        self.text = folded.lower()
+        self.aligned = len(self.text) == len(text)  # offsets in self.text are offsets in text
+        self.words = set(_WORD.findall(self.text))
+        self._prefixes: Dict[int, set] = {}
+        self._suffixes: Dict[int, set] = {}
+
+    def contains(self, kind: int, literal: str) -> bool:
+        if kind == WORD:
+            return literal in self.words
+        if kind == SUBSTRING:
+            return literal in self.text
+        n = len(literal)
+        if kind == PREFIX:
+            if n not in self._prefixes:
+                self._prefixes[n] = {word[:n] for word in self.words if len(word) >= n}
+            return literal in self._prefixes[n]
+        if n not in self._suffixes:
+            self._suffixes[n] = {word[-n:] for word in self.words if len(word) >= n}
+        return literal in self._suffixes[n]
+
+
+class _Branch:
+    """One top-level branch of an industry pattern, compiled on its own."""
+
+    __slots__ = ("industry", "regex", "literals", "lead")
+
+    def __init__(self, industry: str, regex, literals: List[Tuple[int, str]], lead: Optional[str]):
+        self.industry = industry
+        self.regex = regex
+        self.literals = literals
+        self.lead = lead
+
+    def matches(self, text: str, words: _TextWords) -> bool:
+        if not all(words.contains(kind, literal) for kind, literal in self.literals):
+            return False
+        if self.lead is None or not words.aligned:
+            return self.regex.search(text) is not None
+        # a match has to start at an occurrence of the lead literal: try only those offsets
+        find, match, lead = words.text.find, self.regex.match, self.lead
+        i = find(lead)
+        while i >= 0:
+            if match(text, i):
+                return True
+            i = find(lead, i + 1)
+        return False
+
+
+# --------------------------
+# Industry matching
+# --------------------------
+class IndustryMatcher:
+    """Match every industry of a taxonomy against a text, at a cost that barely grows with it.
+
+    Every pattern is split into branches, each reduced to literals that any match of it
+    must contain (see ``required_literals``). Branches are indexed by their most selective
+    literal. A text is lowercased and split into words once; whole-word keys are looked up
+    from the text's words and the few other keys tested against the text, and only the
+    branches they hit are confirmed with their own regex, anchored at the branch's leading
+    literal where it has one. That gives exactly the same flags as running ``re.search``
+    for every pattern of every industry. Industries with a pattern that has no usable
+    literal always run their regex.
+
+    ``fingerprints`` maps every industry to its ``pattern_fingerprint``, so stored flags
+    can tell which industries a taxonomy edit made stale (see rematch).
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.industries = list(patterns)
+        self.fingerprints = {industry: pattern_fingerprint(pats) for industry, pats in patterns.items()}
+        self._always: Dict[str, re.Pattern] = {}  # industries with a pattern that has no required literal
+        self._by_word: Dict[str, List[_Branch]] = {}  # whole-word key -> branches
+        self._by_literal: Dict[Tuple[int, str], List[_Branch]] = {}  # any other key -> branches
+        for industry, pats in patterns.items():
+            branches = self._branches(industry, pats)
+            if branches is None:
+                self._always[industry] = re.compile("|".join(f"(?:{p})" for p in pats), re.I)
+                continue
+            for branch in branches:
+                kind, literal = max(branch.literals, key=_selectivity)
+                if kind == WORD:
+                    self._by_word.setdefault(literal, []).append(branch)
+                else:
+                    self._by_literal.setdefault((kind, literal), []).append(branch)
+
+    @staticmethod
+    def _branches(industry: str, pats: List[str]) -> Optional[List[_Branch]]:
+        branches = []
+        for pattern in pats:
+            analysed = required_literals(pattern)
+            if analysed is None:
+                return None
+            for branch, literals, lead in analysed:
+                try:
+                    regex = re.compile(branch, re.I)
+                except re.error:
+                    return None
+                branches.append(_Branch(industry, regex, list(dict.fromkeys(literals)), lead))
+        return branches or None
+
+    def _hits(self, words: _TextWords) -> List[_Branch]:
+        """Branches whose index key occurs in the text."""
+        hits = []
+        if len(words.words) < len(self._by_word):
+            for word in words.words:
+                hits.extend(self._by_word.get(word, ()))
+        else:
+            for word, branches in self._by_word.items():
+                if word in words.words:
+                    hits.extend(branches)
+        for (kind, literal), branches in self._by_literal.items():
+            if words.contains(kind, literal):
+                hits.extend(branches)
+        return hits
+
+    def match(self, text: str) -> Dict[str, int]:
+        """Return a {industry: 1/0} flag for every industry in the taxonomy."""
+        flags = dict.fromkeys(self.industries, 0)
+        if not text:
+            return flags
+        for industry, regex in self._always.items():
+            if regex.search(text):
+                flags[industry] = 1
+        words = _TextWords(text)
+        for branch in self._hits(words):
+            if not flags[branch.industry] and branch.matches(text, words):
+                flags[branch.industry] = 1
+        return flags
+
+
+def build_industry_matcher(skills: List[str], industry_patterns: Dict[str, List[str]],
+                           fallback: Optional[Callable[[str], List[str]]] = None) -> IndustryMatcher:
+    """Build a matcher for ``skills``, resolving each one through ``industry_patterns``.
+
+    Skills without an entry use ``fallback(skill)`` (a list of patterns), mirroring the
+    per-module default of ``check_skill_present``.
+    """
+    resolved = {}
+    for skill in skills:
+        if skill in industry_patterns:
+            resolved[skill] = industry_patterns[skill]
+        elif fallback is not None:
+            resolved[skill] = fallback(skill)
+        else:
+            resolved[skill] = [r'\b' + re.escape(skill.lower()) + r'\b']
+    return IndustryMatcher(resolved)
@@ -0,0 +1,65 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# --------------------------
+# Columnar industry flags
+# --------------------------
+class FlagMatrix:
+    """Industry flags of a batch as a uint8 matrix: one row per resume, one column per industry.
+
+    Built once per batch (a byte per flag instead of a Python int in a dict per record),
+    so counts, percentages and co-occurrence are single vectorized reductions.
+    """
+
+    def __init__(self, industries: List[str], flags: np.ndarray):
+        self.industries = list(industries)
+        self.flags = flags
+
+    @classmethod
+    def from_records(cls, records: List[Dict], industries: List[str]) -> "FlagMatrix":
+        flags = np.fromiter((record.get(industry) == 1 for record in records for industry in industries),
+                            dtype=np.uint8, count=len(records) * len(industries))
+        return cls(industries, flags.reshape(len(records), len(industries)))
+
+    @property
+    def n_rows(self) -> int:
+        return self.flags.shape[0]
+
+    def counts(self) -> np.ndarray:
+        """Resumes flagged per industry."""
+        return self.flags.sum(axis=0, dtype=np.int64)
+
+    def percentages(self) -> np.ndarray:
+        if not self.n_rows:
+            return np.zeros(len(self.industries))
+        return self.counts() * 100.0 / self.n_rows
+
+    def cooccurrence(self) -> np.ndarray:
+        """``[i, j]`` = resumes flagged with both industry i and j (the diagonal is ``counts()``)."""
+        flags = self.flags.astype(np.float32)  # BLAS matmul; exact for counts below 2**24
+        return (flags.T @ flags).astype(np.int64)
+
+    def cooccurrence_frame(self, share: bool = False) -> pd.DataFrame:
+        """Co-occurrence table; with ``share`` each row is the % of that row's resumes also flagged per column."""
+        matrix = self.cooccurrence()
+        if share:
+            diagonal = np.diag(matrix).astype(float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                matrix = np.where(diagonal[:, None] > 0, matrix * 100.0 / diagonal[:, None], 0.0).round(1)
+        return pd.DataFrame(matrix, index=self.industries, columns=self.industries)
+
+    def top_pairs(self, n: int = 10) -> pd.DataFrame:
+        """The ``n`` industry pairs most often flagged together."""
+        matrix = self.cooccurrence()
+        rows, cols = np.triu_indices(len(self.industries), k=1)
+        together = matrix[rows, cols]
+        order = np.argsort(-together, kind="stable")[:n]
+        order = order[together[order] > 0]
+        return pd.DataFrame({
+            "Industry A": [self.industries[i] for i in rows[order]],
+            "Industry B": [self.industries[j] for j in cols[order]],
+            "Resumes": together[order],
+        })
@@ -0,0 +1,641 @@
+"""Local background job queue: batches keep running when the browser refreshes or the page is left.
+
+A page submits a batch of uploads as a job and polls it by id. A service process runs a
+bounded pool of worker processes that take files off a SQLite-backed queue, run the
+tool's ``process_single_resume`` (or the combined pipeline) on each, and build the job's
+Excel file with ``generate_excel_from_data`` once every file is done. There is no broker:
+the queue, the spooled uploads and the results all live under the cache directory.
+
+    python -m job_queue serve --workers 4     # run the service in the foreground
+    python -m job_queue status                # queue depth and recent jobs
+
+The pages start the service in the background when none is running. A free worker takes
+the next file of the owner (browser session) with the fewest files in progress, rotating
+between that owner's jobs, so one large batch does not hold up everyone else's. Owner ids
+are minted by the queue and handed to the browser signed (see ``owner_token``), so a page
+only shows, downloads or cancels its own jobs.
+
+    RESUME_PARSER_JOB_WORKERS=4           # worker processes (default: RESUME_PARSER_WORKERS / CPU count)
+    RESUME_PARSER_QUEUE_MAX_FILES=2000    # waiting files across all jobs before submissions are refused
+    RESUME_PARSER_QUEUE_MAX_JOBS=3        # unfinished jobs per owner
+    RESUME_PARSER_JOB_TTL_HOURS=24        # finished jobs (uploads, results, Excel) are purged after this
+    RESUME_PARSER_JOB_AUTOSTART=0         # never start the service from a page
+
+Workers keep the per-file budgets of batch_runner (RESUME_PARSER_FILE_TIMEOUT,
+RESUME_PARSER_FILE_MEMORY_MB): the service kills a worker whose file overruns the time
+budget and fails that file, and a worker whose file ran out of memory exits; either way
+a fresh worker takes its place.
+"""
+import argparse
+import hashlib
+import hmac
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from batch_runner import (CRASHED, OUT_OF_MEMORY, TIMEOUT, default_worker_count, describe_exit, failure,
+                          failure_reason, file_memory_mb, file_timeout, limit_memory, run_job)
+from extraction_cache import cache_dir
+from upload_spool import FileRef, UploadSpool
+
+# --------------------------
+# Configuration
+# --------------------------
+DEFAULT_MAX_QUEUED_FILES = 2000
+DEFAULT_MAX_JOBS_PER_OWNER = 3
+DEFAULT_TTL_HOURS = 24
+MAX_ATTEMPTS = 2            # a file whose worker died this many times is failed, not retried
+HEARTBEAT_SECONDS = 2.0
+STALE_SECONDS = 15.0        # a worker silent this long is gone; its files go back on the queue
+POLL_SECONDS = 0.5          # idle workers look for new files this often
+AUTOSTART_IDLE_EXIT = 600   # a service started by a page exits after this long without work
+
+# mode -> (module, processing function, label); each module also has generate_excel_from_data
+JOB_MODES = {
+    "tech": ("xcelgrad_tech", "process_single_resume", "Industry / Vertical Mapping"),
+    "sales": ("xcelgrad_sales", "process_single_resume", "Skills from Experience (Tech Stack)"),
+    "combined": ("combined_pipeline", "process_all_modes", "Both Views (single pass)"),
+}
+UNFINISHED = ("queued", "running", "export_pending", "exporting")
+
+
+def _env_int(name: str, default: int) -> int:
+    env = os.environ.get(name)
+    return int(env) if env and env.isdigit() and int(env) > 0 else default
+
+
+def job_worker_count() -> int:
+    return _env_int("RESUME_PARSER_JOB_WORKERS", default_worker_count())
+
+
+def max_queued_files() -> int:
+    return _env_int("RESUME_PARSER_QUEUE_MAX_FILES", DEFAULT_MAX_QUEUED_FILES)
+
+
+def max_jobs_per_owner() -> int:
+    return _env_int("RESUME_PARSER_QUEUE_MAX_JOBS", DEFAULT_MAX_JOBS_PER_OWNER)
+
+
+def job_ttl_seconds() -> int:
+    return _env_int("RESUME_PARSER_JOB_TTL_HOURS", DEFAULT_TTL_HOURS) * 3600
+
+
+def autostart_enabled() -> bool:
+    return os.environ.get("RESUME_PARSER_JOB_AUTOSTART", "1").lower() not in ("0", "false", "no", "off")
+
+
+def jobs_dir() -> str:
+    return os.path.join(cache_dir(), "jobs")
+
+
+def queue_path() -> str:
+    return os.path.join(jobs_dir(), "queue.sqlite3")
+
+
+class QueueFull(Exception):
+    """A submission the queue cannot take now (too many waiting files or unfinished jobs)."""
+
+
+# --------------------------
+# SQLite queue
+# --------------------------
+class JobQueue:
+    """Jobs, their files and the live workers, in one SQLite database shared by every process.
+
+    Claims and completions run in ``BEGIN IMMEDIATE`` transactions, so any number of
+    workers (and pages submitting or polling) can use the queue at once.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or queue_path()
+        self.directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._secret: Optional[bytes] = None  # signs owner ids (see owner_token)
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                settings TEXT NOT NULL,
+                state TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                finished_files INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                directory TEXT NOT NULL,
+                excel_path TEXT,
+                error TEXT,
+                worker TEXT,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                last_claim REAL NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created);
+            CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, created);
+            CREATE TABLE IF NOT EXISTS job_files (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                filename TEXT NOT NULL,
+                path TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                state TEXT NOT NULL,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                timings TEXT,
+                started REAL,
+                PRIMARY KEY (job_id, idx)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS job_files_state ON job_files (state, job_id, idx);
+            CREATE TABLE IF NOT EXISTS workers (
+                id TEXT PRIMARY KEY,
+                pid INTEGER NOT NULL,
+                heartbeat REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        # queues created before files recorded their start time
+        if "started" not in {row["name"] for row in self._conn.execute("PRAGMA table_info(job_files)")}:
+            self._conn.execute("ALTER TABLE job_files ADD COLUMN started REAL")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _check_capacity(self, conn: sqlite3.Connection, owner: str, files: int) -> None:
+        waiting = conn.execute("SELECT COUNT(*) FROM job_files WHERE state = 'queued'").fetchone()[0]
+        if waiting + files > max_queued_files():
+            raise QueueFull(f"The queue is full ({waiting} file(s) waiting); try again in a few minutes.")
+        unfinished = conn.execute(
+            f"SELECT COUNT(*) FROM jobs WHERE owner = ? AND state IN ({','.join('?' * len(UNFINISHED))})",
+            (owner, *UNFINISHED)).fetchone()[0]
+        if unfinished >= max_jobs_per_owner():
+            raise QueueFull(f"You already have {unfinished} unfinished job(s); wait for one to finish.")
+
+    def submit(self, owner: str, mode: str, uploads: List[BinaryIO], settings: Dict[str, Any]) -> str:
+        """Spool the uploads into a new job's directory, queue them and return the job id.
+
+        ``settings`` holds the processing arguments: ``skills`` plus optional ``page_budget``,
+        ``match_sections`` and ``index``. Raises QueueFull when the queue cannot take the job now.
+        """
+        if mode not in JOB_MODES:
+            raise ValueError(f"unknown mode {mode!r}")
+        with self._transaction() as conn:
+            self._check_capacity(conn, owner, len(uploads))
+        spool = UploadSpool(self.directory)
+        try:
+            refs = [(spool.add(upload, upload.name), upload.name) for upload in uploads]
+            job_id = uuid.uuid4().hex[:12]
+            with self._transaction() as conn:
+                self._check_capacity(conn, owner, len(uploads))
+                conn.execute(
+                    "INSERT INTO jobs (id, owner, mode, settings, state, total, directory, created) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                    (job_id, owner, mode, json.dumps(settings), len(refs), spool.directory, time.time()))
+                conn.executemany(
+                    "INSERT INTO job_files (job_id, idx, filename, path, digest, state) VALUES (?, ?, ?, ?, ?, 'queued')",
+                    [(job_id, idx, name, ref.path, ref.digest) for idx, (ref, name) in enumerate(refs)])
+        except BaseException:
+            spool.close()
+            raise
+        return job_id
+
+    # ---- owners ----
+    def _owner_secret(self) -> bytes:
+        if self._secret is None:
+            with self._transaction() as conn:
+                conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('owner_secret', ?)",
+                             (os.urandom(32).hex(),))
+                self._secret = bytes.fromhex(
+                    conn.execute("SELECT value FROM meta WHERE key = 'owner_secret'").fetchone()[0])
+        return self._secret
+
+    def _owner_signature(self, owner: str) -> str:
+        return hmac.new(self._owner_secret(), owner.encode(), hashlib.sha256).hexdigest()[:24]
+
+    def new_owner(self) -> str:
+        return uuid.uuid4().hex[:12]
+
+    def owner_token(self, owner: str) -> str:
+        """``owner`` signed with this queue's secret, safe to keep in a URL."""
+        return f"{owner}.{self._owner_signature(owner)}"
+
+    def owner_from_token(self, token: str) -> Optional[str]:
+        """The owner an ``owner_token`` was made for (None if it was not made by this queue)."""
+        owner, _, signature = (token or "").partition(".")
+        if owner and hmac.compare_digest(signature, self._owner_signature(owner)):
+            return owner
+        return None
+
+    def _owns(self, job_id: str, owner: Optional[str]) -> bool:
+        if owner is None:
+            return True
+        row = self._conn.execute("SELECT owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is not None and row["owner"] == owner
+
+    def cancel(self, job_id: str, owner: Optional[str] = None) -> bool:
+        """Drop a job's waiting files (files already running still finish); False if it already ended."""
+        with self._transaction() as conn:
+            job = conn.execute("SELECT owner, state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None or job["state"] not in UNFINISHED or (owner is not None and job["owner"] != owner):
+                return False
+            conn.execute("UPDATE job_files SET state = 'cancelled' WHERE job_id = ? AND state = 'queued'", (job_id,))
+            conn.execute("UPDATE jobs SET state = 'cancelled', finished = ? WHERE id = ?", (time.time(), job_id))
+        return True
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Next task for a worker: a finished job to export, else the next file to process."""
+        with self._transaction() as conn:
+            job = conn.execute("SELECT id FROM jobs WHERE state = 'export_pending' ORDER BY created LIMIT 1").fetchone()
+            if job is not None:
+                conn.execute("UPDATE jobs SET state = 'exporting', worker = ? WHERE id = ?", (worker_id, job["id"]))
+                return {"kind": "export", "job_id": job["id"]}
+            # fair share: the owner with the fewest files in progress first, then round-robin over jobs
+            job = conn.execute(
+                """
+                SELECT j.id, j.mode, j.settings FROM jobs j
+                WHERE j.state IN ('queued', 'running')
+                  AND EXISTS (SELECT 1 FROM job_files f WHERE f.state = 'queued' AND f.job_id = j.id)
+                ORDER BY (SELECT COUNT(*) FROM job_files r JOIN jobs o ON o.id = r.job_id
+                          WHERE r.state = 'running' AND o.owner = j.owner),
+                         j.last_claim, j.created
+                LIMIT 1
+                """).fetchone()
+            if job is None:
+                return None
+            file = conn.execute(
+                "SELECT idx, filename, path, digest FROM job_files WHERE state = 'queued' AND job_id = ? "
+                "ORDER BY idx LIMIT 1", (job["id"],)).fetchone()
+            now = time.time()
+            conn.execute("UPDATE job_files SET state = 'running', worker = ?, attempts = attempts + 1, started = ? "
+                         "WHERE job_id = ? AND idx = ?", (worker_id, now, job["id"], file["idx"]))
+            conn.execute("UPDATE jobs SET state = 'running', started = COALESCE(started, ?), last_claim = ? "
+                         "WHERE id = ?", (now, now, job["id"]))
+        return {"kind": "file", "job_id": job["id"], "mode": job["mode"], "settings": json.loads(job["settings"]),
+                **dict(file)}
+
+    def _finish_file(self, conn: sqlite3.Connection, job_id: str, idx: int, worker_id: str,
+                     result: Any, error: Optional[str], timings: Optional[Dict[str, float]]) -> None:
+        done = conn.execute(
+            "UPDATE job_files SET state = ?, worker = NULL, result = ?, error = ?, timings = ? "
+            "WHERE job_id = ? AND idx = ? AND state = 'running' AND worker = ?",
+            ("failed" if error else "done", None if result is None else json.dumps(result, default=str), error,
+             None if timings is None else json.dumps(timings), job_id, idx, worker_id)).rowcount
+        if not done:  # requeued meanwhile (worker presumed dead), or the job was cancelled
+            return
+        conn.execute("UPDATE jobs SET finished_files = finished_files + 1, failed = failed + ? WHERE id = ?",
+                     (int(result is None), job_id))
+        remaining = conn.execute("SELECT COUNT(*) FROM job_files WHERE job_id = ? AND state IN ('queued', 'running')",
+                                 (job_id,)).fetchone()[0]
+        if not remaining:
+            conn.execute("UPDATE jobs SET state = 'export_pending' WHERE id = ? AND state = 'running'", (job_id,))
+
+    def finish_file(self, job_id: str, idx: int, worker_id: str, result: Any, error: Optional[str],
+                    timings: Optional[Dict[str, float]] = None) -> None:
+        """Store a file's record (or error); the job's last file queues its Excel export."""
+        with self._transaction() as conn:
+            self._finish_file(conn, job_id, idx, worker_id, result, error, timings)
+
+    def finish_export(self, job_id: str, worker_id: str, excel_path: Optional[str], error: Optional[str] = None) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, excel_path = ?, error = ?, worker = NULL, finished = ? "
+                "WHERE id = ? AND state = 'exporting' AND worker = ?",
+                ("failed" if error else "done", excel_path, error, time.time(), job_id, worker_id))
+
+    def heartbeat(self, worker_id: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO workers (id, pid, heartbeat) VALUES (?, ?, ?)",
+                               (worker_id, os.getpid(), time.time()))
+
+    def release_workers(self, worker_ids: List[str], reason: str, retry: bool = True) -> int:
+        """Forget workers and put their files back on the queue (failing ones out of attempts,
+        or all of them without ``retry``)."""
+        if not worker_ids:
+            return 0
+        marks = ",".join("?" * len(worker_ids))
+        with self._transaction() as conn:
+            files = conn.execute(f"SELECT job_id, idx, worker, attempts FROM job_files "
+                                 f"WHERE state = 'running' AND worker IN ({marks})", worker_ids).fetchall()
+            for file in files:
+                if not retry or file["attempts"] >= MAX_ATTEMPTS:
+                    attempts = f"{file['attempts']} attempt{'s' if file['attempts'] != 1 else ''}"
+                    self._finish_file(conn, file["job_id"], file["idx"], file["worker"], None,
+                                      f"{reason} while processing this file ({attempts})", None)
+                else:
+                    conn.execute("UPDATE job_files SET state = 'queued', worker = NULL WHERE job_id = ? AND idx = ?",
+                                 (file["job_id"], file["idx"]))
+            conn.execute(f"UPDATE jobs SET state = 'export_pending', worker = NULL "
+                         f"WHERE state = 'exporting' AND worker IN ({marks})", worker_ids)
+            conn.execute(f"DELETE FROM workers WHERE id IN ({marks})", worker_ids)
+        return len(files)
+
+    def release_stale_workers(self, exclude: Optional[List[str]] = None) -> int:
+        stale = [row["id"] for row in self._conn.execute(
+            "SELECT id FROM workers WHERE heartbeat < ?", (time.time() - STALE_SECONDS,))]
+        return self.release_workers([worker for worker in stale if worker not in (exclude or [])],
+                                    "the worker stopped responding")
+
+    def overdue_workers(self, timeout: float) -> List[str]:
+        """Workers whose current file has been running for more than ``timeout`` seconds."""
+        return [row["worker"] for row in self._conn.execute(
+            "SELECT DISTINCT worker FROM job_files WHERE state = 'running' AND started < ?", (time.time() - timeout,))]
+
+    def worker_ids(self) -> List[str]:
+        return [row["id"] for row in self._conn.execute("SELECT id FROM workers WHERE id != 'service'")]
+
+    def service_alive(self) -> bool:
+        row = self._conn.execute("SELECT heartbeat FROM workers WHERE id = 'service'").fetchone()
+        return row is not None and row["heartbeat"] >= time.time() - STALE_SECONDS
+
+    def claim_autostart(self) -> bool:
+        """True for the one caller (across sessions) that should start the service now."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'autostart'").fetchone()
+            if row is not None and float(row["value"]) >= time.time() - STALE_SECONDS:
+                return False
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('autostart', ?)", (str(time.time()),))
+        return True
+
+    def has_work(self) -> bool:
+        return self._conn.execute("SELECT EXISTS (SELECT 1 FROM jobs WHERE state IN ('queued', 'running', "
+                                  "'export_pending', 'exporting'))").fetchone()[0] == 1
+
+    def purge(self, older_than: Optional[float] = None) -> int:
+        """Delete ended jobs (uploads, results, Excel) finished more than ``older_than`` seconds ago."""
+        cutoff = time.time() - (job_ttl_seconds() if older_than is None else older_than)
+        with self._transaction() as conn:
+            jobs = conn.execute("SELECT id, directory FROM jobs WHERE state IN ('done', 'failed', 'cancelled') "
+                                "AND finished < ?", (cutoff,)).fetchall()
+            for job in jobs:
+                conn.execute("DELETE FROM job_files WHERE job_id = ?", (job["id"],))
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job["id"],))
+        for job in jobs:
+            shutil.rmtree(job["directory"], ignore_errors=True)
+        return len(jobs)
+
+    def job(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """A job's state and progress, plus ``waiting_ahead``: files queued by jobs submitted before it.
+        With ``owner``, None unless the job is theirs."""
+        row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or (owner is not None and row["owner"] != owner):
+            return None
+        job = dict(row)
+        job["settings"] = json.loads(job["settings"])
+        job["waiting_ahead"] = self._conn.execute(
+            "SELECT COUNT(*) FROM job_files f JOIN jobs j ON j.id = f.job_id "
+            "WHERE f.state = 'queued' AND j.created < ?", (job["created"],)).fetchone()[0]
+        return job
+
+    def jobs_for(self, owner: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs first (of one owner, or of everyone)."""
+        if owner is None:
+            rows = self._conn.execute("SELECT id FROM jobs ORDER BY created DESC LIMIT ?", (limit,))
+        else:
+            rows = self._conn.execute("SELECT id FROM jobs WHERE owner = ? ORDER BY created DESC LIMIT ?", (owner, limit))
+        return [self.job(row["id"]) for row in rows.fetchall()]
+
+    def results(self, job_id: str, owner: Optional[str] = None) -> List[tuple]:
+        """(filename, data, error, timings) per file, in upload order -- a ResultStore's stored results.
+        With ``owner``, nothing unless the job is theirs."""
+        if not self._owns(job_id, owner):
+            return []
+        rows = self._conn.execute("SELECT filename, state, result, error, timings FROM job_files "
+                                  "WHERE job_id = ? ORDER BY idx", (job_id,)).fetchall()
+        return [(row["filename"], None if row["result"] is None else json.loads(row["result"]),
+                 row["error"] or (f"not processed ({row['state']})" if row["state"] == "cancelled" else None),
+                 None if row["timings"] is None else json.loads(row["timings"])) for row in rows]
+
+    def excel_bytes(self, job_id: str, owner: Optional[str] = None) -> Optional[bytes]:
+        job = self._conn.execute("SELECT owner, excel_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if job is None or not job["excel_path"] or (owner is not None and job["owner"] != owner):
+            return None
+        try:
+            with open(job["excel_path"], "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        files = dict(self._conn.execute("SELECT state, COUNT(*) FROM job_files GROUP BY state").fetchall())
+        jobs = dict(self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        workers = self._conn.execute("SELECT COUNT(*) FROM workers WHERE id != 'service' AND heartbeat >= ?",
+                                     (time.time() - STALE_SECONDS,)).fetchone()[0]
+        return {"files": files, "jobs": jobs, "workers": workers, "service": self.service_alive()}
+
+
+# --------------------------
+# Workers
+# --------------------------
+def _process_fn(mode: str, settings: Dict[str, Any]):
+    module_name, function_name, _ = JOB_MODES[mode]
+    function = getattr(importlib.import_module(module_name), function_name)
+    return partial(function, page_budget=settings.get("page_budget"), match_sections=settings.get("match_sections"),
+                   index=settings.get("index"))
+
+
+def _run_file(queue: JobQueue, worker_id: str, task: Dict[str, Any]) -> Optional[str]:
+    """Process one file and store its record; returns its error."""
+    source = FileRef(task["path"], task["digest"])
+    data, error, timings = run_job(_process_fn(task["mode"], task["settings"]), source, task["filename"],
+                                    task["settings"]["skills"], instrument=True)
+    queue.finish_file(task["job_id"], task["idx"], worker_id, data, error, timings)
+    try:
+        os.remove(task["path"])  # the upload is not needed once its record is stored
+    except OSError:
+        pass
+    return error
+
+
+def _export(queue: JobQueue, worker_id: str, job_id: str) -> None:
+    job = queue.job(job_id)
+    try:
+        records = [data for _, data, _, _ in queue.results(job_id) if data]
+        excel_path = None
+        if records:
+            module = importlib.import_module(JOB_MODES[job["mode"]][0])
+            excel_path = os.path.join(job["directory"], "results.xlsx")
+            with open(excel_path, "wb") as f:
+                f.write(module.generate_excel_from_data(records))
+        queue.finish_export(job_id, worker_id, excel_path)
+    except Exception as e:
+        queue.finish_export(job_id, worker_id, None, f"Excel export failed: {e}")
+
+
+def _heartbeat_loop(path: str, worker_id: str, stop: threading.Event) -> None:
+    queue = JobQueue(path)  # its own connection, so a long file never delays the heartbeat
+    while not stop.wait(HEARTBEAT_SECONDS):
+        try:
+            queue.heartbeat(worker_id)
+        except sqlite3.Error:
+            pass
+
+
+def worker_main(path: str, worker_id: str) -> None:
+    """Take tasks off the queue until the service (parent process) goes away."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C reaches the service, which stops its workers
+    limit_memory(file_memory_mb())
+    parent = os.getppid()
+    queue = JobQueue(path)
+    queue.heartbeat(worker_id)
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat_loop, args=(path, worker_id, stop), daemon=True).start()
+    try:
+        while os.getppid() == parent:
+            task = queue.claim(worker_id)
+            if task is None:
+                time.sleep(POLL_SECONDS)
+            elif task["kind"] == "export":
+                _export(queue, worker_id, task["job_id"])
+            elif failure_reason(_run_file(queue, worker_id, task)) == OUT_OF_MEMORY:
+                break  # the service starts a fresh worker
+    finally:
+        stop.set()
+
+
+# --------------------------
+# Service
+# --------------------------
+def serve(workers: Optional[int] = None, idle_exit: Optional[float] = None, path: Optional[str] = None,
+          purge_every: float = 600.0) -> int:
+    """Run the worker pool until interrupted (or idle for ``idle_exit`` seconds); restarts workers
+    that die and puts the files they were on back on the queue, and kills workers whose file
+    overruns the per-file timeout (that file fails)."""
+    queue = JobQueue(path)
+    if queue.service_alive():
+        print(f"a job service is already running on {queue.path}", file=sys.stderr)
+        return 1
+    queue.heartbeat("service")
+    workers = workers or job_worker_count()
+    timeout = file_timeout()
+    # workers registered by an earlier service are gone: requeue their files
+    queue.release_workers(queue.worker_ids(), "the job service restarted")
+    context = multiprocessing.get_context("spawn")
+    pool: Dict[int, tuple] = {}
+    started = 0
+
+    def start(slot: int) -> None:
+        nonlocal started
+        started += 1
+        worker_id = f"{os.getpid()}-{started}"
+        process = context.Process(target=worker_main, args=(queue.path, worker_id), daemon=True)
+        process.start()
+        pool[slot] = (process, worker_id)
+
+    def stop_service(*_):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop_service)
+    for slot in range(workers):
+        start(slot)
+    print(f"job service: {workers} worker(s) on {queue.path}", file=sys.stderr)
+    last_work = last_purge = time.time()
+    try:
+        while True:
+            time.sleep(1.0)
+            queue.heartbeat("service")
+            overdue = queue.overdue_workers(timeout) if timeout else []
+            for slot, (process, worker_id) in list(pool.items()):
+                if worker_id in overdue:
+                    process.kill()
+                    process.join()
+                    queue.release_workers([worker_id], failure(TIMEOUT, f"no result after {timeout:g} s; the worker "
+                                                                        "was killed"), retry=False)
+                    start(slot)
+                elif not process.is_alive():
+                    queue.release_workers([worker_id], failure(CRASHED, f"the worker process ended "
+                                                                        f"({describe_exit(process.exitcode)})"))
+                    start(slot)
+            queue.release_stale_workers(exclude=["service"] + [worker_id for _, worker_id in pool.values()])
+            now = time.time()
+            if now - last_purge >= purge_every:
+                queue.purge()
+                last_purge = now
+            if queue.has_work():
+                last_work = now
+            elif idle_exit and now - last_work >= idle_exit:
+                print("job service: idle, exiting", file=sys.stderr)
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process, _ in pool.values():
+            process.terminate()
+        for process, _ in pool.values():
+            process.join(5)
+        queue.release_workers([worker_id for _, worker_id in pool.values()] + ["service"], "the job service stopped")
+    return 0
+
+
+def ensure_service(queue: JobQueue) -> bool:
+    """Start the service in the background unless one is running; False if it is not running
+    and autostart is off (RESUME_PARSER_JOB_AUTOSTART=0)."""
+    if queue.service_alive():
+        return True
+    if not autostart_enabled():
+        return False
+    if queue.claim_autostart():
+        with open(os.path.join(queue.directory, "service.log"), "ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "job_queue", "--db", queue.path, "serve", "--idle-exit", str(AUTOSTART_IDLE_EXIT)],
+                cwd=os.path.dirname(os.path.abspath(__file__)), stdin=subprocess.DEVNULL, stdout=log,
+                stderr=subprocess.STDOUT, start_new_session=True)
+    return True
+
+
+# --------------------------
+# Entry point
+# --------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local background job queue for resume batches.")
+    parser.add_argument("--db", default=None, help="queue database (default: <cache dir>/jobs/queue.sqlite3)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the worker pool in the foreground")
+    serve_parser.add_argument("--workers", type=int, default=None,
+                              help="worker processes (default: RESUME_PARSER_JOB_WORKERS or CPU count)")
+    serve_parser.add_argument("--idle-exit", type=float, default=None,
+                              help="exit after this many seconds without queued work")
+    commands.add_parser("status", help="print queue depth and recent jobs")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return serve(args.workers, args.idle_exit, args.db)
+    queue = JobQueue(args.db)
+    stats = queue.stats()
+    print(f"service: {'running' if stats['service'] else 'stopped'}, {stats['workers']} worker(s)")
+    print("files: " + (", ".join(f"{state} {count}" for state, count in sorted(stats["files"].items())) or "none"))
+    for job in queue.jobs_for(limit=10):
+        print(f"  {job['id']}  {job['mode']:8} {job['state']:14} {job['finished_files']}/{job['total']} "
+              f"({job['failed']} failed)  owner {job['owner']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""Near-duplicate resume detection with SimHash fingerprints.
+
+Agencies often send the same candidate several times, renamed or lightly edited. Every
+processed resume gets a 64-bit SimHash of its extracted text, and the UI lists the groups
+of resumes whose fingerprints are close (within this batch or any earlier one). A record
+is only reused for an exact copy (the same file content under another name): two
+near-identical resumes can still name different candidates, so their fields are never
+copied from one to the other.
+
+    RESUME_PARSER_DEDUP=1                  # turn detection and reuse on (off by default)
+    RESUME_PARSER_DEDUP_SIMILARITY=0.9     # share of equal fingerprint bits to count as a duplicate
+                                           # (1.0 = same text only; at least 0.89)
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from extraction_cache import cache_dir
+from stage_timing import StageTimer, timer_or_null
+from upload_spool import FileSource, source_digest
+
+
+# --------------------------
+# Configuration
+# --------------------------
+DEFAULT_SIMILARITY = 0.9  # 6 bits; a changed phone number plus an added line is 0-7, unrelated resumes 18+
+BITS = 64
+BANDS = 8  # 8-bit bands: two fingerprints within 7 bits of each other share at least one band
+MAX_DISTANCE = BANDS - 1
+
+
+def dedup_enabled() -> bool:
+    return os.environ.get("RESUME_PARSER_DEDUP", "0").lower() not in ("0", "false", "no", "off", "")
+
+
+def dedup_similarity() -> float:
+    """RESUME_PARSER_DEDUP_SIMILARITY, clamped to the range the band index can serve."""
+    try:
+        similarity = float(os.environ.get("RESUME_PARSER_DEDUP_SIMILARITY", DEFAULT_SIMILARITY))
+    except ValueError:
+        similarity = DEFAULT_SIMILARITY
+    return min(1.0, max(similarity, 1 - MAX_DISTANCE / BITS))
+
+
+def max_distance(similarity: Optional[float] = None) -> int:
+    """Most differing fingerprint bits still counted as a near-duplicate."""
+    similarity = dedup_similarity() if similarity is None else similarity
+    return min(MAX_DISTANCE, int(round((1 - similarity) * BITS, 6)))
+
+
+def fingerprints_path() -> str:
+    return os.path.join(cache_dir(), "fingerprints.sqlite3")
+
+
+# --------------------------
+# SimHash
+# --------------------------
+_WORD = re.compile(r"\w+")
+SHINGLE_WORDS = 3
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the text's overlapping word 3-grams (case and punctuation ignored).
+
+    Each bit is the majority vote of that bit over the shingle hashes, so a small edit
+    flips only the few bits where the vote was close.
+    """
+    import numpy as np  # only worker processes fingerprint; the app doesn't load numpy for it
+
+    words = _WORD.findall(text.lower())
+    if not words:
+        return 0
+    span = min(SHINGLE_WORDS, len(words))
+    digests = b"".join(hashlib.blake2b(" ".join(words[i:i + span]).encode(), digest_size=8).digest()
+                       for i in range(len(words) - span + 1))
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, BITS)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > bits.shape[0]
+    return int.from_bytes(np.packbits(votes).tobytes(), "big")
+
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def similarity(a: int, b: int) -> float:
+    return 1 - distance(a, b) / BITS
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    width = BITS // BANDS
+    return [(band, (fingerprint >> (band * width)) & ((1 << width) - 1)) for band in range(BANDS)]
+
+
+def _to_sql(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << BITS) if fingerprint >= 1 << (BITS - 1) else fingerprint
+
+
+def _from_sql(value: int) -> int:
+    return value + (1 << BITS) if value < 0 else value
+
+
+RECORD_VERSION = 2  # bump when the field extractors change what they return
+
+
+def settings_key(skills: Sequence[str], page_budget: Optional[int], match_sections: Sequence[str] = (),
+                 fingerprints: Optional[Dict[str, str]] = None) -> str:
+    """Records are only reused between runs with the same extractors, skills, page budget and matched
+    sections, and with the same patterns per skill (``fingerprints``, see IndustryMatcher)."""
+    key = (RECORD_VERSION, tuple(skills), page_budget, tuple(match_sections), tuple((fingerprints or {}).items()))
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+# --------------------------
+# SQLite fingerprint index
+# --------------------------
+class DuplicateIndex:
+    """Fingerprints per file content (digest), split into bands for lookup, plus the records built from them.
+
+    A lookup reads the candidates sharing any band with the fingerprint (an index
+    range scan per band) and checks their exact Hamming distance, so it stays cheap
+    however many resumes have been seen.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or fingerprints_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                id INTEGER PRIMARY KEY,
+                digest TEXT NOT NULL UNIQUE,
+                simhash INTEGER NOT NULL,
+                filename TEXT NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fingerprint_bands (
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                fingerprint_id INTEGER NOT NULL,
+                PRIMARY KEY (band, value, fingerprint_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS fingerprint_records (
+                fingerprint_id INTEGER NOT NULL,
+                mode TEXT NOT NULL,
+                settings TEXT NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (fingerprint_id, mode, settings)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def add(self, digest: str, filename: str, fingerprint: int) -> int:
+        """Register a file's fingerprint (the first filename seen for a digest is kept)."""
+        with self._lock:
+            conn = self._conn
+            row = conn.execute("SELECT id FROM fingerprints WHERE digest = ?", (digest,)).fetchone()
+            if row is not None:
+                return row[0]
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("INSERT OR IGNORE INTO fingerprints (digest, simhash, filename, seen_at) "
+                             "VALUES (?, ?, ?, ?)", (digest, _to_sql(fingerprint), filename, time.time()))
+                fingerprint_id = conn.execute("SELECT id FROM fingerprints WHERE digest = ?",
+                                              (digest,)).fetchone()[0]
+                conn.executemany("INSERT OR IGNORE INTO fingerprint_bands VALUES (?, ?, ?)",
+                                 [(band, value, fingerprint_id) for band, value in _bands(fingerprint)])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return fingerprint_id
+
+    def put_record(self, digest: str, mode: str, settings: str, record: Dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprint_records "
+                "SELECT id, ?, ?, ? FROM fingerprints WHERE digest = ?",
+                (mode, settings, json.dumps(record), digest),
+            )
+
+    def near(self, fingerprint: int, max_bits: int) -> List[Dict]:
+        """Stored files within ``max_bits`` bits of ``fingerprint``, closest (then oldest) first."""
+        bands = _bands(fingerprint)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT f.id, f.digest, f.simhash, f.filename, f.seen_at FROM fingerprints f WHERE f.id IN ("
+                "SELECT fingerprint_id FROM fingerprint_bands WHERE "
+                + " OR ".join("(band = ? AND value = ?)" for _ in bands) + ")",
+                [v for pair in bands for v in pair],
+            ).fetchall()
+        matches = []
+        for fingerprint_id, digest, stored, filename, seen_at in rows:
+            d = distance(fingerprint, _from_sql(stored))
+            if d <= max_bits:
+                matches.append({"id": fingerprint_id, "digest": digest, "filename": filename,
+                                "seen_at": seen_at, "distance": d})
+        matches.sort(key=lambda m: (m["distance"], m["seen_at"]))
+        return matches
+
+    def record_for(self, digest: str, mode: str, settings: str) -> Optional[Dict]:
+        """The record built for exactly this file content in (mode, settings), if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT r.record FROM fingerprint_records r JOIN fingerprints f ON f.id = r.fingerprint_id "
+                "WHERE f.digest = ? AND r.mode = ? AND r.settings = ?", (digest, mode, settings),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def fingerprint_of(self, digest: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT simhash FROM fingerprints WHERE digest = ?", (digest,)).fetchone()
+        return None if row is None else _from_sql(row[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM fingerprints")
+            self._conn.execute("DELETE FROM fingerprint_bands")
+            self._conn.execute("DELETE FROM fingerprint_records")
+
+
+_index: Optional[DuplicateIndex] = None
+_index_pid: Optional[int] = None
+
+
+def get_duplicate_index() -> Optional[DuplicateIndex]:
+    """Per-process index handle (None when detection is disabled or unavailable)."""
+    global _index, _index_pid
+    if not dedup_enabled():
+        return None
+    if _index is None or _index_pid != os.getpid():
+        try:
+            _index = DuplicateIndex()
+        except (OSError, sqlite3.Error):
+            return None
+        _index_pid = os.getpid()
+    return _index
+
+
+# --------------------------
+# Pipeline hooks
+# --------------------------
+# (content digest, SimHash) of a processed file, as registered in the index
+Fingerprint = Tuple[str, int]
+
+
+def fingerprint_file(source: FileSource, filename: str, text: str,
+                     timer: Optional[StageTimer] = None) -> Optional[Fingerprint]:
+    """Fingerprint a file's extracted text and register it (None when detection is off)."""
+    index = get_duplicate_index()
+    if index is None or not text.strip():
+        return None
+    with timer_or_null(timer).stage("duplicate_lookup"):
+        fingerprint = (source_digest(source), simhash(text))
+        try:
+            index.add(fingerprint[0], filename, fingerprint[1])
+        except sqlite3.Error:
+            return None
+    return fingerprint
+
+
+def reuse_record(fingerprint: Optional[Fingerprint], mode: str, settings: str,
+                 timer: Optional[StageTimer] = None) -> Optional[Dict]:
+    """The record built before for this exact file content in ``mode`` with the same settings;
+    None means build the record as usual. Near-duplicates are not reused: a shared body with
+    another candidate's name and contact details must not inherit the first one's fields."""
+    index = get_duplicate_index()
+    if fingerprint is None or index is None:
+        return None
+    with timer_or_null(timer).stage("duplicate_lookup"):
+        try:
+            return index.record_for(fingerprint[0], mode, settings)
+        except sqlite3.Error:
+            return None
+
+
+def remember_record(fingerprint: Optional[Fingerprint], mode: str, settings: str, record: Dict) -> None:
+    """Store a freshly built record for later copies of the same file to reuse."""
+    index = get_duplicate_index()
+    if fingerprint is None or index is None:
+        return
+    try:
+        index.put_record(fingerprint[0], mode, settings, record)
+    except sqlite3.Error:
+        pass
+
+
+def duplicate_groups(files: Sequence[Tuple[str, str]], max_bits: Optional[int] = None) -> List[List[Dict]]:
+    """Groups of near-duplicates among ``files`` ((filename, digest) of a processed batch).
+
+    Each group lists its members from this batch plus matching resumes first seen in an
+    earlier batch (``"earlier": True``), oldest first; files without a match are left out.
+    """
+    index = get_duplicate_index()
+    if index is None or not files:
+        return []
+    limit = max_distance() if max_bits is None else max_bits
+    parent: Dict[str, str] = {}
+
+    def find(digest: str) -> str:
+        while parent.setdefault(digest, digest) != digest:
+            parent[digest] = parent[parent[digest]]
+            digest = parent[digest]
+        return digest
+
+    batch = {digest: filename for filename, digest in files}
+    info: Dict[str, Dict] = {}
+    try:
+        for digest in batch:
+            fingerprint = index.fingerprint_of(digest)
+            if fingerprint is None:
+                continue
+            for match in index.near(fingerprint, limit):
+                info.setdefault(match["digest"], match)
+                parent[find(match["digest"])] = find(digest)
+    except sqlite3.Error:
+        return []
+
+    members: Dict[str, List[str]] = {}
+    for digest in parent:
+        members.setdefault(find(digest), []).append(digest)
+    groups = []
+    for digests in members.values():
+        if len(digests) < 2:
+            continue
+        digests.sort(key=lambda d: info[d]["seen_at"] if d in info else 0.0)
+        groups.append([{"filename": batch.get(d, info.get(d, {}).get("filename")), "digest": d,
+                        "earlier": d not in batch} for d in digests])
+    groups.sort(key=lambda group: group[0]["filename"] or "")
+    return groups
+
+
+def show_duplicate_groups(groups: Optional[List[List[Dict]]]) -> None:
+    """Streamlit panel listing the near-duplicate groups of a batch (see duplicate_groups)."""
+    import pandas as pd
+    import streamlit as st
+
+    if not groups:
+        return
+    with st.expander(f"🧬 Near-duplicate resumes ({len(groups)} group(s))"):
+        st.caption(f"Resumes at least {dedup_similarity():.0%} alike (RESUME_PARSER_DEDUP_SIMILARITY). "
+                   "Exact copies reuse the record built for the first one processed with the same settings.")
+        st.dataframe(pd.DataFrame([
+            {"Group": number, "Filename": member["filename"],
+             "Seen": "earlier batch" if member["earlier"] else "this batch"}
+            for number, group in enumerate(groups, start=1) for member in group
+        ]), hide_index=True, use_container_width=True)
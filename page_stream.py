@@ -0,0 +1,171 @@
+import json
+import os
+import sqlite3
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from extraction_cache import get_cache
+from resume_sections import SectionIndex
+from stage_timing import StageTimer, timer_or_null
+from upload_spool import FileSource, source_digest
+
+
+class ParseError(Exception):
+    """A document could not be opened or one of its pages could not be extracted.
+
+    Raised from the parser's own exception (kept as ``__cause__``), so a batch can tell a
+    bad file from a bug in the code that processes its text.
+    """
+
+    @classmethod
+    def wrap(cls, error: Exception) -> "ParseError":
+        return cls(f"{type(error).__name__}: {error}" if str(error) else type(error).__name__)
+
+
+def default_page_budget() -> Optional[int]:
+    """Pages to read per resume (RESUME_PARSER_PAGE_BUDGET; unset or 0 = all pages)."""
+    env = os.environ.get("RESUME_PARSER_PAGE_BUDGET")
+    if env and env.isdigit() and int(env) > 0:
+        return int(env)
+    return None
+
+
+def resolve_page_budget(page_budget: Optional[int]) -> Optional[int]:
+    """None -> the configured default, 0 -> no budget (all pages)."""
+    if page_budget is None:
+        page_budget = default_page_budget()
+    return page_budget or None
+
+
+# --------------------------
+# Lazy page-at-a-time document text
+# --------------------------
+class PageStream:
+    """Pull page texts from a document one at a time, up to an optional page budget.
+
+    ``pages`` is any iterator of page texts (e.g. a generator calling
+    ``page.extract_text()`` on demand), so pages past the point where the caller stops
+    reading are never extracted. ``truncated`` is set when the budget stopped reading
+    before the end of the document.
+    """
+
+    def __init__(self, pages: Iterator[str], page_count: Optional[int] = None,
+                 page_budget: Optional[int] = None, on_complete: Optional[Callable[["PageStream"], None]] = None,
+                 timer: Optional[StageTimer] = None):
+        self._pages = iter(pages)
+        self._timer = timer_or_null(timer)
+        self.page_count = page_count
+        self.page_budget = page_budget
+        self.pages: List[str] = []
+        self.exhausted = False
+        self.truncated = False
+        self._on_complete = on_complete
+        self._sections: Optional[SectionIndex] = None
+        self._sections_pages = 0
+
+    @classmethod
+    def from_pages(cls, pages: List[str], truncated: bool = False, page_budget: Optional[int] = None) -> "PageStream":
+        """A stream over pages that were already extracted (e.g. from the cache)."""
+        stream = cls(iter(pages), page_count=len(pages), page_budget=page_budget)
+        stream.pages = list(pages)
+        stream.exhausted = True
+        stream.truncated = truncated
+        return stream
+
+    @property
+    def pages_read(self) -> int:
+        return len(self.pages)
+
+    @property
+    def text(self) -> str:
+        """Text of the pages read so far, joined like the whole-document extractors do."""
+        return "\n".join(self.pages)
+
+    @property
+    def sections(self) -> SectionIndex:
+        """Section index of the text read so far, built once and shared by every extractor
+        (rebuilt only if more pages were read since)."""
+        if self._sections is None or self._sections_pages != len(self.pages):
+            with self._timer.stage("section_index"):
+                self._sections = SectionIndex.build(self.text)
+            self._sections_pages = len(self.pages)
+        return self._sections
+
+    def read_page(self) -> bool:
+        """Extract the next page; return False once the document or the budget is exhausted."""
+        if self.exhausted:
+            return False
+        if self.page_budget is not None and len(self.pages) >= self.page_budget:
+            self.truncated = self.page_count is None or self.page_count > len(self.pages)
+            self._complete()
+            return False
+        try:
+            with self._timer.stage("text_extraction"):
+                self.pages.append(next(self._pages))
+        except StopIteration:
+            self._complete()
+            return False
+        except MemoryError:
+            raise
+        except Exception as e:
+            raise ParseError.wrap(e) from e
+        return True
+
+    def read_all(self) -> str:
+        """Read every remaining page within the budget and return the full text."""
+        while self.read_page():
+            pass
+        return self.text
+
+    def _complete(self) -> None:
+        self.exhausted = True
+        if self._on_complete is not None:
+            self._on_complete(self)
+            self._on_complete = None
+
+
+# --------------------------
+# Cached page streams
+# --------------------------
+def _has_text(pages: List[str]) -> bool:
+    return any(page.strip() for page in pages)
+
+
+def cached_page_stream(open_pages: Callable[[FileSource], Tuple[Optional[int], Iterator[str]]],
+                       file_bytes: FileSource, extractor: str, page_budget: Optional[int] = None,
+                       timer: Optional[StageTimer] = None) -> PageStream:
+    """Return a PageStream for ``file_bytes`` (bytes or a spooled FileRef), served from the
+    extraction cache when seen before.
+
+    ``open_pages(file_bytes)`` must return ``(page_count, page_iterator)``. Cache entries
+    are keyed by the extractor id plus the page budget; a stream is stored once it has
+    been read to its end (or budget), so a partially read stream is never cached. A stream
+    without any text is never stored (nor served), so a later run tries the file again.
+    """
+    extractor = f"{extractor}:pages={page_budget or 'all'}"
+    cache = get_cache()
+    digest = source_digest(file_bytes) if cache is not None else None
+    if cache is not None:
+        try:
+            # entries stored before empty ones were skipped are dropped as misses
+            cached = cache.get(digest, extractor, usable=lambda text: _has_text(json.loads(text)["pages"]))
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            entry = json.loads(cached)
+            return PageStream.from_pages(entry["pages"], entry["truncated"], page_budget)
+
+    def store(stream: PageStream) -> None:
+        if cache is None or not _has_text(stream.pages):
+            return
+        try:
+            cache.put(digest, extractor, json.dumps({"pages": stream.pages, "truncated": stream.truncated}))
+        except sqlite3.Error:
+            pass
+
+    try:
+        page_count, pages = open_pages(file_bytes)
+    except MemoryError:
+        raise
+    except Exception as e:  # no parser can read the file
+        raise ParseError.wrap(e) from e
+    return PageStream(pages, page_count, page_budget, on_complete=store, timer=timer)
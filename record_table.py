@@ -0,0 +1,335 @@
+"""Compact storage for processed records: packed single records and columnar batch tables.
+
+``process_single_resume`` returns a plain dict per resume, which repeats every key and
+keeps each industry flag as a Python int. Records that are kept around are stored in
+one of two compact forms instead:
+
+- ``CompactRecord``: one record as a slotted object. The keys live in a layout shared by
+  every record of the same shape, the 0/1 flags are bits of one int, and only the other
+  values are kept in a tuple. ``to_dict()`` gives back the original record.
+- ``RecordTable``: a whole batch column by column. Text columns are int32 codes into a
+  list of distinct values (categorical), numbers are float64 arrays, and the industry
+  flags are a uint8 matrix (see industry_stats.FlagMatrix). Tables export to pandas and,
+  when pyarrow is installed, to Parquet and Arrow IPC with dictionary and bool columns.
+"""
+import io
+import math
+from array import array
+from importlib.util import find_spec
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+PARQUET_MIME = "application/vnd.apache.parquet"
+ARROW_MIME = "application/vnd.apache.arrow.file"
+
+
+def columnar_export_available() -> bool:
+    """Parquet / Arrow IPC export needs pyarrow (optional; not in requirements.txt)."""
+    return find_spec("pyarrow") is not None
+
+
+def _is_flag(value: Any) -> bool:
+    return type(value) is int and (value == 0 or value == 1)  # not bools, not other ints
+
+
+# --------------------------
+# Single records
+# --------------------------
+# (keys, flag mask) -> the same tuple, so records of one shape share their layout
+_LAYOUTS: Dict[Tuple[Tuple[str, ...], int], Tuple[Tuple[str, ...], int]] = {}
+
+
+class CompactRecord:
+    """A record dict packed into a shared layout, its non-flag values and a flag bitmask.
+
+    Bit ``i`` of the layout's mask marks key ``i`` as a flag, and bit ``i`` of ``flags`` is
+    its value. Nested dicts (the combined tool's {mode: record}) are packed too.
+    """
+
+    __slots__ = ("layout", "values", "flags")
+
+    def __init__(self, layout: Tuple[Tuple[str, ...], int], values: tuple, flags: int):
+        self.layout = layout
+        self.values = values
+        self.flags = flags
+
+    @classmethod
+    def pack(cls, record: Dict) -> "CompactRecord":
+        values, mask, flags = [], 0, 0
+        for i, value in enumerate(record.values()):
+            if _is_flag(value):
+                mask |= 1 << i
+                flags |= value << i
+            else:
+                values.append(cls.pack(value) if isinstance(value, dict) else value)
+        layout = (tuple(record), mask)
+        return cls(_LAYOUTS.setdefault(layout, layout), tuple(values), flags)
+
+    def to_dict(self) -> Dict:
+        keys, mask = self.layout
+        values = iter(self.values)
+        record = {}
+        for i, key in enumerate(keys):
+            if mask >> i & 1:
+                record[key] = self.flags >> i & 1
+            else:
+                value = next(values)
+                record[key] = value.to_dict() if isinstance(value, CompactRecord) else value
+        return record
+
+    def __reduce__(self):
+        return CompactRecord.pack, (self.to_dict(),)  # unpickled records share layouts again
+
+
+def pack_record(record: Optional[Dict]) -> Optional[CompactRecord]:
+    return None if record is None else CompactRecord.pack(record)
+
+
+def unpack_record(record: Any) -> Any:
+    return record.to_dict() if isinstance(record, CompactRecord) else record
+
+
+# --------------------------
+# Columnar batches
+# --------------------------
+class _Column:
+    """One non-flag column. Its kind follows the values: "text" (codes into ``categories``),
+    "number" (float64, NaN = missing) or "object" for anything mixed."""
+
+    __slots__ = ("kind", "data", "categories", "lookup", "integral", "nulls")
+
+    def __init__(self, nulls: int = 0):
+        self.kind: Optional[str] = None
+        self.data: Any = None
+        self.categories: List[str] = []
+        self.lookup: Dict[str, int] = {}
+        self.integral = True
+        self.nulls = nulls  # missing values seen before the first real one
+
+    def _start(self, value: Any) -> None:
+        if isinstance(value, str):
+            self.kind, self.data = "text", array("i", [-1]) * self.nulls
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.kind, self.data = "number", array("d", [math.nan]) * self.nulls
+        else:
+            self.kind, self.data = "object", [None] * self.nulls
+
+    def _to_object(self) -> None:
+        self.data = [self.get(row) for row in range(len(self.data))]
+        self.kind = "object"
+
+    def append(self, value: Any) -> None:
+        if self.kind is None:
+            if value is None:
+                self.nulls += 1
+                return
+            self._start(value)
+        if self.kind == "text":
+            if value is None:
+                self.data.append(-1)
+                return
+            if isinstance(value, str):
+                code = self.lookup.get(value)
+                if code is None:
+                    code = self.lookup[value] = len(self.categories)
+                    self.categories.append(value)
+                self.data.append(code)
+                return
+            self._to_object()
+        elif self.kind == "number":
+            if value is None:
+                self.data.append(math.nan)
+                return
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and abs(value) < 2 ** 53:
+                self.integral = self.integral and isinstance(value, int)
+                self.data.append(value)
+                return
+            self._to_object()
+        self.data.append(value)
+
+    def __len__(self) -> int:
+        return self.nulls if self.kind is None else len(self.data)
+
+    def get(self, row: int) -> Any:
+        if self.kind is None:
+            return None
+        value = self.data[row]
+        if self.kind == "text":
+            return None if value < 0 else self.categories[value]
+        if self.kind == "number":
+            return None if math.isnan(value) else int(value) if self.integral else value
+        return value
+
+    def nbytes(self) -> int:
+        if self.kind == "text":
+            return self.data.itemsize * len(self.data) + sum(len(value.encode()) for value in self.categories)
+        if self.kind == "number":
+            return self.data.itemsize * len(self.data)
+        return 8 * len(self) if self.kind else 0
+
+    def to_pandas(self):
+        import numpy as np
+        import pandas as pd
+
+        if self.kind == "text":
+            return pd.Categorical.from_codes(np.array(self.data, dtype=np.int32), self.categories)
+        if self.kind == "number":
+            values = np.array(self.data, dtype=np.float64)  # a copy: the buffer keeps growing
+            if self.integral:
+                return pd.array(values, dtype="Int64") if np.isnan(values).any() else values.astype(np.int64)
+            return values
+        return pd.array([self.get(row) for row in range(len(self))], dtype=object)
+
+    def to_arrow(self):
+        import numpy as np
+        import pyarrow as pa
+
+        if self.kind == "text":
+            codes = np.array(self.data, dtype=np.int32)
+            return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0),
+                                                  pa.array(self.categories, type=pa.string()))
+        if self.kind == "number":
+            values = np.array(self.data, dtype=np.float64)
+            array_ = pa.array(values, mask=np.isnan(values))
+            return array_.cast(pa.int64()) if self.integral else array_
+        values = [self.get(row) for row in range(len(self))]
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):  # mixed types: keep them readable as text
+            return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+
+class RecordTable:
+    """A batch of records kept column by column instead of as a list of dicts.
+
+    ``industries`` are stored as a uint8 flag matrix (one byte per flag); every other key
+    becomes a typed column, in the order it was first seen. A record missing a key gets a
+    missing value there. Rows come back out as dicts, a DataFrame, a FlagMatrix or
+    Parquet / Arrow IPC bytes without going through the original records again.
+    """
+
+    def __init__(self, industries: Sequence[str]):
+        self.industries = list(industries)
+        self._industry_set = set(self.industries)
+        self.fields: List[str] = []
+        self._columns: Dict[str, _Column] = {}
+        self._flags = bytearray()
+        self._rows = 0
+        self._exports: Dict[str, bytes] = {}  # parquet/arrow bytes, kept until the next append
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any], industries: Sequence[str]) -> "RecordTable":
+        table = cls(industries)
+        for record in records:
+            table.append(record)
+        return table
+
+    def append(self, record: Any) -> None:
+        """Add one record (a dict or a CompactRecord)."""
+        record = unpack_record(record)
+        self._exports.clear()
+        for key, value in record.items():
+            if key in self._industry_set:
+                continue
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = _Column(nulls=self._rows)
+                self.fields.append(key)
+            column.append(value)
+        self._flags.extend(record.get(industry) == 1 for industry in self.industries)
+        self._rows += 1
+        for column in self._columns.values():
+            if len(column) < self._rows:
+                column.append(None)
+
+    def extend(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers (flags, codes, distinct strings, numbers)."""
+        return len(self._flags) + sum(column.nbytes() for column in self._columns.values())
+
+    def flag_array(self):
+        """Industry flags as a read-only (rows, industries) uint8 array."""
+        import numpy as np
+
+        return np.frombuffer(bytes(self._flags), dtype=np.uint8).reshape(self._rows, len(self.industries))
+
+    def flag_matrix(self):
+        from industry_stats import FlagMatrix
+
+        return FlagMatrix(self.industries, self.flag_array())
+
+    def rows(self) -> Iterator[Dict]:
+        """The records again, as dicts with the fields first and then the industries."""
+        width = len(self.industries)
+        for row in range(self._rows):
+            record = {key: self._columns[key].get(row) for key in self.fields}
+            record.update(zip(self.industries, self._flags[row * width:(row + 1) * width]))
+            yield record
+
+    def to_frame(self, bool_flags: bool = False):
+        """DataFrame with categorical text columns and uint8 (or, with ``bool_flags``, bool) flags."""
+        import pandas as pd
+
+        data = {key: self._columns[key].to_pandas() for key in self.fields}
+        flags = self.flag_array()
+        for i, industry in enumerate(self.industries):
+            data[industry] = flags[:, i].astype(bool) if bool_flags else flags[:, i]
+        return pd.DataFrame(data, index=pd.RangeIndex(self._rows))
+
+    # ---- pyarrow export (optional) ----
+    def to_arrow(self):
+        """pyarrow Table: dictionary-encoded text columns, int64/float64 numbers and bool flags."""
+        import pyarrow as pa
+
+        arrays = [self._columns[key].to_arrow() for key in self.fields]
+        flags = self.flag_array().astype(bool)
+        arrays += [pa.array(flags[:, i]) for i in range(len(self.industries))]
+        return pa.Table.from_arrays(arrays, names=self.fields + self.industries)
+
+    def write_parquet(self, sink: Any) -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), sink, compression="zstd")
+
+    def write_arrow(self, sink: Any) -> None:
+        import pyarrow as pa
+
+        table = self.to_arrow()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    def _export(self, fmt: str, write) -> bytes:
+        if fmt not in self._exports:
+            buffer = io.BytesIO()
+            write(buffer)
+            self._exports[fmt] = buffer.getvalue()
+        return self._exports[fmt]
+
+    def parquet_bytes(self) -> bytes:
+        return self._export("parquet", self.write_parquet)
+
+    def arrow_bytes(self) -> bytes:
+        return self._export("arrow", self.write_arrow)
+
+
+def show_columnar_downloads(table: RecordTable, file_stem: str, key: str) -> None:
+    """Streamlit Parquet / Arrow download buttons for a batch table (a hint when pyarrow is missing)."""
+    import streamlit as st
+
+    if not len(table):
+        return
+    if not columnar_export_available():
+        st.caption("Install `pyarrow` to also download the results as Parquet or Arrow for analytics tools.")
+        return
+    col_parquet, col_arrow = st.columns(2)
+    with col_parquet:
+        st.download_button("🧱 Download Parquet", table.parquet_bytes(), file_name=f"{file_stem}.parquet",
+                           mime=PARQUET_MIME, key=f"{key}_parquet")
+    with col_arrow:
+        st.download_button("🏹 Download Arrow IPC", table.arrow_bytes(), file_name=f"{file_stem}.arrow",
+                           mime=ARROW_MIME, key=f"{key}_arrow")
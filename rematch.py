@@ -0,0 +1,175 @@
+"""Re-match stored resumes after the industry taxonomy changes, without re-parsing any file.
+
+Every indexed candidate (see candidate_index) keeps its extracted text, the sections its
+industries were matched in and a fingerprint of each industry's pattern list. After
+INDUSTRY_PATTERNS or RAW_SKILLS is edited, a re-match compares the stored fingerprints
+with the tool's current ones and rescans the stored text only for the industries whose
+patterns changed or that were added to the taxonomy since; industries no longer checked are
+dropped, and every other flag is kept as stored. A candidate checked for a chosen subset of
+industries stays within that subset (plus any industry added later, when it was checked for
+the whole taxonomy). The output is the updated workbook, with a sheet listing
+every candidate that gained or lost a flag:
+
+    python rematch.py tech -o tech_rematched.xlsx
+    python rematch.py sales --dry-run        # report the changes, leave the index as it is
+"""
+import argparse
+import importlib
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from candidate_index import CandidateIndex
+from excel_export import StreamingExcelWriter, columns_of
+from resume_sections import SectionIndex, match_text, resolve_match_sections
+
+MODES = {"tech": "xcelgrad_tech", "sales": "xcelgrad_sales"}
+CHANGES_SHEET_NAME = "Flag_Changes"
+CHANGE_COLUMNS = ["Filename", "Name", "Email", "Industry", "Change", "Reason"]
+
+# why an industry was rescanned (or dropped)
+ADDED, CHANGED, REMOVED = "industry added", "patterns changed", "industry removed"
+
+
+# --------------------------
+# Result
+# --------------------------
+class RematchResult:
+    """Every candidate's record after a re-match, plus one change row per flag that flipped."""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.records: List[Dict] = []
+        self.changes: List[Dict] = []
+        self.industries: Dict[str, Dict] = {}  # industry -> {"reason", "rescanned", "gained", "lost"}
+        self.rescanned = 0
+        self.skipped = 0  # stale candidates without stored text, left as they were
+
+    def _note(self, industry: str, reason: str, key: Optional[str] = None) -> None:
+        entry = self.industries.setdefault(industry, {"reason": reason, "rescanned": 0, "gained": 0, "lost": 0})
+        if key:
+            entry[key] += 1
+
+    def summary_rows(self) -> List[Dict]:
+        return [{"Industry": industry, "Reason": entry["reason"], "Rescanned": entry["rescanned"],
+                 "Gained": entry["gained"], "Lost": entry["lost"]} for industry, entry in self.industries.items()]
+
+    def excel_bytes(self) -> bytes:
+        """The updated records in the tool's sheet, and the flag changes in a second one."""
+        tool = importlib.import_module(MODES[self.mode])
+        writer = StreamingExcelWriter(tool.EXCEL_SHEET_NAME, columns_of(self.records))
+        writer.extend(self.records)
+        writer.add_sheet(CHANGES_SHEET_NAME, CHANGE_COLUMNS)
+        writer.extend(self.changes, CHANGES_SHEET_NAME)
+        return writer.to_bytes()
+
+
+# --------------------------
+# Re-match
+# --------------------------
+def _stale(stored: Optional[Dict[str, str]], current: Dict[str, str],
+           taxonomy: Optional[List[str]] = None) -> Tuple[Dict[str, str], List[str]]:
+    """({industry: reason} to rescan, industries to drop) for flags matched with ``stored`` fingerprints
+    under ``taxonomy`` (every industry the tool knew then). Candidates indexed before fingerprints were
+    kept have every industry rescanned; an industry they were not checked for is only scanned when it
+    is new to the taxonomy and the candidate was checked for the whole of it."""
+    if stored is None:
+        return dict.fromkeys(current, CHANGED), []
+    rescan = {industry: CHANGED for industry, fingerprint in current.items()
+              if industry in stored and stored[industry] != fingerprint}
+    if taxonomy is not None and set(taxonomy) <= set(stored):
+        rescan.update((industry, ADDED) for industry in current if industry not in stored and industry not in taxonomy)
+    return rescan, [industry for industry in stored if industry not in current]
+
+
+def _rematch_batch(tool, result: RematchResult, batch: List[Tuple[Dict, Dict[str, str], List[str]]],
+                   index: CandidateIndex, current: Dict[str, str], dry_run: bool) -> None:
+    texts = index.texts([candidate["id"] for candidate, _, _ in batch])
+    updates = []
+    for candidate, rescan, removed in batch:
+        record = candidate["record"]
+        text = texts.get(candidate["id"])
+        if text is None:
+            result.skipped += 1
+            result.records.append(record)
+            continue
+        sections = SectionIndex.build(text)
+        flags = tool.get_industry_matcher(tuple(rescan)).match(
+            match_text(sections, resolve_match_sections(candidate["match_sections"])))
+        checked = [industry for industry in current if industry in rescan or industry in candidate["fingerprints"]]
+        updated = {key: value for key, value in record.items() if key not in current and key not in removed}
+        updated.update((industry, flags[industry] if industry in flags else record.get(industry, 0))
+                       for industry in checked)
+        for industry, reason in [*rescan.items(), *((industry, REMOVED) for industry in removed)]:
+            before, after = record.get(industry), updated.get(industry, 0)
+            result._note(industry, reason, "rescanned" if industry in rescan else None)
+            change = "gained" if after == 1 and before != 1 else "lost" if before == 1 and after != 1 else None
+            if change:
+                result._note(industry, reason, change)
+                result.changes.append({"Filename": record.get("Filename"), "Name": record.get("Name"),
+                                       "Email": record.get("Email"), "Industry": industry, "Change": change,
+                                       "Reason": reason})
+        result.rescanned += 1
+        result.records.append(updated)
+        updates.append((candidate["id"], updated, {industry: current[industry] for industry in checked},
+                        [industry for industry in checked if updated[industry] == 1]))
+    if updates and not dry_run:
+        index.update_matches(updates, list(current))
+
+
+def rematch(mode: str, index: CandidateIndex, dry_run: bool = False, batch_size: int = 500) -> RematchResult:
+    """Bring every stored ``mode`` candidate's industry flags up to the tool's current taxonomy.
+
+    Only stale flags are recomputed, from the stored text (no PDF/DOCX is opened); with
+    ``dry_run`` the index is left unchanged.
+    """
+    tool = importlib.import_module(MODES[mode])
+    current = tool.get_industry_matcher(tuple(tool.SKILLS_TO_CHECK)).fingerprints
+    result = RematchResult(mode)
+    batch = []
+    for candidate in index.iter_matches(mode, batch_size):
+        rescan, removed = _stale(candidate["fingerprints"], current, candidate["taxonomy"])
+        if not rescan and not removed:
+            result.records.append(candidate["record"])
+            continue
+        batch.append((candidate, rescan, removed))
+        if len(batch) >= batch_size:
+            _rematch_batch(tool, result, batch, index, current, dry_run)
+            batch = []
+    if batch:
+        _rematch_batch(tool, result, batch, index, current, dry_run)
+    return result
+
+
+# --------------------------
+# CLI
+# --------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Re-match indexed resumes against the current industry taxonomy (no re-parsing).")
+    parser.add_argument("mode", choices=sorted(MODES), help="tech = xcelgrad_tech, sales = xcelgrad_sales")
+    parser.add_argument("-o", "--output", help="write the updated workbook (with a Flag_Changes sheet) here")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without updating the index")
+    parser.add_argument("--db", help="index database (default: RESUME_PARSER_INDEX_DB or the cache dir)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    result = rematch(args.mode, CandidateIndex(args.db), args.dry_run)
+    elapsed = time.perf_counter() - start
+    for row in result.summary_rows():
+        print(f"{row['Industry']}\t{row['Reason']}\t{row['Rescanned']} rescanned\t+{row['Gained']} -{row['Lost']}")
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(result.excel_bytes())
+    print(f"{len(result.records)} candidate(s), {result.rescanned} re-matched, {len(result.changes)} flag change(s)"
+          f"{f', {result.skipped} without stored text' if result.skipped else ''} in {elapsed:.2f} s"
+          f"{' (dry run, index unchanged)' if args.dry_run else ''}"
+          f"{f' -> {args.output}' if args.output else ''}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
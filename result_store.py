@@ -0,0 +1,133 @@
+"""Keep processed batches in ``st.session_state`` so Streamlit reruns don't redo them.
+
+Every interaction (a download click, switching tools in the sidebar) reruns the whole
+script. Pages hand their uploads to a ResultStore instead of keeping rows in locals: the
+last processed batch (rows, errors, timings, Excel bytes and any page extras) is rendered
+again on every rerun, and pressing Process only runs files the store has not seen yet.
+Uploads are hashed in chunks (once per Streamlit file id, not on every rerun) and
+spooled to temp files one at a time as the batch runner asks for them, so only the
+files in flight are ever copied. Records are kept packed (record_table.CompactRecord)
+and only turned back into dicts when a page asks for them.
+"""
+from typing import Any, BinaryIO, Callable, Dict, Hashable, List, Optional, Tuple
+
+from batch_runner import iter_batch
+from record_table import RecordTable, pack_record, unpack_record
+from upload_spool import UploadSpool, stream_digest
+
+# (filename, content digest, settings) -- the same bytes under another name or with other
+# processing settings (skills, page budget) are processed again.
+FileKey = Tuple[str, str, Hashable]
+# A stored result is (filename, data, error, timings): a batch_runner Result without its index
+# (``data`` is packed in ``ResultStore.results``; batch_results() returns it as a dict again).
+StoredResult = Tuple[str, Optional[Any], Optional[str], Optional[Dict[str, float]]]
+
+
+def upload_key(upload: BinaryIO, settings: Hashable = None) -> FileKey:
+    """Key of an uploaded file (anything with ``.name`` and a seekable binary stream)."""
+    return upload.name, stream_digest(upload), settings
+
+
+def _upload_id(upload: BinaryIO) -> Optional[Tuple[str, Optional[int]]]:
+    """(file_id, size) of a Streamlit UploadedFile; None for other streams, which are always hashed."""
+    file_id = getattr(upload, "file_id", None)
+    return None if file_id is None else (file_id, getattr(upload, "size", None))
+
+
+class ResultStore:
+    """Results per uploaded file plus the file set (``batch``) that was last processed."""
+
+    def __init__(self):
+        self.results: Dict[FileKey, StoredResult] = {}
+        self.batch: List[FileKey] = []
+        self.excel_bytes: Optional[bytes] = None
+        self.extras: Dict[str, Any] = {}  # per-batch values the page wants back (cache stats, timings, ...)
+        self._digests: Dict[Tuple[str, Optional[int]], str] = {}  # (file_id, size) -> sha256
+
+    def keys_for(self, uploads: List[BinaryIO], settings: Hashable = None) -> List[FileKey]:
+        """Keys of ``uploads``. Only uploads not seen on an earlier rerun are read and hashed;
+        digests of files no longer uploaded are forgotten."""
+        digests, keys = {}, []
+        for upload in uploads:
+            upload_id = _upload_id(upload)
+            digest = self._digests.get(upload_id) if upload_id else None
+            if digest is None:
+                digest = stream_digest(upload)
+            if upload_id:
+                digests[upload_id] = digest
+            keys.append((upload.name, digest, settings))
+        self._digests = digests
+        return keys
+
+    def is_current(self, keys: List[FileKey]) -> bool:
+        return bool(self.batch) and keys == self.batch
+
+    def new_files(self, keys: List[FileKey]) -> int:
+        return len({key for key in keys if key not in self.results})
+
+    def run(self, process_fn: Callable, uploads: List[BinaryIO], skills: Any, settings: Hashable = None,
+            workers: Optional[int] = None, on_progress: Optional[Callable[[int, int, str], None]] = None,
+            instrument: bool = False) -> Tuple[int, int]:
+        """Process the uploads not stored yet and make ``uploads`` the current batch.
+
+        Returns (processed, reused). Results of files no longer in the batch are dropped,
+        and the batch's Excel bytes and extras are reset for the page to rebuild.
+        """
+        keys = self.keys_for(uploads, settings)
+        todo, seen = [], set()
+        for key, upload in zip(keys, uploads):
+            if key not in self.results and key not in seen:
+                seen.add(key)
+                todo.append((key, upload))
+
+        with UploadSpool() as spool:
+            spooled = {}
+
+            def jobs():
+                for idx, (_, upload) in enumerate(todo):
+                    spooled[idx] = spool.add(upload, upload.name)
+                    yield spooled[idx], upload.name
+
+            batch = iter_batch(process_fn, jobs(), skills, workers, instrument=instrument)
+            for done, (idx, filename, data, error, timings) in enumerate(batch, start=1):
+                spool.release(spooled.pop(idx))
+                self.results[todo[idx][0]] = (filename, pack_record(data), error, timings)
+                if on_progress:
+                    on_progress(done, len(todo), filename)
+
+        self.batch = keys
+        self.results = {key: self.results[key] for key in keys}
+        self.excel_bytes = None
+        self.extras = {}
+        return len(todo), len(keys) - len(todo)
+
+    def batch_results(self) -> List[StoredResult]:
+        """Stored results of the current batch, in upload order."""
+        return [(filename, unpack_record(data), error, timings)
+                for filename, data, error, timings in (self.results[key] for key in self.batch)]
+
+    def batch_failures(self) -> List[Tuple[str, Optional[str]]]:
+        """(filename, error) of the current batch's files without a record; error is None if they had no text."""
+        return [(filename, error) for filename, data, error, _ in (self.results[key] for key in self.batch)
+                if error or not data]
+
+    def batch_table(self, industries: List[str], mode: Optional[str] = None) -> RecordTable:
+        """The current batch's records as a RecordTable (``mode``: that mode of {mode: record} results)."""
+        table = RecordTable(industries)
+        for _, data, _, _ in self.batch_results():
+            if data:
+                table.append(data[mode] if mode else data)
+        return table
+
+    def clear(self) -> None:
+        self.__init__()
+
+
+def get_result_store(namespace: str) -> ResultStore:
+    """The page's ResultStore for this browser session."""
+    import streamlit as st
+
+    key = f"result_store:{namespace}"
+    if key not in st.session_state:
+        st.session_state[key] = ResultStore()
+    return st.session_state[key]
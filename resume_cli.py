@@ -0,0 +1,415 @@
+"""Headless batch processing of resume folders / zip archives.
+
+Examples:
+    python resume_cli.py tech ./resumes -o results.csv
+    python resume_cli.py sales resumes.zip -o results.xlsx --workers 8
+    python resume_cli.py tech ./resumes -o results.jsonl --resume
+    python resume_cli.py tech ./resumes -o results.jsonl --retry-failed   # resume, retrying failed files
+    python resume_cli.py tech ./resumes -o results.csv --match-sections experience,summary
+    python resume_cli.py tech ./resumes -o results.csv --file-timeout 30 --memory-mb 512
+    python resume_cli.py tech ./resumes -o results.parquet     # or .arrow; needs pyarrow
+
+Files that produce no record because of the file itself (a parse error, timeout, out of
+memory or no text) are checkpointed with their reason to ``<output>.failed.jsonl``, so
+``--resume`` does not retry them on every run. Internal errors are never checkpointed.
+"""
+import argparse
+import csv
+import importlib
+import json
+import os
+import sys
+import zipfile
+from functools import partial
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from batch_runner import (OUT_OF_MEMORY, PARSE_ERROR, SERIAL, TIMEOUT, default_worker_count, failure_reason,
+                          iter_batch)
+from record_table import columnar_export_available
+from resume_sections import SECTIONS
+from upload_spool import FileRef, UploadSpool
+
+MODES = {"tech": "xcelgrad_tech", "sales": "xcelgrad_sales"}
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+FORMATS = ("csv", "jsonl", "xlsx", "parquet", "arrow")
+COLUMNAR_FORMATS = ("parquet", "arrow")
+NO_TEXT = "no text"
+# failures that are properties of the file, so a resumed run need not try it again
+CHECKPOINTED_REASONS = (PARSE_ERROR, TIMEOUT, OUT_OF_MEMORY, NO_TEXT)
+
+
+# --------------------------
+# Input discovery
+# --------------------------
+def _is_resume(name: str) -> bool:
+    base = os.path.basename(name)
+    return name.lower().endswith(SUPPORTED_EXTENSIONS) and not base.startswith(("~$", "._"))
+
+
+def iter_source_files(source: str) -> Iterator[Tuple[str, Optional[zipfile.ZipInfo]]]:
+    """Yield (relative name, zip member or None) for every resume under ``source``, lazily."""
+    if zipfile.is_zipfile(source) and not os.path.isdir(source):
+        with zipfile.ZipFile(source) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or not _is_resume(info.filename):
+                    continue
+                yield info.filename, info
+        return
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for fname in sorted(files):
+            if _is_resume(fname):
+                path = os.path.join(root, fname)
+                yield os.path.relpath(path, source).replace(os.sep, "/"), None
+
+
+def iter_jobs(source: str, skip: Set[str], spool: UploadSpool) -> Iterator[Tuple[FileRef, str]]:
+    """Yield (FileRef, name) jobs. Folder files are passed by path; zip members are spooled
+    to ``spool`` only when about to be submitted (release them once their result is in)."""
+    zf = zipfile.ZipFile(source) if zipfile.is_zipfile(source) and not os.path.isdir(source) else None
+    try:
+        for name, info in iter_source_files(source):
+            if name in skip:
+                continue
+            if zf is not None:
+                with zf.open(info) as member:
+                    ref = spool.add(member, name)
+                yield ref, name
+            else:
+                yield FileRef(os.path.join(source, name)), name
+    finally:
+        if zf is not None:
+            zf.close()
+
+
+# --------------------------
+# Incremental output sinks
+# --------------------------
+def _truncate_partial_line(path: str) -> None:
+    """Drop a trailing, partially written line left behind by an interrupted run."""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = size - 1
+        while pos > 0:
+            chunk = min(4096, pos)
+            f.seek(pos - chunk)
+            buf = f.read(chunk)
+            idx = buf.rfind(b"\n")
+            if idx != -1:
+                f.truncate(pos - chunk + idx + 1)
+                return
+            pos -= chunk
+        f.truncate(0)
+
+
+class CsvSink:
+    def __init__(self, path: str, resume: bool):
+        self.path = path
+        self.fieldnames: Optional[List[str]] = None
+        self.done: Set[str] = set()
+        if resume and os.path.exists(path):
+            _truncate_partial_line(path)
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                self.fieldnames = reader.fieldnames
+                self.done = {row.get("Filename") for row in reader}
+            self._file = open(path, "a", newline="", encoding="utf-8")
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, self.fieldnames, extrasaction="ignore") if self.fieldnames else None
+
+    def write(self, row: Dict) -> None:
+        if self._writer is None:
+            self.fieldnames = list(row)
+            self._writer = csv.DictWriter(self._file, self.fieldnames, extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlSink:
+    def __init__(self, path: str, resume: bool):
+        self.path = path
+        self.done: Set[str] = set()
+        if resume and os.path.exists(path):
+            _truncate_partial_line(path)
+            self.done = _jsonl_filenames(path)
+            self._file = open(path, "a", encoding="utf-8")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, row: Dict) -> None:
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _jsonl_filenames(path: str) -> Set[str]:
+    names = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                names.add(json.loads(line).get("Filename"))
+            except ValueError:
+                continue
+    return names
+
+
+class XlsxSink:
+    """Rows are checkpointed to a ``<output>.rows.jsonl`` sidecar as they arrive and
+    streamed into the workbook (openpyxl write-only mode) when the run finishes, so an
+    interrupted run can always be resumed and memory use does not grow with row count."""
+
+    def __init__(self, path: str, resume: bool, sheet_name: str):
+        self.path = path
+        self.sheet_name = sheet_name
+        self.sidecar = path + ".rows.jsonl"
+        if resume and not os.path.exists(self.sidecar) and os.path.exists(path):
+            self._rows_from_output()
+        self._rows = JsonlSink(self.sidecar, resume)
+        self.done = self._rows.done
+
+    def _rows_from_output(self) -> None:
+        from openpyxl import load_workbook
+        wb = load_workbook(self.path, read_only=True)
+        ws = wb[self.sheet_name] if self.sheet_name in wb.sheetnames else wb.active
+        with open(self.sidecar, "w", encoding="utf-8") as f:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            for values in rows:
+                f.write(json.dumps(dict(zip(header, values)), ensure_ascii=False) + "\n")
+        wb.close()
+
+    def write(self, row: Dict) -> None:
+        self._rows.write(row)
+
+    def close(self) -> None:
+        from excel_export import StreamingExcelWriter
+        self._rows.close()
+        writer = StreamingExcelWriter(self.sheet_name)
+        with open(self.sidecar, encoding="utf-8") as f:
+            for line in f:
+                writer.append(json.loads(line))
+        tmp_path = self.path + ".tmp"
+        writer.save(tmp_path)
+        os.replace(tmp_path, self.path)
+        os.remove(self.sidecar)
+
+
+class ColumnarSink(XlsxSink):
+    """Parquet / Arrow IPC output (needs pyarrow). Checkpointed to the same sidecar as
+    XlsxSink; at the end the rows are loaded into a record_table.RecordTable (categorical
+    text, bool flags) and written in one go."""
+
+    def __init__(self, path: str, resume: bool, fmt: str, industries: List[str]):
+        self.fmt = fmt
+        self.industries = industries
+        super().__init__(path, resume, sheet_name="")
+
+    def _rows_from_output(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(self.path) if self.fmt == "parquet" else pa.ipc.open_file(self.path).read_all()
+        with open(self.sidecar, "w", encoding="utf-8") as f:
+            for row in table.to_pylist():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        from record_table import RecordTable
+        self._rows.close()
+        table = RecordTable(self.industries)
+        with open(self.sidecar, encoding="utf-8") as f:
+            for line in f:
+                table.append(json.loads(line))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as out:
+            (table.write_parquet if self.fmt == "parquet" else table.write_arrow)(out)
+        os.replace(tmp_path, self.path)
+        os.remove(self.sidecar)
+
+
+class FailureLog:
+    """Files that produced no record because of the file itself (see CHECKPOINTED_REASONS),
+    checkpointed with their reason to ``<output>.failed.jsonl``.
+
+    A resumed run skips them like finished files, unless they are retried; a file that
+    later succeeds is dropped from the log, which is rewritten without such entries (or
+    removed when empty) at the end of the run.
+    """
+
+    def __init__(self, output: str, resume: bool, done: Set[str]):
+        self.path = output + ".failed.jsonl"
+        self.entries: Dict[str, Dict] = {}
+        if resume and os.path.exists(self.path):
+            _truncate_partial_line(self.path)
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("Filename") not in done:
+                        self.entries[entry.get("Filename")] = entry
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+        self.earlier = set(self.entries)
+
+    def write(self, filename: str, reason: str, error: str) -> None:
+        entry = {"Filename": filename, "Reason": reason, "Error": error}
+        self.entries[filename] = entry
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def succeeded(self, filename: str) -> None:
+        self.entries.pop(filename, None)
+
+    def close(self) -> None:
+        self._file.close()
+        if not self.entries:
+            os.remove(self.path)
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+def open_sink(path: str, fmt: str, resume: bool, sheet_name: str, industries: List[str]):
+    if fmt == "csv":
+        return CsvSink(path, resume)
+    if fmt == "jsonl":
+        return JsonlSink(path, resume)
+    if fmt in COLUMNAR_FORMATS:
+        return ColumnarSink(path, resume, fmt, industries)
+    return XlsxSink(path, resume, sheet_name)
+
+
+# --------------------------
+# Entry point
+# --------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Batch-process a folder or zip archive of resumes (PDF/DOCX).")
+    parser.add_argument("mode", choices=sorted(MODES), help="tech = xcelgrad_tech, sales = xcelgrad_sales")
+    parser.add_argument("source", help="directory (searched recursively) or .zip archive")
+    parser.add_argument("-o", "--output", required=True, help="output file (.csv, .jsonl, .xlsx, .parquet or .arrow)")
+    parser.add_argument("--format", choices=FORMATS, help="output format (default: from the output extension)")
+    parser.add_argument("--workers", type=int, default=default_worker_count(),
+                        help=f"worker processes ({SERIAL} = serial in this process, without time or memory limits; "
+                             "default: %(default)s)")
+    parser.add_argument("--file-timeout", type=float, default=None, metavar="SECONDS",
+                        help="kill a file's worker after this long (0 = no limit; "
+                             "default: RESUME_PARSER_FILE_TIMEOUT or 60)")
+    parser.add_argument("--memory-mb", type=int, default=None, metavar="MB",
+                        help="memory a worker may take on for one file (0 = no limit; "
+                             "default: RESUME_PARSER_FILE_MEMORY_MB or 1024)")
+    parser.add_argument("--page-budget", type=int, default=None,
+                        help="only extract and match the first N pages of each resume (0 = all pages)")
+    parser.add_argument("--match-sections", default=None, metavar="SECTIONS",
+                        help="comma-separated sections to match industries in, e.g. experience,summary "
+                             f"(choices: {','.join(SECTIONS)}; default: RESUME_PARSER_MATCH_SECTIONS or whole resume)")
+    parser.add_argument("--index", action="store_true", default=None,
+                        help="also save every record and its text to the local candidate index "
+                             "(default: RESUME_PARSER_INDEX, off)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run, skipping files already in the output "
+                             "or recorded as failed in <output>.failed.jsonl")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="like --resume, but process the files recorded as failed again")
+    parser.add_argument("--overwrite", action="store_true", help="replace an existing output file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the final summary")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    fmt = args.format or os.path.splitext(args.output)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        print(f"error: cannot infer output format from {args.output!r}; use --format", file=sys.stderr)
+        return 2
+    if fmt in COLUMNAR_FORMATS and not columnar_export_available():
+        print(f"error: {fmt} output needs pyarrow (pip install pyarrow)", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.source):
+        print(f"error: {args.source!r} does not exist", file=sys.stderr)
+        return 2
+    args.resume = args.resume or args.retry_failed
+    if os.path.exists(args.output) and not (args.resume or args.overwrite):
+        print(f"error: {args.output!r} exists; pass --resume to continue it or --overwrite", file=sys.stderr)
+        return 2
+
+    tool = importlib.import_module(MODES[args.mode])
+    sheet_name = "Resume_Data" if args.mode == "tech" else "Resumes"
+    sink = open_sink(args.output, fmt, args.resume, sheet_name, tool.SKILLS_TO_CHECK)
+    failures = FailureLog(args.output, args.resume, sink.done)
+    skip = sink.done if args.retry_failed else sink.done | failures.earlier
+    if (sink.done or failures.earlier) and not args.quiet:
+        print(f"Resuming: {len(sink.done)} file(s) already in {args.output}, {len(failures.earlier)} failed before"
+              f"{' (retrying them)' if args.retry_failed else ''}", file=sys.stderr)
+
+    processed = failed = 0
+    reasons: Counter = Counter()
+    spool = UploadSpool()
+    refs: Dict[int, FileRef] = {}  # by job index: a zip may hold two members with the same name
+
+    def tracked_jobs():
+        for idx, (ref, name) in enumerate(iter_jobs(args.source, skip, spool)):
+            refs[idx] = ref
+            yield ref, name
+
+    try:
+        match_sections = None if args.match_sections is None else args.match_sections.split(",")
+        process_fn = partial(tool.process_single_resume, page_budget=args.page_budget, match_sections=match_sections,
+                             index=args.index)
+        batch = iter_batch(process_fn, tracked_jobs(), tool.SKILLS_TO_CHECK, workers=args.workers,
+                           timeout=args.file_timeout, memory_mb=args.memory_mb)
+        for idx, filename, data, error, _ in batch:
+            spool.release(refs.pop(idx))
+            if data:
+                sink.write(data)
+                failures.succeeded(filename)
+                processed += 1
+            else:
+                failed += 1
+                reason = failure_reason(error) or (NO_TEXT if not error else "error")
+                reasons[reason] += 1
+                detail = error or "unsupported/empty/corrupt"
+                if reason in CHECKPOINTED_REASONS:
+                    failures.write(filename, reason, detail)
+                print(f"failed: {filename}: {detail}", file=sys.stderr)
+            if not args.quiet and (processed + failed) % 50 == 0:
+                print(f"... {processed + failed} file(s) done", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("interrupted; rerun with --resume to continue", file=sys.stderr)
+        sink.close()
+        failures.close()
+        return 130
+    finally:
+        spool.close()
+    sink.close()
+    failures.close()
+    breakdown = f" ({', '.join(f'{reason} {count}' for reason, count in reasons.most_common())})" if reasons else ""
+    skipped = f"{len(skip)} skipped" + (f" ({len(skip) - len(sink.done)} failed before; --retry-failed to retry)"
+                                        if len(skip) > len(sink.done) else "")
+    print(f"Processed {processed} file(s), {failed} failed{breakdown}, {skipped} -> {args.output}", file=sys.stderr)
+    if failures.entries:
+        print(f"Failed files and reasons: {failures.path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""One-pass section segmentation of resume text.
+
+``SectionIndex.build(text)`` walks the lines once, recognising heading lines ("Work
+Experience", "EDUCATION:", "Skills: Python, SQL"), and records the character span of
+every section. Extractors then search only the slice they care about (the contact
+block, the education section, the experience section) instead of the whole text, and
+industry matching can be restricted to chosen sections:
+
+    RESUME_PARSER_MATCH_SECTIONS=experience,summary    # unset = whole resume
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+SECTIONS = ("contact", "summary", "experience", "education", "skills")
+
+# Headings that end the section above them without starting one we extract from
+OTHER = "other"
+
+_HEADINGS = {
+    "contact": ("contact", "contact details", "contact information", "contact info", "personal details",
+                "personal information", "personal info"),
+    "summary": ("summary", "professional summary", "career summary", "profile", "profile summary",
+                "professional profile", "objective", "career objective", "about me", "about"),
+    "experience": ("experience", "work experience", "professional experience", "relevant experience",
+                   "work history", "employment", "employment history", "career history"),
+    "education": ("education", "educational qualification", "educational qualifications", "academic",
+                  "academics", "academic background", "academic qualifications", "academic details",
+                  "qualification", "qualifications", "education & training", "education and training"),
+    "skills": ("skills", "key skills", "technical skills", "core skills", "skill set", "skillset",
+               "core competencies", "competencies", "areas of expertise", "skills & tools"),
+    OTHER: ("projects", "academic projects", "certifications", "certificates", "achievements", "awards",
+            "languages", "hobbies", "interests", "internships", "internship", "references", "declaration",
+            "publications", "extracurricular activities", "trainings", "training"),
+}
+# normalised heading line -> section
+HEADINGS: Dict[str, str] = {heading: section for section, headings in _HEADINGS.items() for heading in headings}
+
+
+MAX_HEADING_CHARS = 40
+_HEADING_NOISE = re.compile(r'\([^)]*\)|[^a-z&\s]')
+
+
+def _heading_section(line: str) -> Optional[str]:
+    """The section a heading line opens ("Skills: Python" counts too), else None."""
+    colon = line.find(':', 0, MAX_HEADING_CHARS + 1)
+    if colon != -1:
+        line = line[:colon]
+    elif len(line) > MAX_HEADING_CHARS:
+        return None
+    return HEADINGS.get(" ".join(_HEADING_NOISE.sub(' ', line.lower()).split()))
+
+
+# --------------------------
+# Section index
+# --------------------------
+class SectionIndex:
+    """Character spans of a resume's sections, built in one pass over its lines.
+
+    Text above the first heading is the "contact" block (name, email, phone usually sit
+    there), together with any explicit contact section. A section that appears more than
+    once (e.g. "Experience" and "Experience (contd.)" on the next page) has several spans.
+    """
+
+    __slots__ = ("text", "spans", "_lower")
+
+    def __init__(self, text: str, spans: Dict[str, List[Tuple[int, int]]]):
+        self.text = text
+        self.spans = spans
+        self._lower: Optional[str] = None
+
+    @classmethod
+    def build(cls, text: str) -> "SectionIndex":
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+        current, start = "contact", 0
+        offset = 0
+        for line in text.split("\n"):
+            section = _heading_section(line) if len(line) <= MAX_HEADING_CHARS or ":" in line else None
+            if section is not None:
+                if offset > start or current == "contact":
+                    spans.setdefault(current, []).append((start, offset))
+                current, start = section, offset
+            offset += len(line) + 1
+        spans.setdefault(current, []).append((start, len(text)))
+        spans.pop(OTHER, None)
+        return cls(text, spans)
+
+    @property
+    def lower(self) -> str:
+        """``text.lower()``, computed once and shared by the extractors."""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    def has(self, section: str) -> bool:
+        return section in self.spans
+
+    def first_span(self, section: str) -> Optional[Tuple[int, int]]:
+        spans = self.spans.get(section)
+        return spans[0] if spans else None
+
+    def slice(self, *sections: str) -> str:
+        """Text of the given sections in document order ("" when none is present)."""
+        spans = sorted(span for section in sections for span in self.spans.get(section, ()))
+        return "\n".join(self.text[start:end] for start, end in spans)
+
+
+def section_index(text: str, sections: Optional[SectionIndex] = None) -> SectionIndex:
+    """``sections`` when it indexes ``text``, else a fresh index."""
+    if sections is not None and sections.text is text:
+        return sections
+    return SectionIndex.build(text)
+
+
+# --------------------------
+# Section-restricted matching
+# --------------------------
+def parse_sections(names: Iterable[str]) -> Tuple[str, ...]:
+    """Known section names, deduplicated in canonical order."""
+    wanted = {name.strip().lower() for name in names}
+    return tuple(section for section in SECTIONS if section in wanted)
+
+
+def default_match_sections() -> Tuple[str, ...]:
+    """Sections industry matching is restricted to (RESUME_PARSER_MATCH_SECTIONS; empty = whole resume)."""
+    return parse_sections(os.environ.get("RESUME_PARSER_MATCH_SECTIONS", "").split(","))
+
+
+def resolve_match_sections(match_sections: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    """None -> the configured default, () -> whole resume."""
+    if match_sections is None:
+        return default_match_sections()
+    return parse_sections(match_sections)
+
+
+def match_text(sections: SectionIndex, match_sections: Sequence[str]) -> str:
+    """The text industry matching runs on: the chosen sections, or the whole resume when none
+    was chosen or the resume has none of them (e.g. no headings were recognised)."""
+    if match_sections:
+        restricted = sections.slice(*match_sections)
+        if restricted.strip():
+            return restricted
+    return sections.text
@@ -0,0 +1,142 @@
+import csv
+import io
+import json
+import os
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+
+def timing_enabled_by_default() -> bool:
+    return os.environ.get("RESUME_PARSER_TIMING", "0").lower() in ("1", "true", "yes", "on")
+
+
+# --------------------------
+# Hot-path stage timers
+# --------------------------
+class StageTimer:
+    """Accumulate exclusive wall-clock time per named stage.
+
+    Stages may nest (e.g. page extraction pulled lazily inside a field extractor);
+    the outer stage is paused while the inner one runs, so per-stage times add up to
+    the total instead of double counting.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._stack: List[str] = []
+        self._started = 0.0
+
+    @contextmanager
+    def stage(self, name: str):
+        now = perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.stages[parent] = self.stages.get(parent, 0.0) + now - self._started
+        self._stack.append(name)
+        self._started = now
+        try:
+            yield
+        finally:
+            now = perf_counter()
+            self.stages[name] = self.stages.get(name, 0.0) + now - self._started
+            self._stack.pop()
+            self._started = now
+
+
+class _NullTimer:
+    """Stand-in used when instrumentation is off: one shared no-op context manager."""
+
+    _ctx = nullcontext()
+
+    def stage(self, name: str):
+        return self._ctx
+
+
+NULL_TIMER = _NullTimer()
+
+
+def timer_or_null(timer: Optional[StageTimer]):
+    return timer if timer is not None else NULL_TIMER
+
+
+# --------------------------
+# Batch timing report
+# --------------------------
+class TimingReport:
+    """Per-file stage timings plus batch-level stages (e.g. Excel export) for one run."""
+
+    def __init__(self):
+        self.files: List[Tuple[str, Dict[str, float]]] = []
+        self.batch = StageTimer()
+
+    def add(self, filename: str, timings: Optional[Dict[str, float]]) -> None:
+        if timings:
+            self.files.append((filename, timings))
+
+    def stage_names(self) -> List[str]:
+        names = {}
+        for _, timings in self.files:
+            for name in timings:
+                names.setdefault(name, None)
+        names.pop("total", None)
+        return list(names)
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Seconds spent per stage across all files, plus batch-level stages."""
+        totals = {name: 0.0 for name in self.stage_names()}
+        for _, timings in self.files:
+            for name in totals:
+                totals[name] += timings.get(name, 0.0)
+        totals.update(self.batch.stages)
+        return totals
+
+    def slowest(self, n: int = 10) -> List[Tuple[str, Dict[str, float]]]:
+        return sorted(self.files, key=lambda item: item[1].get("total", 0.0), reverse=True)[:n]
+
+    def to_json(self) -> bytes:
+        return json.dumps({
+            "stage_totals_s": self.stage_totals(),
+            "files": [{"filename": name, **timings} for name, timings in self.files],
+        }, indent=2).encode("utf-8")
+
+    def to_csv(self) -> bytes:
+        columns = ["filename", "total"] + self.stage_names()
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for name, timings in self.files:
+            writer.writerow([name] + [f"{timings.get(col, 0.0):.6f}" for col in columns[1:]])
+        for name, seconds in self.batch.stages.items():
+            writer.writerow([f"<batch:{name}>", f"{seconds:.6f}"] + [""] * (len(columns) - 2))
+        return out.getvalue().encode("utf-8")
+
+
+def show_timing_report(report: TimingReport, n_slowest: int = 10) -> None:
+    """Streamlit panel: time per stage, slowest files and JSON/CSV downloads."""
+    import pandas as pd
+    import streamlit as st
+
+    if not report.files:
+        return
+    st.subheader("⏱️ Stage Timings")
+    totals = report.stage_totals()
+    col_chart, col_table = st.columns([2, 1])
+    with col_chart:
+        st.bar_chart(pd.Series(totals, name="seconds"), horizontal=True)
+    with col_table:
+        st.dataframe(pd.DataFrame({"Stage": list(totals), "Seconds": [round(v, 3) for v in totals.values()]}),
+                     hide_index=True, use_container_width=True)
+    st.write(f"**Slowest {min(n_slowest, len(report.files))} file(s)** (ms)")
+    columns = ["total"] + report.stage_names()
+    st.dataframe(pd.DataFrame(
+        [{"Filename": name, **{col: round(timings.get(col, 0.0) * 1000, 1) for col in columns}}
+         for name, timings in report.slowest(n_slowest)]
+    ), hide_index=True, use_container_width=True)
+    col_json, col_csv = st.columns(2)
+    with col_json:
+        st.download_button("⬇️ Timing report (JSON)", report.to_json(), file_name="timing_report.json",
+                           mime="application/json")
+    with col_csv:
+        st.download_button("⬇️ Timing report (CSV)", report.to_csv(), file_name="timing_report.csv",
+                           mime="text/csv")
@@ -1,22 +1,42 @@
+import importlib
+import time
+
 import streamlit as st
-import xcelgrad_sales
-import xcelgrad_tech
 
 st.set_page_config(page_title="Resume Parsing Toolkit", layout="wide")
 
+# sidebar label -> module whose main() renders it. Only the selected tool is imported (and
+# with it pandas, parsers, openpyxl, ... as it needs them), so the first render is not held
+# up by the others.
+TOOLS = {
+    "Skills from Experience (Tech Stack)": "xcelgrad_sales",
+    "Industry / Vertical Mapping": "xcelgrad_tech",
+    "Both Views (single pass)": "combined_pipeline",
+    "Candidate Search": "candidate_search",
+    "Background Jobs": "background_jobs",
+}
+
+
+def show_render_time(start: float) -> None:
+    """Sidebar note with this run's render time and the session's first (cold) one."""
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    st.session_state["render_ms"] = elapsed_ms
+    first_ms = st.session_state.setdefault("first_render_ms", elapsed_ms)
+    st.sidebar.caption(f"⏱️ Rendered in {elapsed_ms:.0f} ms · first render this session {first_ms:.0f} ms")
+
+
 def main():
+    start = time.perf_counter()  # every rerun executes the script, and so main(), from the top
     st.title("📂 Resume Parsing Toolkit")
 
     mode = st.sidebar.radio(
         "Choose Tool",
-        ["Skills from Experience (Tech Stack)", "Industry / Vertical Mapping"],
+        list(TOOLS),
         index=0
     )
 
-    if mode == "Skills from Experience (Tech Stack)":
-        xcelgrad_sales.main()
-    else:
-        xcelgrad_tech.main()
+    importlib.import_module(TOOLS[mode]).main()
+    show_render_time(start)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,36 @@
+"""open_with_fallback: which backend's pages (and page count) are served."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_backends import open_with_fallback  # noqa: E402
+
+
+def _backend(*pages):
+    return lambda source: (len(pages), iter(pages))
+
+
+def _broken(source):
+    raise ValueError("cannot open")
+
+
+def test_count_comes_from_the_backend_that_serves_pages():
+    chain = [("scanned", _backend("", "", "")), ("ocr", _backend("Python", "SQL"))]
+    page_count, pages = open_with_fallback(chain, b"")
+    assert (page_count, list(pages)) == (2, ["Python", "SQL"])
+
+
+def test_first_backend_kept_when_no_backend_has_text():
+    chain = [("a", _backend(" ", "late text")), ("b", _backend(""))]
+    page_count, pages = open_with_fallback(chain, b"")
+    assert (page_count, list(pages)) == (2, [" ", "late text"])
+
+
+def test_unopenable_backends_are_skipped_and_the_last_error_raised():
+    page_count, pages = open_with_fallback([("x", _broken), ("y", _backend("text"))], b"")
+    assert (page_count, list(pages)) == (1, ["text"])
+    with pytest.raises(ValueError):
+        open_with_fallback([("x", _broken)], b"")
@@ -0,0 +1,24 @@
+"""ExtractionCache counters for usable and rejected entries."""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_cache import ExtractionCache  # noqa: E402
+
+
+def _has_text(text: str) -> bool:
+    return any(page.strip() for page in json.loads(text)["pages"])
+
+
+def test_rejected_entry_is_a_miss_and_is_dropped(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    cache.put("empty", "x", json.dumps({"pages": ["", " "], "truncated": False}))
+    cache.put("full", "x", json.dumps({"pages": ["Skills: Python"], "truncated": False}))
+
+    assert cache.get("empty", "x", usable=_has_text) is None
+    assert cache.get("full", "x", usable=_has_text) is not None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["size_bytes"] == len(json.dumps({"pages": ["Skills: Python"], "truncated": False}))
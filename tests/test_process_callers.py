@@ -0,0 +1,69 @@
+"""Every tool's process function, called the way its real callers (CLI, job queue, pages) call it."""
+import csv
+import io
+import os
+import sys
+from functools import partial
+
+import docx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import candidate_index  # noqa: E402
+import resume_cli  # noqa: E402
+import xcelgrad_sales  # noqa: E402
+import xcelgrad_tech  # noqa: E402
+from job_queue import _process_fn  # noqa: E402
+
+TOOLS = {"tech": xcelgrad_tech, "sales": xcelgrad_sales}
+
+
+def _resume_docx() -> bytes:
+    document = docx.Document()
+    for line in ("Jane Doe", "jane.doe@example.com", "+91 98765 43210", "Experience",
+                 "Key account manager at a Pharma company, Bangalore", "Education", "MBA, IIM Ahmedabad"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESUME_PARSER_CACHE", "0")
+    monkeypatch.setenv("RESUME_PARSER_DEDUP", "0")
+    monkeypatch.setenv("RESUME_PARSER_INDEX_DB", str(tmp_path / "candidates.sqlite3"))
+    monkeypatch.setattr(candidate_index, "_index", None)  # the per-process handle would keep the old path
+
+
+@pytest.mark.parametrize("mode", sorted(TOOLS))
+def test_cli_processes_every_file(mode, tmp_path):
+    source = tmp_path / "resumes"
+    source.mkdir()
+    for name in ("a.docx", "b.docx"):
+        (source / name).write_bytes(_resume_docx())
+    output = tmp_path / "out.csv"
+    assert resume_cli.main([mode, str(source), "-o", str(output), "--workers", "1", "-q"]) == 0
+    with open(output, newline="", encoding="utf-8") as f:
+        assert sorted(row["Filename"] for row in csv.DictReader(f)) == ["a.docx", "b.docx"]
+    assert not os.path.exists(str(output) + ".failed.jsonl")
+
+
+@pytest.mark.parametrize("mode", ["tech", "sales", "combined"])
+def test_job_queue_process_fn(mode):
+    skills = {"tech": xcelgrad_tech.SKILLS_TO_CHECK, "sales": xcelgrad_sales.SKILLS_TO_CHECK}
+    settings = {"page_budget": 0, "match_sections": [], "index": False}
+    record = _process_fn(mode, settings)(_resume_docx(), "a.docx",
+                                         skills if mode == "combined" else skills[mode])
+    assert record is not None
+    assert set(record) == set(skills) if mode == "combined" else record["Filename"] == "a.docx"
+
+
+@pytest.mark.parametrize("mode", sorted(TOOLS))
+def test_page_partial_with_index(mode, tmp_path):
+    tool = TOOLS[mode]
+    process_fn = partial(tool.process_single_resume, page_budget=0, match_sections=(), index=True)
+    record = process_fn(_resume_docx(), "a.docx", tool.SKILLS_TO_CHECK)
+    assert record["Filename"] == "a.docx" and record["Pharma"] == 1
+    assert os.path.exists(tmp_path / "candidates.sqlite3")
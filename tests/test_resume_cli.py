@@ -0,0 +1,91 @@
+"""resume_cli checkpointing: failed files, resumed runs and zip archives."""
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import candidate_index  # noqa: E402
+import resume_cli  # noqa: E402
+import xcelgrad_tech  # noqa: E402
+from tests.test_process_callers import _resume_docx  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESUME_PARSER_CACHE", "0")
+    monkeypatch.setenv("RESUME_PARSER_DEDUP", "0")
+    monkeypatch.setenv("RESUME_PARSER_INDEX_DB", str(tmp_path / "candidates.sqlite3"))
+    monkeypatch.setattr(candidate_index, "_index", None)
+
+
+def _run(source, output, *args) -> int:
+    return resume_cli.main(["tech", str(source), "-o", str(output), "--workers", "0", "-q", *args])
+
+
+def _failed(output):
+    path = str(output) + ".failed.jsonl"
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {entry["Filename"]: entry["Reason"] for entry in map(json.loads, f)}
+
+
+def test_parse_errors_are_checkpointed_and_retried_on_request(tmp_path):
+    source = tmp_path / "resumes"
+    source.mkdir()
+    (source / "good.docx").write_bytes(_resume_docx())
+    (source / "bad.pdf").write_bytes(b"%PDF-garbage")
+    output = tmp_path / "out.jsonl"
+    assert _run(source, output) == 0
+    assert _failed(output) == {"bad.pdf": "parse error"}
+
+    (source / "bad.pdf").write_bytes(b"%PDF-still-garbage")
+    calls = []
+    process = xcelgrad_tech.process_single_resume
+
+    def counting(file_bytes, filename, *args, **kwargs):
+        calls.append(filename)
+        return process(file_bytes, filename, *args, **kwargs)
+
+    xcelgrad_tech.process_single_resume = counting
+    try:
+        assert _run(source, output, "--resume") == 0
+        assert calls == []
+        assert _run(source, output, "--retry-failed") == 0
+        assert calls == ["bad.pdf"]
+    finally:
+        xcelgrad_tech.process_single_resume = process
+
+
+def test_internal_errors_are_not_checkpointed(tmp_path, monkeypatch):
+    source = tmp_path / "resumes"
+    source.mkdir()
+    (source / "good.docx").write_bytes(_resume_docx())
+
+    def broken(*args, **kwargs):
+        raise TypeError("a bug, not a bad file")
+
+    monkeypatch.setattr(xcelgrad_tech, "process_single_resume", broken)
+    output = tmp_path / "out.jsonl"
+    assert _run(source, output) == 0
+    assert _failed(output) == {}
+    monkeypatch.undo()
+    assert _run(source, output, "--resume") == 0
+    with open(output, encoding="utf-8") as f:
+        assert [json.loads(line)["Filename"] for line in f] == ["good.docx"]
+
+
+def test_zip_members_with_the_same_name(tmp_path):
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.docx", _resume_docx())
+        zf.writestr("a.docx", _resume_docx())
+        zf.writestr("b.docx", _resume_docx())
+    output = tmp_path / "out.jsonl"
+    assert resume_cli.main(["tech", str(archive), "-o", str(output), "--workers", "2", "-q"]) == 0
+    with open(output, encoding="utf-8") as f:
+        assert sorted(json.loads(line)["Filename"] for line in f) == ["a.docx", "a.docx", "b.docx"]
@@ -0,0 +1,66 @@
+"""Shared PDF/DOCX text extraction used by every tool.
+
+Both tools (and the combined single-pass pipeline) extract text through this module,
+so an upload is parsed once and its cached text is shared between modes. Which library
+parses each format, and the fallbacks tried on files it gets no text from, are
+configured in extraction_backends.
+"""
+from itertools import islice
+from typing import Iterator, Optional, Tuple
+
+from extraction_backends import backend_chain, file_format, open_with_fallback
+from page_stream import PageStream, cached_page_stream
+from stage_timing import StageTimer
+from upload_spool import FileSource
+
+
+# --------------------------
+# Utilities: PDF/DOCX -> text
+# --------------------------
+def open_pdf_pages(pdf_bytes: FileSource) -> Tuple[Optional[int], Iterator[str]]:
+    """Open a PDF with the configured backends and return (page count, lazy iterator over page texts)"""
+    return open_with_fallback(backend_chain("pdf"), pdf_bytes)
+
+
+def iter_pdf_pages(pdf_bytes: FileSource) -> Iterator[str]:
+    """Yield the text of each PDF page, extracting a page only when it is requested"""
+    return open_pdf_pages(pdf_bytes)[1]
+
+
+def extract_text_from_pdf_bytes(pdf_bytes: FileSource, max_pages: Optional[int] = None) -> str:
+    """Extract all text from PDF file (or only its first ``max_pages`` pages)"""
+    return "\n".join(islice(iter_pdf_pages(pdf_bytes), max_pages))
+
+
+def open_docx_pages(docx_bytes: FileSource) -> Tuple[Optional[int], Iterator[str]]:
+    """DOCX has no reliable page boundaries, so every backend returns the whole document as one page"""
+    return open_with_fallback(backend_chain("docx"), docx_bytes)
+
+
+def extract_text_from_docx_bytes(docx_bytes: FileSource) -> str:
+    """Extract text from DOCX (paragraphs + tables)"""
+    return "\n".join(open_docx_pages(docx_bytes)[1])
+
+
+EXTRACTOR_VERSION = "3"  # bump when extraction output changes, to invalidate cached text
+
+
+def extract_page_stream(file_name: str, file_bytes: FileSource, page_budget: Optional[int] = None,
+                        timer: Optional[StageTimer] = None) -> PageStream:
+    """Dispatch on extension and return a lazy page stream (served from the extraction cache when seen before)"""
+    fmt = file_format(file_name)
+    if fmt is None:
+        return PageStream.from_pages([])
+    chain = backend_chain(fmt)
+
+    def open_pages(source: FileSource) -> Tuple[Optional[int], Iterator[str]]:
+        return open_with_fallback(chain, source)
+
+    # the backend chain is part of the cache key: text cached by one chain is never served for another
+    extractor = f"{__name__}.{fmt}[{','.join(name for name, _ in chain)}]:{EXTRACTOR_VERSION}"
+    return cached_page_stream(open_pages, file_bytes, extractor, page_budget, timer)
+
+
+def extract_text_from_upload(file_name: str, file_bytes: FileSource) -> str:
+    """Dispatch extraction based on extension"""
+    return extract_page_stream(file_name, file_bytes).read_all()
@@ -0,0 +1,107 @@
+"""Spool uploads to temp files so parsers and workers get file-backed streams, not byte copies.
+
+A FileRef is a small picklable handle (path + content digest): it is what jobs carry
+through the batch runner, so worker processes open the file themselves instead of being
+sent every upload's bytes, and the parsers read from the file on demand.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from typing import BinaryIO, Optional, Union
+
+from extraction_cache import file_digest
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class FileRef:
+    """A resume on disk, identified by its path and (lazily computed) sha256 digest."""
+
+    __slots__ = ("path", "size", "_digest")
+
+    def __init__(self, path: str, digest: Optional[str] = None):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._digest = digest
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            with self.open() as f:
+                self._digest = stream_digest(f)
+        return self._digest
+
+    def open(self) -> BinaryIO:
+        return open(self.path, "rb")
+
+    def __repr__(self) -> str:
+        return f"FileRef({self.path!r}, size={self.size})"
+
+
+# What the extractors accept: in-memory bytes or a file on disk.
+FileSource = Union[bytes, FileRef]
+
+
+def open_source(source: FileSource) -> BinaryIO:
+    return source.open() if isinstance(source, FileRef) else BytesIO(source)
+
+
+def source_digest(source: FileSource) -> str:
+    return source.digest if isinstance(source, FileRef) else file_digest(source)
+
+
+def _copy(src: BinaryIO, dst: Optional[BinaryIO] = None) -> str:
+    """Copy ``src`` to ``dst`` (if given) chunk by chunk and return the sha256 of its content."""
+    digest = hashlib.sha256()
+    while True:
+        chunk = src.read(CHUNK_SIZE)
+        if not chunk:
+            return digest.hexdigest()
+        digest.update(chunk)
+        if dst is not None:
+            dst.write(chunk)
+
+
+def stream_digest(stream: BinaryIO) -> str:
+    """sha256 of a seekable stream's whole content (e.g. an upload), read in chunks."""
+    stream.seek(0)
+    return _copy(stream)
+
+
+# --------------------------
+# Spool directory
+# --------------------------
+class UploadSpool:
+    """Temp directory holding spooled uploads; everything in it is removed on close."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = tempfile.mkdtemp(prefix="resume-spool-", dir=directory)
+
+    def add(self, stream: BinaryIO, name: str) -> FileRef:
+        """Copy an upload (or an open zip member) to a temp file and return its FileRef."""
+        if stream.seekable():
+            stream.seek(0)
+        fd, path = tempfile.mkstemp(dir=self.directory, suffix=os.path.splitext(name)[1])
+        with os.fdopen(fd, "wb") as out:
+            digest = _copy(stream, out)
+        return FileRef(path, digest)
+
+    def release(self, ref: FileRef) -> None:
+        """Delete a spooled file as soon as its job is done (files outside the spool are kept)."""
+        if os.path.dirname(ref.path) != self.directory:
+            return
+        try:
+            os.remove(ref.path)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "UploadSpool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
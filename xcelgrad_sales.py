@@ -1,105 +1,62 @@
 import streamlit as st
 import os
-from io import BytesIO
-import pandas as pd
 import re
-import PyPDF2
-from typing import List, Dict
+from typing import List, Dict, Optional
 import datetime
-from docx import Document  # <-- this is the correct import
-
-
-# --------------------------
-# Text extraction utilities
-# --------------------------
-def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
-    try:
-        reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
-        texts = [page.extract_text() or "" for page in reader.pages]
-        return "\n".join(texts)
-    except Exception:
-        return ""
-
-
-def extract_text_from_docx_bytes(docx_bytes: bytes) -> str:
-    try:
-        doc = Document(BytesIO(docx_bytes))
-        parts = [p.text for p in doc.paragraphs if p.text.strip()]
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                if row_text:
-                    parts.append(" | ".join(row_text))
-        return "\n".join(parts)
-    except Exception:
-        return ""
-
-
-def extract_text_from_upload(file_name: str, file_bytes: bytes) -> str:
-    name = file_name.lower()
-    if name.endswith(".pdf"):
-        return extract_text_from_pdf_bytes(file_bytes)
-    elif name.endswith(".docx"):
-        return extract_text_from_docx_bytes(file_bytes)
-    return ""
+from functools import lru_cache, partial
+from industry_matcher import IndustryMatcher, build_industry_matcher, normalize_skill_list
+from batch_runner import SERIAL, default_worker_count, describe_budget
+from candidate_index import index_candidate, index_option
+from contact_fields import scan_education, scan_email, scan_location, scan_phone
+from experience import total_experience_years
+from extraction_cache import cache_stats
+from near_duplicates import (duplicate_groups, fingerprint_file, remember_record, reuse_record, settings_key,
+                             show_duplicate_groups)
+from result_store import ResultStore, get_result_store
+from excel_export import StreamingExcelWriter, rows_to_excel_bytes
+from page_stream import PageStream, default_page_budget, resolve_page_budget
+from record_table import RecordTable, show_columnar_downloads
+from resume_sections import SECTIONS, SectionIndex, default_match_sections, match_text, resolve_match_sections
+from stage_timing import (NULL_TIMER, StageTimer, TimingReport, show_timing_report, timer_or_null,
+                          timing_enabled_by_default)
+from text_extraction import (  # shared with xcelgrad_tech
+    extract_page_stream, extract_text_from_docx_bytes, extract_text_from_pdf_bytes, extract_text_from_upload,
+    iter_pdf_pages
+)
+from upload_spool import FileSource
 
 
 # --------------------------
 # All your other functions (unchanged – just pasted cleanly)
 # --------------------------
 def extract_name_from_filename(filename: str) -> str:
-    name_without_ext = os.path.splitext(filename)[0]
+    name_without_ext = os.path.splitext(os.path.basename(filename))[0]
     name_with_spaces = name_without_ext.replace('_', ' ').replace('-', ' ')
     parts = name_with_spaces.split()
     return ' '.join(word.capitalize() for word in parts if word) or filename
 
 
-def extract_email(text: str) -> str:
-    if not text:
-        return ""
-    # (your full robust extract_email function – copy-paste exactly as before)
-    # ... [keep the entire function you already have] ...
-    # I'll skip pasting the whole thing here to save space – just keep yours unchanged
-    # (it works perfectly)
-    # At the very end return the first valid email or ""
-    # ... your existing code ...
-
-
-def extract_phone(text: str) -> str:
-    # ... keep your full extract_phone function unchanged ...
-    # returns first valid phone or ""
-    pass  # replace with your full function
-
-
-def extract_education(text: str) -> str:
-    # ... keep your full extract_education function ...
-    pass
+# Contact fields share the tech tool's precompiled scanners (see contact_fields)
+extract_email = scan_email
+extract_phone = scan_phone
+extract_education = scan_education
+extract_location = scan_location
 
 
-def extract_location(text: str) -> str:
-    # ... keep your full extract_location function ...
-    pass
+_INTERNSHIP = re.compile(r'\b(?:intern|internship|trainee|training)\b', re.I)
 
 
 def is_internship_entry(text_block: str) -> bool:
-    keywords = [r'\bintern\b', r'\binternship\b', r'\btrainee\b', r'\btraining\b']
-    return any(re.search(k, text_block, re.I) for k in keywords)
+    return _INTERNSHIP.search(text_block) is not None
 
 
-def extract_total_experience(text: str) -> float:
-    # ... keep your full function (the one that excludes internships) ...
-    pass
-
-
-def normalize_skill_list(skills: List[str]) -> List[str]:
-    seen = set()
-    result = []
-    for s in skills:
-        key = s.strip().lower()
-        if key and key not in seen:
-            seen.add(key)
-            result.append(s.title() if not (s.isupper() and len(s) <= 5) else s)
-    return result
+def extract_total_experience(text: str, sections: Optional[SectionIndex] = None) -> Optional[float]:
+    """Years of work experience from the resume's date ranges, overlapping roles counted once
+    and internship/trainee entries left out (None when no date range is found). With ``sections``
+    only the experience section's ranges count (education years are not work experience)."""
+    if sections is not None and sections.has("experience"):
+        text = sections.slice("experience")
+    return total_experience_years(text, exclude=is_internship_entry)
 
 
 INDUSTRY_PATTERNS = {
@@ -126,55 +83,145 @@ INDUSTRY_PATTERNS = {
 }
 
 
+RAW_SKILLS = [
+    "Pharma", "Hospitality", "Enterprise Software", "Real Estate", "Agritech",
+    "Sales", "Business Development", "HoReCa", "Banking", "FMCG",
+    "Telecom", "Insurance", "Fintech", "IT", "Saas", "B2B",
+    "Edtech", "BFSI", "Logistics", "Ecommerce"
+]
+SKILLS_TO_CHECK = normalize_skill_list(RAW_SKILLS)
+
+
+@lru_cache(maxsize=32)
+def get_industry_matcher(skills: tuple) -> IndustryMatcher:
+    return build_industry_matcher(list(skills), INDUSTRY_PATTERNS, lambda s: [re.escape(s.lower())])
+
+
+def match_industries(text: str, skills: List[str]) -> Dict[str, int]:
+    return get_industry_matcher(tuple(skills)).match(text)
+
+
 def check_skill_present(text: str, skill: str) -> int:
-    patterns = INDUSTRY_PATTERNS.get(skill, [re.escape(skill.lower())])
-    return 1 if any(re.search(p, text, re.I) for p in patterns) else 0
+    return match_industries(text, [skill])[skill]
 
 
-def process_single_resume(file_bytes: bytes, filename: str, skills: List[str]) -> Dict:
-    text = extract_text_from_upload(filename, file_bytes)
+FIELD_EXTRACTORS = [
+    ('Email', extract_email),
+    ('Phone Number', extract_phone),
+    ('Education', extract_education),
+    ('Location', extract_location),
+    ('Total Years of Work Experience', extract_total_experience),
+]
+
+
+def build_record(stream: PageStream, filename: str, skills: List[str],
+                 timer: Optional[StageTimer] = None, match_sections: Optional[List[str]] = None) -> Optional[Dict]:
+    # Every extractor searches its own slice of the stream's section index (built once);
+    # match_sections: None = RESUME_PARSER_MATCH_SECTIONS, () = whole resume.
+    t = timer_or_null(timer)
+    text = stream.read_all()
     if not text.strip():
         return None
+    sections = stream.sections
 
     data = {
         'Filename': filename,
         'Name': extract_name_from_filename(filename),
-        'Email': extract_email(text),
-        'Phone Number': extract_phone(text),
-        'Education': extract_education(text),
-        'Location': extract_location(text),
-        'Total Years of Work Experience': extract_total_experience(text),
     }
+    for column, extractor in FIELD_EXTRACTORS:
+        with t.stage(extractor.__name__):
+            data[column] = extractor(sections.text, sections)
+    if stream.page_budget:
+        data['Pages Scanned'] = stream.pages_read
+        data['Truncated'] = int(stream.truncated)
 
-    for skill in skills:
-        data[skill] = check_skill_present(text, skill)
+    with t.stage("industry_matching"):
+        data.update(match_industries(match_text(sections, resolve_match_sections(match_sections)), skills))
 
     return data
 
 
-def generate_excel_from_data(data_list: List[Dict]) -> bytes:
-    df = pd.DataFrame(data_list)
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name="Resumes")
-    return output.getvalue()
+def rename_record(record: Dict, filename: str) -> Dict:
+    """An exact copy's record under this file's name (Name comes from the filename too)."""
+    return {**record, 'Filename': filename, 'Name': extract_name_from_filename(filename)}
+
+
+def process_single_resume(file_bytes: FileSource, filename: str, skills: List[str],
+                          page_budget: Optional[int] = None, timer: Optional[StageTimer] = None,
+                          match_sections: Optional[List[str]] = None, index: Optional[bool] = None) -> Dict:
+    # page_budget: None = RESUME_PARSER_PAGE_BUDGET, 0 = all pages; timer: optional StageTimer;
+    # match_sections: None = RESUME_PARSER_MATCH_SECTIONS, () = match the whole resume.
+    # An exact copy of a resume seen before reuses its record (see near_duplicates).
+    # index: save the record and text to the candidate index (None = RESUME_PARSER_INDEX).
+    page_budget = resolve_page_budget(page_budget)
+    match_sections = resolve_match_sections(match_sections)
+    with timer_or_null(timer).stage("text_extraction"):
+        stream = extract_page_stream(filename, file_bytes, page_budget, timer)
+        stream.read_all()
+    fingerprint = fingerprint_file(file_bytes, filename, stream.text, timer)
+    fingerprints = get_industry_matcher(tuple(skills)).fingerprints
+    settings = settings_key(skills, page_budget, match_sections, fingerprints)
+    record = reuse_record(fingerprint, "sales", settings, timer)
+    if record is not None:
+        record = rename_record(record, filename)
+    else:
+        record = build_record(stream, filename, skills, timer, match_sections)
+        if record is not None:
+            remember_record(fingerprint, "sales", settings, record)
+    if record is not None:
+        index_candidate("sales", file_bytes, record, stream.text, skills, timer, fingerprints, match_sections,
+                        SKILLS_TO_CHECK, index)
+    return record
+
+
+EXCEL_SHEET_NAME = "Resumes"
+
+
+def generate_excel_from_data(data_list: List[Dict], timer: Optional[StageTimer] = None) -> bytes:
+    with timer_or_null(timer).stage("excel_export"):
+        return rows_to_excel_bytes(data_list, EXCEL_SHEET_NAME)
+
+
+def new_excel_writer() -> StreamingExcelWriter:
+    return StreamingExcelWriter(EXCEL_SHEET_NAME)
 
 
 # =========================
 # Streamlit App
 # =========================
+def show_results(store: ResultStore):
+    for filename, error in store.batch_failures():
+        if error:
+            st.error(f"Error processing {filename}: {error}")
+
+    extras = store.extras
+    table = extras.get("table") or store.batch_table(SKILLS_TO_CHECK)
+    if not len(table):
+        st.error("No data extracted")
+        return
+    st.success(f"Processed {len(table)} resumes!")
+    stats_before, stats_after = extras.get("cache_before"), extras.get("cache_after")
+    if stats_before and stats_after:
+        st.caption(f"Extraction cache: {stats_after['hits'] - stats_before['hits']} hits, "
+                   f"{stats_after['misses'] - stats_before['misses']} misses")
+    st.dataframe(table.to_frame())
+
+    if store.excel_bytes:
+        st.download_button(
+            "Download Excel",
+            store.excel_bytes,
+            file_name=extras.get("file_name", "resume_data.xlsx"),
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+    show_columnar_downloads(table, os.path.splitext(extras.get("file_name", "resume_data.xlsx"))[0], key="sales")
+    show_duplicate_groups(extras.get("duplicates"))
+    if extras.get("timing_report"):
+        show_timing_report(extras["timing_report"])
+
+
 def main():
-    st.set_page_config(page_title="Resume Industry Extractor", layout="wide")
     st.title("Batch Resume → Industry Extractor")
 
-    RAW_SKILLS = [
-        "Pharma", "Hospitality", "Enterprise Software", "Real Estate", "Agritech",
-        "Sales", "Business Development", "HoReCa", "Banking", "FMCG",
-        "Telecom", "Insurance", "Fintech", "IT", "Saas", "B2B",
-        "Edtech", "BFSI", "Logistics", "Ecommerce"
-    ]
-    SKILLS_TO_CHECK = normalize_skill_list(RAW_SKILLS)
-
     col1, col2 = st.columns([1, 2])
 
     with col1:
@@ -186,6 +233,25 @@ def main():
             uploaded_files = uploaded_files[:100]
             st.warning("Limited to first 100 files")
 
+        serial_mode = st.checkbox("Serial mode (debug)", value=False,
+                                  help="Process files one by one on the app thread, without time or memory limits.")
+        workers = st.number_input("Worker processes", min_value=1, max_value=64,
+                                  value=default_worker_count(), disabled=serial_mode,
+                                  help=f"Each worker gets {describe_budget()}; a file over it is stopped.")
+        page_budget = st.number_input("Page budget per resume (0 = all pages)", min_value=0, max_value=500,
+                                      value=default_page_budget() or 0)
+        match_sections = st.multiselect("Match industries only in sections (empty = whole resume)", SECTIONS,
+                                        default=list(default_match_sections()))
+        record_timings = st.checkbox("Record stage timings", value=timing_enabled_by_default())
+        save_index = index_option()
+
+        settings = (tuple(SKILLS_TO_CHECK), int(page_budget), tuple(match_sections), save_index)
+        store = get_result_store("sales")
+        keys = store.keys_for(uploaded_files or [], settings)
+        if store.batch and keys and not store.is_current(keys):
+            st.info(f"{store.new_files(keys)} new/changed file(s) since the last run; "
+                    "processed files will be reused")
+
         process = st.button("Process Resumes", type="primary")
 
     with col2:
@@ -198,29 +264,39 @@ def main():
             st.error("Upload at least one file")
             return
 
-        results = []
         progress = st.progress(0)
-        for i, file in enumerate(uploaded_files):
-            st.write(f"Processing {file.name}...")
-            data = process_single_resume(file.read(), file.name, SKILLS_TO_CHECK)
+        status = st.empty()
+
+        def on_progress(done, total, filename):
+            status.write(f"Processed {filename} ({done}/{total})")
+            progress.progress(done / total)
+
+        stats_before = cache_stats()
+        process_fn = partial(process_single_resume, page_budget=int(page_budget),
+                             match_sections=tuple(match_sections), index=save_index)
+        store.run(process_fn, uploaded_files, SKILLS_TO_CHECK, settings,
+                  workers=SERIAL if serial_mode else int(workers),
+                  on_progress=on_progress, instrument=record_timings)
+        timing_report = TimingReport()
+        export_timer = timing_report.batch if record_timings else NULL_TIMER
+        excel_writer = new_excel_writer()
+        table = RecordTable(SKILLS_TO_CHECK)
+        for filename, data, _, timings in store.batch_results():
+            timing_report.add(filename, timings)
             if data:
-                results.append(data)
-            progress.progress((i + 1) / len(uploaded_files))
-
-        if results:
-            df = pd.DataFrame(results)
-            st.success(f"Processed {len(results)} resumes!")
-            st.dataframe(df)
-
-            excel = generate_excel_from_data(results)
-            st.download_button(
-                "Download Excel",
-                excel,
-                file_name=f"resume_data_{datetime.datetime.now():%Y%m%d_%H%M%S}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        else:
-            st.error("No data extracted")
+                table.append(data)
+                with export_timer.stage("excel_export"):
+                    excel_writer.append(data)
+        if excel_writer.row_count():
+            with export_timer.stage("excel_export"):
+                store.excel_bytes = excel_writer.to_bytes()
+        store.extras = {"timing_report": timing_report, "cache_before": stats_before, "cache_after": cache_stats(),
+                        "table": table,
+                        "file_name": f"resume_data_{datetime.datetime.now():%Y%m%d_%H%M%S}.xlsx",
+                        "duplicates": duplicate_groups([(name, digest) for name, digest, _ in store.batch])}
+
+    if store.batch:
+        show_results(store)
 
 
 if __name__ == "__main__":
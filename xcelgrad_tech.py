@@ -1,137 +1,40 @@
 import streamlit as st
-from io import BytesIO
-import pandas as pd
 import re
-import PyPDF2
-from typing import List, Dict
-from docx import Document
-
-# --------------------------
-# Utilities: PDF/DOCX -> text
-# --------------------------
-def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
-    """Extract all text from PDF file"""
-    try:
-        reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
-    except Exception:
-        return ""
-    texts = []
-    for page in reader.pages:
-        try:
-            texts.append(page.extract_text() or "")
-        except Exception:
-            texts.append("")
-    return "\n".join(texts)
-
-def extract_text_from_docx_bytes(docx_bytes: bytes) -> str:
-    """Extract text from DOCX (paragraphs + tables)"""
-    try:
-        doc = Document(BytesIO(docx_bytes))
-    except Exception:
-        return ""
-    parts = []
-    # paragraphs
-    for p in doc.paragraphs:
-        if p.text:
-            parts.append(p.text)
-    # tables
-    for table in doc.tables:
-        for row in table.rows:
-            row_text = [cell.text.strip() for cell in row.cells if cell.text and cell.text.strip()]
-            if row_text:
-                parts.append(" | ".join(row_text))
-    return "\n".join(parts)
-
-def extract_text_from_upload(file_name: str, file_bytes: bytes) -> str:
-    """Dispatch extraction based on extension"""
-    name = file_name.lower()
-    if name.endswith(".pdf"):
-        return extract_text_from_pdf_bytes(file_bytes)
-    elif name.endswith(".docx"):  # .doc not supported reliably without external deps
-        return extract_text_from_docx_bytes(file_bytes)
-    else:
-        return ""
+from functools import lru_cache, partial
+from typing import List, Dict, Optional
+from industry_matcher import IndustryMatcher, build_industry_matcher, normalize_skill_list
+from contact_fields import scan_contact_fields, scan_education, scan_email, scan_name, scan_phone
+from batch_runner import SERIAL, default_worker_count, describe_budget
+from candidate_index import index_candidate, index_option
+from extraction_cache import cache_dir, cache_stats
+from near_duplicates import (duplicate_groups, fingerprint_file, remember_record, reuse_record, settings_key,
+                             show_duplicate_groups)
+from result_store import ResultStore, get_result_store
+from excel_export import StreamingExcelWriter, rows_to_excel_bytes
+from page_stream import PageStream, default_page_budget, resolve_page_budget
+from record_table import RecordTable, show_columnar_downloads
+from resume_sections import SECTIONS, default_match_sections, match_text, resolve_match_sections
+from stage_timing import (NULL_TIMER, StageTimer, TimingReport, show_timing_report, timer_or_null,
+                          timing_enabled_by_default)
+from text_extraction import (  # re-exported: shared by both tools
+    extract_page_stream, extract_text_from_docx_bytes, extract_text_from_pdf_bytes, extract_text_from_upload,
+    iter_pdf_pages
+)
+from upload_spool import FileSource
 
 # --------------------------
 # Information extraction
 # --------------------------
-def extract_name(text: str) -> str:
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
-    if not lines:
-        return ""
-    first_line = re.sub(r'^(resume|curriculum vitae|cv)[\s:]*', '', lines[0], flags=re.I)
-    words = first_line.split()
-    if 2 <= len(words) <= 4 and all(word.replace('.', '').isalpha() for word in words):
-        return first_line
-    if len(lines) > 1:
-        second_line = lines[1]
-        words = second_line.split()
-        if 2 <= len(words) <= 4 and all(word.replace('.', '').isalpha() for word in words):
-            return second_line
-    return first_line[:50]
-
-def extract_email(text: str) -> str:
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    matches = re.findall(email_pattern, text)
-    return matches[0] if matches else ""
-
-def extract_phone(text: str) -> str:
-    phone_patterns = [
-        r'\+?\d{1,3}[-.\s]?\(?\d{3,5}\)?[-.\s]?\d{3,5}[-.\s]?\d{4}',  # flexible intl
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-        r'\+?\d{10,12}',
-        r'\d{3}[-.\s]\d{3}[-.\s]\d{4}'
-    ]
-    for pattern in phone_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            return matches[0]
-    return ""
-
-def extract_education(text: str) -> str:
-    text_lower = text.lower()
-    education_keywords = ['education', 'academic', 'qualification']
-    education_start = -1
-    for keyword in education_keywords:
-        match = re.search(r'\b' + keyword + r'\b', text_lower)
-        if match:
-            education_start = match.start()
-            break
-    if education_start == -1:
-        degree_pattern = r'\b(bachelor|master|phd|b\.tech|m\.tech|b\.e|m\.e|bsc|msc|bca|mca|diploma)\b'
-        matches = re.findall(degree_pattern, text_lower)
-        if matches:
-            return matches[0].upper()
-        return ""
-    education_text = text[education_start:education_start + 500]
-    degree_pattern = r'(Bachelor[^,\n]*|Master[^,\n]*|PhD[^,\n]*|B\.Tech[^,\n]*|M\.Tech[^,\n]*|B\.E[^,\n]*|M\.E[^,\n]*|BSc[^,\n]*|MSc[^,\n]*|BCA[^,\n]*|MCA[^,\n]*)'
-    degree_match = re.search(degree_pattern, education_text, re.I)
-    if degree_match:
-        return degree_match.group(1).strip()
-    lines = [l.strip() for l in education_text.split('\n') if l.strip()]
-    return lines[1] if len(lines) > 1 else (lines[0] if lines else "")
+# Each field is found by a precompiled scan that stops at its first hit (see contact_fields);
+# the per-field names are kept for callers that only need one of them.
+extract_name = scan_name
+extract_email = scan_email
+extract_phone = scan_phone
+extract_education = scan_education
 
 # --------------------------
 # Skill / Industry matching
 # --------------------------
-def normalize_skill_list(skills: List[str]) -> List[str]:
-    """Deduplicate case-insensitive while preserving order and trim whitespace."""
-    seen = set()
-    normalized = []
-    for s in skills:
-        key = s.strip()
-        if not key:
-            continue
-        lower = key.lower()
-        if lower not in seen:
-            seen.add(lower)
-            if key.isupper() and len(key) <= 5:
-                display = key
-            else:
-                display = key.title()
-            normalized.append(display)
-    return normalized
-
 INDUSTRY_PATTERNS = {
     'Pharma': [r'\bpharma\b', r'\bpharmaceuticals?\b', r'\bpharmaceutical\b'],
     'Hospitality': [r'\bhospitalit(y|ies)\b', r'\bhotels?\b', r'\bfood\s+and\s+beverage\b', r'\bfnb\b'],
@@ -155,51 +58,100 @@ INDUSTRY_PATTERNS = {
     'ECommerce': [r'\be[\s\-]?commerce\b', r'\becommerce\b', r'\bonline\s+retail\b']
 }
 
+def _fallback_patterns(skill_display_name: str) -> List[str]:
+    return [r'\b' + re.escape(skill_display_name.lower()) + r'\b']
+
+@lru_cache(maxsize=32)
+def get_industry_matcher(skills: tuple) -> IndustryMatcher:
+    """Compiled single-scan matcher for a given (ordered) tuple of skills."""
+    return build_industry_matcher(list(skills), INDUSTRY_PATTERNS, _fallback_patterns)
+
+def match_industries(text: str, skills: List[str]) -> Dict[str, int]:
+    """Return {skill: 1/0} for all skills, scanning the text only once."""
+    return get_industry_matcher(tuple(skills)).match(text)
+
 def check_skill_present(text: str, skill_display_name: str) -> int:
     """Return 1 if any pattern for the skill matches in text (case-insensitive), else 0."""
     if not text or not skill_display_name:
         return 0
-    patterns = INDUSTRY_PATTERNS.get(skill_display_name, [r'\b' + re.escape(skill_display_name.lower()) + r'\b'])
-    for pat in patterns:
-        if re.search(pat, text, flags=re.I):
-            return 1
-    return 0
+    return match_industries(text, [skill_display_name])[skill_display_name]
 
 # --------------------------
 # Resume processing
 # --------------------------
-def process_single_resume(file_bytes: bytes, filename: str, skills_to_check: List[str]) -> Dict:
-    """Process a single resume and return extracted data. Skills are checked in the entire resume text."""
-    full_text = extract_text_from_upload(filename, file_bytes)
+def extract_contact_fields(stream: PageStream, timer: Optional[StageTimer] = None) -> Dict[str, str]:
+    """Run the field extractors on every page read (all pages, or the first ``page_budget``), so a
+    degree word on page 1 never beats an Education section further down."""
+    stream.read_all()
+    with timer_or_null(timer).stage("field_extraction"):
+        return scan_contact_fields(stream.sections.text, stream.sections)
+
+def build_record(stream: PageStream, filename: str, skills_to_check: List[str],
+                 timer: Optional[StageTimer] = None, match_sections: Optional[List[str]] = None) -> Optional[Dict]:
+    """Build this tool's record from an already opened page stream (None if it has no text).
+    Industries are matched in ``match_sections`` only (None = RESUME_PARSER_MATCH_SECTIONS, () = whole resume)."""
+    fields = extract_contact_fields(stream, timer)
+    full_text = stream.read_all()
     if not full_text.strip():
         return None
-    name = extract_name(full_text)
-    email = extract_email(full_text)
-    phone = extract_phone(full_text)
-    education = extract_education(full_text)
-
-    data = {
-        'Filename': filename,
-        'Name': name,
-        'Email': email,
-        'Phone Number': phone,
-        'Education': education
-    }
-
-    for skill in skills_to_check:
-        data[skill] = check_skill_present(full_text, skill)
+
+    data = {'Filename': filename}
+    data.update(fields)
+    if stream.page_budget:
+        data['Pages Scanned'] = stream.pages_read
+        data['Truncated'] = int(stream.truncated)
+
+    with timer_or_null(timer).stage("industry_matching"):
+        data.update(match_industries(match_text(stream.sections, resolve_match_sections(match_sections)),
+                                     skills_to_check))
 
     return data
 
+def rename_record(record: Dict, filename: str) -> Dict:
+    """An exact copy's record under this file's name."""
+    return {**record, 'Filename': filename}
+
+def process_single_resume(file_bytes: FileSource, filename: str, skills_to_check: List[str],
+                          page_budget: Optional[int] = None, timer: Optional[StageTimer] = None,
+                          match_sections: Optional[List[str]] = None, index: Optional[bool] = None) -> Dict:
+    """Process a single resume and return extracted data. Skills are checked in the entire resume text
+    (or its first ``page_budget`` pages; None = RESUME_PARSER_PAGE_BUDGET, 0 = all pages), or only in
+    its ``match_sections`` (None = RESUME_PARSER_MATCH_SECTIONS, () = whole resume).
+    An exact copy of a resume seen before reuses its record (see near_duplicates).
+    With ``index`` (None = RESUME_PARSER_INDEX) the record and text are saved to the candidate index.
+    Pass a StageTimer as ``timer`` to record per-stage timings."""
+    page_budget = resolve_page_budget(page_budget)
+    match_sections = resolve_match_sections(match_sections)
+    with timer_or_null(timer).stage("text_extraction"):
+        stream = extract_page_stream(filename, file_bytes, page_budget, timer)
+    fingerprint = fingerprint_file(file_bytes, filename, stream.read_all(), timer)
+    fingerprints = get_industry_matcher(tuple(skills_to_check)).fingerprints
+    settings = settings_key(skills_to_check, page_budget, match_sections, fingerprints)
+    record = reuse_record(fingerprint, "tech", settings, timer)
+    if record is not None:
+        record = rename_record(record, filename)
+    else:
+        record = build_record(stream, filename, skills_to_check, timer, match_sections)
+        if record is not None:
+            remember_record(fingerprint, "tech", settings, record)
+    if record is not None:
+        index_candidate("tech", file_bytes, record, stream.text, skills_to_check, timer, fingerprints, match_sections,
+                        SKILLS_TO_CHECK, index)
+    return record
+
 # --------------------------
 # Excel generation
 # --------------------------
-def generate_excel_from_data(all_data: List[Dict]) -> bytes:
-    df = pd.DataFrame(all_data)
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name="Resume_Data")
-    return output.getvalue()
+EXCEL_SHEET_NAME = "Resume_Data"
+
+def generate_excel_from_data(all_data: List[Dict], timer: Optional[StageTimer] = None) -> bytes:
+    """Stream rows into a write-only workbook (spilled to a temp file) and return its bytes."""
+    with timer_or_null(timer).stage("excel_export"):
+        return rows_to_excel_bytes(all_data, EXCEL_SHEET_NAME)
+
+def new_excel_writer() -> StreamingExcelWriter:
+    """Writer to append rows to as each resume finishes; call ``to_bytes()`` at the end."""
+    return StreamingExcelWriter(EXCEL_SHEET_NAME)
 
 # --------------------------
 # Streamlit UI (wrapped in main)
@@ -230,6 +182,85 @@ RAW_SKILLS = [
 
 SKILLS_TO_CHECK = normalize_skill_list(RAW_SKILLS)
 
+def show_results(store: ResultStore):
+    """Render the store's current batch (runs again on every rerun without reprocessing)."""
+    for filename, error in store.batch_failures():
+        if error:
+            st.error(f"❌ Error processing {filename}: {error}")
+        else:
+            st.warning(f"⚠️ Could not extract text from: {filename} (unsupported/empty/corrupt)")
+
+    extras = store.extras
+    table = extras.get("table") or store.batch_table(SKILLS_TO_CHECK)
+    total_files = len(store.batch)
+    if not len(table):
+        st.error("❌ Could not extract data from any of the uploaded files.")
+        return
+    st.success(f"✅ Successfully processed {len(table)} out of {total_files} file(s)!")
+    if extras.get("reused"):
+        st.caption(f"♻️ {extras['reused']} file(s) reused from the previous run, "
+                   f"{extras['processed']} newly processed.")
+
+    st.subheader("📊 Processing Summary")
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.metric("Total Files Uploaded", total_files)
+    with col_b:
+        st.metric("Successfully Processed", len(table))
+    with col_c:
+        st.metric("Failed", total_files - len(table))
+
+    stats_before, stats_after = extras.get("cache_before"), extras.get("cache_after")
+    if stats_before and stats_after:
+        col_h, col_m, col_s = st.columns(3)
+        with col_h:
+            st.metric("Cache Hits", stats_after["hits"] - stats_before["hits"])
+        with col_m:
+            st.metric("Cache Misses", stats_after["misses"] - stats_before["misses"])
+        with col_s:
+            st.metric("Cached Files", stats_after["entries"],
+                      f"{stats_after['size_bytes'] / 1024 / 1024:.1f} MB", delta_color="off")
+
+    st.subheader("📈 Industry/Vertical Statistics (from whole resume)")
+    flags = table.flag_matrix()
+    skill_items = list(zip(flags.industries, flags.counts(), flags.percentages()))
+
+    num_cols = 4
+    for i in range(0, len(skill_items), num_cols):
+        skill_cols = st.columns(num_cols)
+        for j in range(num_cols):
+            if i + j < len(skill_items):
+                skill, count, percentage = skill_items[i + j]
+                with skill_cols[j]:
+                    st.metric(skill, f"{count}/{flags.n_rows}", f"{percentage:.0f}%")
+
+    with st.expander("🔗 Industry co-occurrence"):
+        as_share = st.toggle("Show as % of the row industry's resumes", value=False, key="tech_cooccurrence_share")
+        st.dataframe(flags.cooccurrence_frame(share=as_share), use_container_width=True)
+        top_pairs = flags.top_pairs()
+        if not top_pairs.empty:
+            st.write("**Most frequent pairs**")
+            st.dataframe(top_pairs, hide_index=True, use_container_width=True)
+
+    st.subheader("Complete Data Table")
+    # to_frame() imports pandas once there is something to show, not when the page first renders
+    st.dataframe(table.to_frame(), use_container_width=True)
+
+    if store.excel_bytes:
+        st.download_button(
+            label="📥 Download Excel File with All Data",
+            data=store.excel_bytes,
+            file_name="batch_resume_industries_extracted.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            type="primary"
+        )
+    show_columnar_downloads(table, "batch_resume_industries_extracted", key="tech")
+
+    show_duplicate_groups(extras.get("duplicates"))
+
+    if extras.get("timing_report"):
+        show_timing_report(extras["timing_report"])
+
 def main():
     st.header("📄 Batch Resume → Industry/Vertical Extractor (Whole-Resume Matching)")
     st.markdown(
@@ -268,6 +299,30 @@ def main():
             "📎 Supported formats: **PDF**, **Word (.docx)**"
         )
 
+        with st.expander("⚙️ Processing options"):
+            serial_mode = st.checkbox("Serial mode (debug)", value=False,
+                                      help="Process files one by one on the app thread, without time or memory limits.")
+            workers = st.number_input("Worker processes", min_value=1, max_value=64,
+                                      value=default_worker_count(), disabled=serial_mode,
+                                      help=f"Each worker gets {describe_budget()}; a file over it is stopped.")
+            page_budget = st.number_input("Page budget per resume (0 = all pages)", min_value=0, max_value=500,
+                                          value=default_page_budget() or 0,
+                                          help="Only the first N pages are extracted and matched.")
+            match_sections = st.multiselect("Match industries only in sections", SECTIONS,
+                                            default=list(default_match_sections()),
+                                            help="Leave empty to match across the whole resume.")
+            record_timings = st.checkbox("Record stage timings", value=timing_enabled_by_default(),
+                                         help="Time text extraction, each field extractor, industry matching and export.")
+            save_index = index_option()
+            st.caption(f"Extraction cache: `{cache_dir()}`")
+
+        settings = (tuple(SKILLS_TO_CHECK), int(page_budget), tuple(match_sections), save_index)
+        store = get_result_store("tech")
+        keys = store.keys_for(uploaded_files or [], settings)
+        if store.batch and keys and not store.is_current(keys):
+            st.info(f"🔁 {store.new_files(keys)} new/changed file(s) since the last run; "
+                    "already processed files will be reused.")
+
         process_button = st.button("🚀 Process All Resumes", type="primary")
 
     with col2:
@@ -275,7 +330,8 @@ def main():
         st.write("1. **Upload** multiple resumes (PDF or DOCX).")
         st.write("2. Click **Process All Resumes**.")
         st.write("3. **Download** the Excel file with all extracted information.")
-        st.info("ℹ️ Industry matching is now performed across the entire resume text (no section restriction).")
+        st.info("ℹ️ Industry matching is performed across the entire resume text, unless sections are "
+                "chosen under ⚙️ Processing options.")
         st.write("")
         st.write("**Industries / Verticals Checked:**")
         cols = st.columns(3)
@@ -287,71 +343,41 @@ def main():
         if not uploaded_files:
             st.error("⚠️ Please upload at least one resume first.")
         else:
-            all_data = []
             progress_bar = st.progress(0)
             status_text = st.empty()
 
-            for idx, uploaded_file in enumerate(uploaded_files):
-                status_text.text(f"Processing {idx + 1}/{len(uploaded_files)}: {uploaded_file.name}")
-                try:
-                    raw_bytes = uploaded_file.read()
-                    data = process_single_resume(raw_bytes, uploaded_file.name, SKILLS_TO_CHECK)
-                    if data:
-                        all_data.append(data)
-                    else:
-                        st.warning(f"⚠️ Could not extract text from: {uploaded_file.name} (unsupported/empty/corrupt)")
-                except Exception as e:
-                    st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
-                progress_bar.progress((idx + 1) / len(uploaded_files))
+            def on_progress(done, total, filename):
+                status_text.text(f"Processed {done}/{total}: {filename}")
+                progress_bar.progress(done / total)
+
+            stats_before = cache_stats()
+            process_fn = partial(process_single_resume, page_budget=int(page_budget),
+                                 match_sections=tuple(match_sections), index=save_index)
+            processed, reused = store.run(process_fn, uploaded_files, SKILLS_TO_CHECK, settings,
+                                          workers=SERIAL if serial_mode else int(workers),
+                                          on_progress=on_progress, instrument=record_timings)
+            timing_report = TimingReport()
+            export_timer = timing_report.batch if record_timings else NULL_TIMER
+            excel_writer = new_excel_writer()
+            table = RecordTable(SKILLS_TO_CHECK)
+            for filename, data, _, timings in store.batch_results():
+                timing_report.add(filename, timings)
+                if data:
+                    table.append(data)
+                    with export_timer.stage("excel_export"):
+                        excel_writer.append(data)
+            if excel_writer.row_count():
+                with st.spinner("📝 Generating Excel file..."), export_timer.stage("excel_export"):
+                    store.excel_bytes = excel_writer.to_bytes()
+            store.extras = {"processed": processed, "reused": reused, "timing_report": timing_report,
+                            "cache_before": stats_before, "cache_after": cache_stats(), "table": table,
+                            "duplicates": duplicate_groups([(name, digest) for name, digest, _ in store.batch])}
 
             status_text.empty()
             progress_bar.empty()
 
-            if not all_data:
-                st.error("❌ Could not extract data from any of the uploaded files.")
-            else:
-                st.success(f"✅ Successfully processed {len(all_data)} out of {len(uploaded_files)} file(s)!")
-
-                st.subheader("📊 Processing Summary")
-                col_a, col_b, col_c = st.columns(3)
-                with col_a:
-                    st.metric("Total Files Uploaded", len(uploaded_files))
-                with col_b:
-                    st.metric("Successfully Processed", len(all_data))
-                with col_c:
-                    st.metric("Failed", len(uploaded_files) - len(all_data))
-
-                st.subheader("📈 Industry/Vertical Statistics (from whole resume)")
-                skill_counts = {}
-                for skill in SKILLS_TO_CHECK:
-                    count = sum(1 for data in all_data if data.get(skill) == 1)
-                    skill_counts[skill] = count
-
-                num_cols = 4
-                skill_items = list(skill_counts.items())
-                for i in range(0, len(skill_items), num_cols):
-                    skill_cols = st.columns(num_cols)
-                    for j in range(num_cols):
-                        if i + j < len(skill_items):
-                            skill, count = skill_items[i + j]
-                            with skill_cols[j]:
-                                percentage = (count / len(all_data) * 100) if all_data else 0
-                                st.metric(skill, f"{count}/{len(all_data)}", f"{percentage:.0f}%")
-
-                st.subheader("Complete Data Table")
-                df_display = pd.DataFrame(all_data)
-                st.dataframe(df_display, use_container_width=True)
-
-                with st.spinner("📝 Generating Excel file..."):
-                    excel_bytes = generate_excel_from_data(all_data)
-
-                st.download_button(
-                    label="📥 Download Excel File with All Data",
-                    data=excel_bytes,
-                    file_name="batch_resume_industries_extracted.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    type="primary"
-                )
+    if store.batch:
+        show_results(store)
 
     st.markdown("---")
     st.caption("Have a GOOD DAY!!!")